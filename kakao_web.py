@@ -8,21 +8,39 @@ import os
 import sys
 import re
 import csv
+import json
+import atexit
+import select
+import bisect
+import hashlib
+import hmac
+import uuid
+import socket
+import argparse
+import urllib.request
+import urllib.parse
+import pickle
+import zipfile
 import unicodedata
 import tempfile
 import subprocess
 import threading
 import time
 import random
+import math
 import webbrowser
+from collections import deque, OrderedDict
 from contextlib import contextmanager
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 from datetime import datetime
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, NamedTuple
 
 import pandas as pd
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
 import pyperclip
-from flask import Flask, render_template_string, request, jsonify, Response
+from flask import Flask, render_template_string, request, jsonify, Response, send_file, redirect
 
 # 접근성(AX) API — 친구 이름을 정확한 문자열로 읽고/입력하기 위한 경로.
 # 카카오톡 조작에 필요한 '손쉬운 사용(접근성)' 권한과 동일한 권한을 사용한다.
@@ -60,6 +78,69 @@ try:
 except Exception:
     AX_WRITE_AVAILABLE = False
 
+# 접근성(AX) '일괄 읽기' — 요소 하나의 여러 속성(자식 포함)을 AX 호출 1회로 읽는다.
+# 없거나 실패하면 속성별 개별 읽기로 폴백한다.
+try:
+    from ApplicationServices import (
+        AXUIElementCopyMultipleAttributeValues,
+        AXValueGetType,
+    )
+    try:
+        from ApplicationServices import kAXValueAXErrorType
+    except Exception:
+        kAXValueAXErrorType = 5  # AXValueType.axError
+    AX_MULTI_AVAILABLE = AX_AVAILABLE
+except Exception:
+    AX_MULTI_AVAILABLE = False
+
+# 접근성(AX) 알림 — 검색 결과/채팅 입력창 등장을 폴링 대신 AXObserver 알림으로 기다린다.
+# 알림은 대기 중인 스레드의 런루프에서 받으며, 없으면 기존 폴링으로 폴백한다.
+try:
+    from ApplicationServices import (
+        AXObserverCreate,
+        AXObserverAddNotification,
+        AXObserverGetRunLoopSource,
+    )
+    from CoreFoundation import (
+        CFRunLoopGetCurrent,
+        CFRunLoopAddSource,
+        CFRunLoopRemoveSource,
+        CFRunLoopRunInMode,
+        kCFRunLoopDefaultMode,
+    )
+    AX_OBSERVER_AVAILABLE = AX_AVAILABLE
+except Exception:
+    AX_OBSERVER_AVAILABLE = False
+
+# 네이티브 클립보드(NSPasteboard) — 텍스트·이미지 복사와 확인을 pbcopy/pbpaste 프로세스 없이 한다.
+# 없거나 실패하면 pyperclip으로 폴백한다.
+try:
+    from AppKit import NSPasteboard, NSPasteboardTypeString, NSImage
+    from Foundation import NSURL
+    PASTEBOARD_AVAILABLE = True
+except Exception:
+    NSPasteboardTypeString = 'public.utf8-plain-text'
+    PASTEBOARD_AVAILABLE = False
+
+# 첨부 이미지 준비(ImageIO) — 원본을 한 번만 디코드해 전송 해상도로 줄이고 JPEG/PNG로 다시 인코딩한다.
+# 없으면 매번 원본 파일을 NSImage로 읽어 붙여넣는 기존 경로로 폴백한다.
+try:
+    from Quartz import (
+        CGImageSourceCreateWithData,
+        CGImageSourceCreateThumbnailAtIndex,
+        CGImageGetWidth,
+        CGImageGetHeight,
+        CGImageGetAlphaInfo,
+        kCGImageSourceCreateThumbnailFromImageAlways,
+        kCGImageSourceCreateThumbnailWithTransform,
+        kCGImageSourceThumbnailMaxPixelSize,
+    )
+    from AppKit import NSBitmapImageRep, NSBitmapImageFileTypeJPEG, NSBitmapImageFileTypePNG, NSImageCompressionFactor
+    from Foundation import NSData
+    ATTACHMENT_PREP_AVAILABLE = PASTEBOARD_AVAILABLE
+except Exception:
+    ATTACHMENT_PREP_AVAILABLE = False
+
 # ============================================================
 # 설정
 # ============================================================
@@ -78,34 +159,246 @@ USE_AX_VERIFICATION = True
 # 검색어/메시지 입력과 전송을 접근성(AX) API로 처리(키보드 비의존). 실패 시 키 입력으로 폴백.
 # AX 입력은 카카오톡이 최전면이 아니어도 동작해, 전송 중 다른 작업으로 포커스가 바뀌어도 안전하다.
 USE_AX_INPUT = True
+# 클립보드를 NSPasteboard로 직접 쓰고, 복사 확인은 다시 읽는 대신 changeCount로 한다.
+# 복사 후 확인 전 대기: pyperclip은 pbcopy 반영을 기다려야 해 CLIPBOARD_VERIFY_DELAY,
+# NSPasteboard는 쓰기가 바로 반영되므로 다른 기기의 덮어쓰기를 잡을 짧은 틈만 둔다.
+USE_NATIVE_PASTEBOARD = True
+CLIPBOARD_VERIFY_DELAY = 0.05
+NATIVE_CLIPBOARD_VERIFY_DELAY = 0.005
+# 첨부 이미지는 업로드 때 한 번 준비(긴 변 ATTACHMENT_MAX_EDGE px 이하로 축소, 불투명하면 JPEG·아니면
+# PNG)해 메모리에 두고 대상자마다 그대로 붙여넣는다. 붙여넣은 뒤 카카오톡이 사진을 받아들일 때까지의
+# 대기는 데이터 크기에 비례(MIN + PER_MB × MB, 최대 ATTACHMENT_INGEST_DELAY — 준비 못 한 원본과
+# PDF 파일 붙여넣기는 계측 전이라 이 값).
+USE_PREPARED_ATTACHMENTS = True
+ATTACHMENT_MAX_EDGE = 2048
+ATTACHMENT_JPEG_QUALITY = 0.85
+ATTACHMENT_INGEST_DELAY = 1.2
+ATTACHMENT_INGEST_MIN = 0.5
+ATTACHMENT_INGEST_PER_MB = 0.3
+# 대상자별 첨부: 명단에 ROSTER_ATTACHMENT_COLUMN 열이 있으면 그 행의 파일(이미지 또는 PDF)을 공용
+# 이미지 대신 보낸다(빈 칸이면 공용 이미지). 상대 경로는 화면의 '첨부 폴더'(기본 ATTACHMENT_DIR) 기준.
+# 보내는 동안 다음 ATTACHMENT_PREFETCH명의 첨부를 백그라운드에서 미리 읽어 준비하고, 준비된 첨부는
+# 최대 ATTACHMENT_CACHE_MAX개·ATTACHMENT_CACHE_MAX_BYTES까지 메모리에 둔다(오래 안 쓴 것부터 내림).
+ROSTER_ATTACHMENT_COLUMN = '첨부파일'
+ATTACHMENT_DIR = os.path.expanduser('~')
+ATTACHMENT_PREFETCH = 3
+ATTACHMENT_CACHE_MAX = 8
+ATTACHMENT_CACHE_MAX_BYTES = 96 * 1024 * 1024
+# 트리 순회 시 노드당 필요한 속성을 AXUIElementCopyMultipleAttributeValues 1회로 읽는다.
+USE_AX_BATCH_READS = True
 # 카카오톡 번들 식별자 (AX 앱 핸들 탐색용)
 KAKAO_BUNDLE_IDS = ('com.kakao.KakaoTalkMac', 'com.kakao.KakaoTalk')
 # 검색 결과에서 친구 이름이 담기는 AXStaticText 의 identifier
 AX_DISPLAY_NAME_ID = 'Display Name'
+# AX 대기(검색 결과·채팅 입력창 등장)를 AXObserver 알림으로 깨운다. 알림이 없어도
+# AX_EVENT_RECHECK_SECONDS마다 한 번은 다시 확인하며, 알림을 못 쓰면 50ms 폴링으로 폴백.
+USE_AX_EVENT_WAIT = True
+AX_EVENT_RECHECK_SECONDS = 0.25
+AX_WAIT_NOTIFICATIONS = ('AXValueChanged', 'AXCreated', 'AXFocusedUIElementChanged', 'AXWindowCreated')
 CHAT_DELAY_BEFORE_ENTER = 0.55
 CHAT_DELAY_AFTER_ENTER = 1.35
+# 적응형 대기: 준비 대기(검색 결과·채팅 입력창)를 이 맥에서 관측한 준비 소요시간의
+# 백분위 + 여유분으로 정한다. 학습값은 ADAPTIVE_DELAY_FILE에 저장되어 다음 실행에 이어진다.
+# 단계별로 고정하려면 ADAPTIVE_DELAY_OVERRIDES = {'chat_input': 0.8} 처럼 초 단위로 지정.
+USE_ADAPTIVE_DELAYS = True
+# 실행 간에 남아야 하는 데이터(학습값·전송 기록)는 임시 폴더가 아닌 사용자 Application Support에 둔다.
+APP_SUPPORT_DIR = os.path.join(os.path.expanduser('~'), 'Library', 'Application Support', 'KakaoSender')
+ADAPTIVE_DELAY_FILE = os.path.join(APP_SUPPORT_DIR, 'adaptive_delays.json')
+ADAPTIVE_DELAY_OVERRIDES = {}
+# AppleScript를 상주 호스트(파이프)로 실행 — 호출마다 osascript 프로세스를 띄우지 않는다.
+# 호스트를 못 띄우면 호출 단위로 기존 1회용 실행으로 자동 폴백한다.
+USE_PERSISTENT_APPLESCRIPT = True
+APPLESCRIPT_TIMEOUT = 30.0  # 상주 호스트 응답 상한(초). 스크립트 내 delay 합보다 넉넉히.
+# 융합 실행: 텍스트만 보내는 대상은 연속된 키 입력 단계를 한 스크립트로 묶는다.
+# (활성화+검색창 띄우기 / 결과 포커스+채팅방 열기 / 채팅방 닫기는 검색 초기화가 겸함)
+# AX 확인 지점(검색어 입력·친구 검증·입력창 등장·전송 확인)은 그대로 유지한다.
+USE_FUSED_APPLESCRIPT = True
 # 업로드 파일은 스크립트 폴더가 아닌 시스템 임시 디렉터리에 저장 (폴더명 공백·복사본 경로 등으로 인한 ENOENT 방지)
 UPLOAD_TEMP_XLSX = os.path.join(tempfile.gettempdir(), f'kakao_sender_upload_{os.getpid()}.xlsx')
+# 파싱된 명단 캐시 (파일 내용 해시 기준). 개수·총 크기·기간 상한을 넘으면 오래 안 쓴 것부터 삭제.
+USE_ROSTER_CACHE = True
+ROSTER_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'kakao_sender_roster_cache')
+ROSTER_CACHE_MAX_FILES = 8
+ROSTER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+ROSTER_CACHE_MAX_AGE_DAYS = 14
+# 전송 기록(저널): 실제 전송마다 대상자별 시도/확인/전송/실패를 남겨 비정상 종료 후 이어보내기에 쓴다.
+JOURNAL_DIR = os.path.join(APP_SUPPORT_DIR, 'journal')
+JOURNAL_KEEP_RUNS = 30
+# 검증만(감사) 모드: 채팅방을 열지 않고 검색·AX 검증만 최고 속도로 돌려 대상자별 결과를 CSV로 남긴다.
+AUDIT_DIR = os.path.join(APP_SUPPORT_DIR, 'audit')
+AUDIT_KEEP_REPORTS = 20
+# 전송 파이프라인: 대상자 준비(메시지·이름 파생형)와 결과 기록을 UI 구동과 겹쳐 돌릴 때
+# 단계 사이 큐 크기. 준비가 UI보다 이만큼까지만 앞서 나간다.
+PIPELINE_QUEUE_SIZE = 4
+# 분산 전송(여러 맥): 코디네이터가 대상자를 임대(lease)로 나눠 주고, 워커가 각자 자기 카카오톡으로
+# 보낸 뒤 결과를 보고한다. 하트비트가 이 시간 동안 끊기면 임대가 만료된다.
+WORK_LEASE_SECONDS = 30.0
+WORK_HEARTBEAT_SECONDS = 5.0
+WORK_POLL_SECONDS = 2.0  # 일감이 없을 때 워커가 다시 요청하는 간격
+WORK_PREPARE_BACKOFF_MAX = 60.0  # 카카오톡 준비에 실패한 워커가 다시 임대받기까지의 최대 대기(초)
+WORK_TOKEN_HEADER = 'X-KakaoSender-Token'
+WORK_TOKEN_COOKIE = 'kakao_sender_token'  # 외부에 열린 서버에서 브라우저가 토큰을 들고 다니는 쿠키
+# 친구 목록 색인: 전송 전에 친구 탭 목록을 AX로 한 번 끝까지 훑어 표시 이름을 모으고, 대상자를
+# 있음/후보 여러 명/없음으로 미리 분류해 뒤의 둘은 검색 없이 건너뛴다. 훑은 목록은
+# FRIEND_DIRECTORY_MAX_AGE초 동안 재사용하고, 그 뒤엔 다시 훑어 바뀐 이름만 색인에 반영한다.
+# 목록을 끝까지 훑지 못하면(스크롤 불가 등) 색인 없이 대상자마다 검색·검증한다.
+USE_FRIEND_DIRECTORY = True
+FRIEND_DIRECTORY_MAX_AGE = 600.0
+FRIEND_DIRECTORY_SCROLL_STEP = 0.02   # 첫 스크롤 폭(스크롤바 값 0~1 기준). 화면이 겹치게 자동 조절
+FRIEND_DIRECTORY_MIN_STEP = 0.0005
+FRIEND_DIRECTORY_SETTLE = 0.15        # 스크롤 후 행이 다시 그려질 때까지 대기(초)
+FRIEND_DIRECTORY_MAX_PAGES = 3000
 
 # ============================================================
 # 단계별 소요시간 계측 (B단계) — 패스트 모드 설계를 위한 실측 도구.
-# 사용자 로그(log_queue)와 분리된 채널로 기록하고, 전송 종료 시 CSV로 덤프 +
-# 요약 몇 줄만 로그에 남긴다. 계측 오버헤드는 perf_counter 호출(마이크로초급)뿐.
-# 비활성화하려면 TIMING_ENABLED = False.
+# 사용자 로그(log_queue)와 분리된 채널로 기록한다. 단계별로 고정 크기 히스토그램만 유지하고
+# 원자료는 CSV에 바로바로 이어 쓰므로, 대상자가 아무리 많아도 메모리는 일정하다. 실행 중에는
+# 단계별 백분위를 화면에 주기적으로 보내고, 종료 시 요약 몇 줄만 로그에 남긴다.
+# 계측 오버헤드는 perf_counter 호출 + 구간 계산(마이크로초급)뿐. 비활성화하려면 TIMING_ENABLED = False.
 # ============================================================
 TIMING_ENABLED = True
 TIMING_DIR = os.path.join(tempfile.gettempdir(), 'kakao_sender_timing')
-_timing_records = []  # list[tuple(idx, name, stage, seconds)]
+# 히스토그램(HDR 방식 로그 구간): 0.1ms~1시간을 2%씩 넓어지는 구간으로 센다 → 백분위 상대 오차 ≤ 약 1%
+TIMING_HIST_MIN = 1e-4
+TIMING_HIST_MAX = 3600.0
+TIMING_HIST_GROWTH = 1.02
+TIMING_CSV_FLUSH_ROWS = 64  # 원자료 CSV를 이 행 수마다 디스크로 내보낸다
+TIMING_LIVE_INTERVAL = 2.0  # 실행 중 단계별 통계를 화면에 보내는 최소 간격(초)
 _timing_lock = threading.Lock()
 _timing_ctx = {'idx': None, 'name': None}
 # 단계 출력 순서(요약 표 정렬용)
 TIMING_STAGE_ORDER = [
-    'ensure_ready', 'search', 'search_result_wait', 'verify_ax',
+    'friend_directory', 'ensure_ready', 'search', 'search_result_wait', 'verify_ax',
     'open_chat', 'layout_wait', 'image_send', 'ax_input_send', 'close_chat',
     'send_total', 'post_send_wait', 'reset_search', 'person_total',
+    'as_compile', 'as_invoke',
 ]
 
 
+class StageHistogram:
+    """고정 메모리 로그 구간 히스토그램. 구간 i(≥1)는 [MIN·g^(i-1), MIN·g^i), 구간 0은 MIN 미만.
+    백분위는 해당 구간의 기하 중앙값(관측 최소/최대로 제한)으로 돌려준다."""
+
+    LOG_GROWTH = math.log(TIMING_HIST_GROWTH)
+    BUCKETS = int(math.ceil(math.log(TIMING_HIST_MAX / TIMING_HIST_MIN) / LOG_GROWTH)) + 2
+    __slots__ = ('counts', 'n', 'total', 'lo', 'hi')
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.n = 0
+        self.total = 0.0
+        self.lo = math.inf
+        self.hi = 0.0
+
+    def add(self, seconds: float):
+        if seconds < TIMING_HIST_MIN:
+            i = 0
+        else:
+            i = min(int(math.log(seconds / TIMING_HIST_MIN) / self.LOG_GROWTH) + 1, self.BUCKETS - 1)
+        self.counts[i] += 1
+        self.n += 1
+        self.total += seconds
+        if seconds < self.lo:
+            self.lo = seconds
+        if seconds > self.hi:
+            self.hi = seconds
+
+    def percentiles(self, qs=(0.5, 0.9, 0.99)) -> list:
+        """qs(오름차순) 백분위들을 한 번 훑어 계산."""
+        if not self.n:
+            return [0.0 for _ in qs]
+        out = []
+        ranks = [max(1, math.ceil(q * self.n)) for q in qs]
+        cum = 0
+        k = 0
+        for i, c in enumerate(self.counts):
+            cum += c
+            while k < len(ranks) and cum >= ranks[k]:
+                mid = TIMING_HIST_MIN * math.exp((i - 0.5) * self.LOG_GROWTH) if i else TIMING_HIST_MIN / 2
+                out.append(min(max(mid, self.lo), self.hi))
+                k += 1
+            if k == len(ranks):
+                break
+        return out
+
+    def snapshot(self) -> dict:
+        p50, p90, p99 = self.percentiles()
+        return {'n': self.n, 'avg': self.total / self.n if self.n else 0.0,
+                'p50': p50, 'p90': p90, 'p99': p99, 'max': self.hi}
+
+
+class TimingTelemetry:
+    """한 실행의 계측: 단계별 히스토그램 + 원자료(idx, name, stage, seconds) CSV 이어 쓰기."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.stages = {}
+        self.csv_path = None
+        self._file = None
+        self._writer = None
+        self._unflushed = 0
+        self._last_live = 0.0
+
+    def add(self, idx, name, stage: str, seconds: float):
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = StageHistogram()
+        hist.add(seconds)
+        if self._file is None and self.csv_path is None:
+            self._open_csv()
+        if self._writer is not None:
+            self._writer.writerow([idx, name, stage, f'{seconds:.4f}'])
+            self._unflushed += 1
+            if self._unflushed >= TIMING_CSV_FLUSH_ROWS:
+                self._file.flush()
+                self._unflushed = 0
+
+    def _open_csv(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.csv_path = os.path.join(self.directory, f'timing_{ts}.csv')
+            self._file = open(self.csv_path, 'w', newline='', encoding='utf-8-sig')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(['idx', 'name', 'stage', 'seconds', 'reason', 'attempts'])
+        except OSError:
+            self.csv_path = ''  # 다시 시도하지 않는다(히스토그램은 계속 쌓는다)
+            self._file = self._writer = None
+
+    def add_outcome(self, idx, name, outcome):
+        """대상자 한 명의 최종 결과 행(stage='outcome', 사유·시도 수 포함)."""
+        if self._file is None and self.csv_path is None:
+            self._open_csv()
+        if self._writer is not None:
+            self._writer.writerow([idx, name, 'outcome', f'{outcome.elapsed:.4f}', outcome.reason, outcome.attempts])
+            self._unflushed += 1
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = self._writer = None
+
+    def ordered_stages(self) -> list:
+        ordered = [s for s in TIMING_STAGE_ORDER if s in self.stages]
+        return ordered + [s for s in self.stages if s not in TIMING_STAGE_ORDER]
+
+    def snapshot(self) -> dict:
+        return {stage: self.stages[stage].snapshot() for stage in self.ordered_stages()}
+
+    def live_due(self, now: float) -> bool:
+        """실행 중 화면 갱신 주기가 됐는지 (됐으면 시각을 갱신)."""
+        if now - self._last_live < TIMING_LIVE_INTERVAL:
+            return False
+        self._last_live = now
+        return True
+
+
+_timing = TimingTelemetry(TIMING_DIR)
+
+
 def set_timing_context(idx, name):
     """이번에 처리할 대상자 정보를 계측 컨텍스트에 설정 (전송 스레드 단일 → 전역 안전)."""
     _timing_ctx['idx'] = idx
@@ -122,74 +415,817 @@ def time_stage(stage: str):
     try:
         yield
     finally:
-        dt = time.perf_counter() - t0
-        with _timing_lock:
-            _timing_records.append((_timing_ctx['idx'], _timing_ctx['name'], stage, dt))
+        record_timing(stage, time.perf_counter() - t0)
+
+
+def record_timing(stage: str, seconds: float):
+    """이미 잰 소요시간(초)을 단계명과 함께 기록. (외부 프로세스가 보고한 시간 등)
+    한 명이 끝날 때(person_total)마다, 주기가 됐으면 단계별 통계를 화면에 보낸다."""
+    if not TIMING_ENABLED:
+        return
+    run_metrics.observe(stage, seconds)
+    sender_stats.observe_stage(stage, seconds)
+    live = None
+    with _timing_lock:
+        _timing.add(_timing_ctx['idx'], _timing_ctx['name'], stage, seconds)
+        if stage == 'person_total' and _timing.live_due(time.monotonic()):
+            live = _timing.snapshot()
+    if live is not None:
+        log_queue.put(json.dumps({'type': 'timing', 'stages': live}))
+
+
+def record_outcome(idx, name, outcome):
+    """대상자 한 명의 최종 결과(SendOutcome)를 계측 CSV에 남긴다."""
+    if not TIMING_ENABLED:
+        return
+    with _timing_lock:
+        _timing.add_outcome(idx, name, outcome)
 
 
 def reset_timing():
-    """새 전송 시작 시 이전 계측 기록을 비운다."""
+    """새 전송 시작 시 이전 계측을 닫고 새로 시작한다."""
+    global _timing
     with _timing_lock:
-        _timing_records.clear()
+        _timing.close()
+        _timing = TimingTelemetry(TIMING_DIR)
 
 
 def dump_timing_summary():
-    """누적된 계측 기록을 CSV로 저장하고, 단계별 요약을 사용자 로그로 남긴다.
+    """계측을 마감(CSV 닫기)하고 단계별 요약을 사용자 로그로 남긴다.
     반환: 저장된 CSV 경로(또는 None)."""
     if not TIMING_ENABLED:
         return None
     with _timing_lock:
-        records = list(_timing_records)
-    if not records:
+        _timing.close()
+        stages = _timing.snapshot()
+        csv_path = _timing.csv_path or None
+    if not stages:
         return None
+    log_queue.put(json.dumps({'type': 'timing', 'stages': stages}))
+
+    # 요약 로그 (단계 순서대로)
+    log("⏱ 단계별 소요시간(계측) — 평균/p50/p90/p99/최대 (초)")
+    for stage, st in stages.items():
+        if stage == 'person_total':
+            continue
+        log(f"   • {stage:<18} avg {st['avg']:5.2f} | p50 {st['p50']:5.2f} | p90 {st['p90']:5.2f} "
+            f"| p99 {st['p99']:5.2f} | max {st['max']:5.2f} (n={st['n']})")
+    person = stages.get('person_total')
+    if person:
+        n_people = person['n']
+        log(f"   ▷ 1인당 합계        avg {person['avg']:5.2f} | p50 {person['p50']:5.2f} | p90 {person['p90']:5.2f} "
+            f"| p99 {person['p99']:5.2f} | max {person['max']:5.2f} (n={n_people})")
+        log(f"   ▷ {n_people}명 추정 총시간 ≈ {person['avg'] * n_people:.0f}초 (≈ {person['avg'] * n_people / 60:.1f}분)")
+    if csv_path:
+        log(f"   🗂 상세 CSV: {csv_path}")
+    return csv_path
+
+
+# ============================================================
+# 실시간 진행 지표 — 한 명이 끝날 때마다 처리량(분당 인원)·남은 시간·실패율과 주요 단계의
+# 최근 소요시간(스파크라인)을 'metrics' 이벤트로 화면에 보낸다. 처리량은 최근 완료 간격으로
+# 계산하므로 일시정지·속도 변화가 바로 반영된다.
+# 지표는 전송·기록 스레드가 쓰고 HTTP(SSE·/metrics) 스레드가 읽으므로, 쓰기와 읽기(복사)를
+# _metrics_lock 안에서 한다. 복사만 잠금 안에서 하고 계산·서식은 잠금 밖에서 한다.
+# ============================================================
+METRICS_RATE_WINDOW = 20   # 처리량 계산에 쓰는 최근 완료 수
+METRICS_SPARK_POINTS = 30  # 단계별 스파크라인 점 개수
+METRICS_SPARK_STAGES = ('search', 'verify_ax', 'send_total', 'person_total')
+_metrics_lock = threading.Lock()
+
+
+class RunMetrics:
+    """한 실행의 진행 지표. 결과는 기록 단계(한 스레드)에서, 단계 시간은 record_timing에서 들어온다."""
+
+    def __init__(self):
+        self.start(0)
+
+    def start(self, total: int):
+        with _metrics_lock:
+            self.total = total
+            self.processed = 0
+            self.success = 0
+            self.failed = 0
+            self.started_at = time.monotonic()
+            self.reasons = {}   # reason → [건수, 소요 합, 소요 최대, 시도 합]
+            self.failures = []  # [(이름, reason)]
+            self._done_at = deque(maxlen=METRICS_RATE_WINDOW)
+            self._spark = {stage: deque(maxlen=METRICS_SPARK_POINTS) for stage in METRICS_SPARK_STAGES}
+
+    def observe(self, stage: str, seconds: float):
+        with _metrics_lock:
+            spark = self._spark.get(stage)
+            if spark is not None:
+                spark.append(round(seconds, 3))
+
+    def resumed(self):
+        """일시정지 후 재개: 멈춰 있던 시간이 처리량에 섞이지 않게 최근 완료 기록을 비운다."""
+        with _metrics_lock:
+            self._done_at.clear()
+
+    def result(self, outcome, idx=None, name=None):
+        """한 명의 최종 결과(SendOutcome)를 반영하고 화면에 지표를 보낸다."""
+        with _metrics_lock:
+            self.processed += 1
+            if outcome.ok:
+                self.success += 1
+            else:
+                self.failed += 1
+                self.failures.append((name, outcome.reason))
+            entry = self.reasons.get(outcome.reason)
+            if entry is None:
+                entry = self.reasons[outcome.reason] = [0, 0.0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += outcome.elapsed
+            entry[2] = max(entry[2], outcome.elapsed)
+            entry[3] += outcome.attempts
+            self._done_at.append(time.monotonic())
+        sender_stats.result(outcome.ok, outcome.reason)
+        record_outcome(idx, name, outcome)
+        log_queue.put(json.dumps(dict(self.snapshot(), type='metrics')))
+
+    def reason_summary(self) -> dict:
+        """사유별 건수·평균/최대 소요시간·평균 시도 수 (건수 많은 순)."""
+        with _metrics_lock:
+            reasons = {reason: tuple(entry) for reason, entry in self.reasons.items()}
+        return {
+            reason: {
+                'label': SEND_REASON_LABELS.get(reason, reason),
+                'count': n,
+                'avg_seconds': round(total / n, 3),
+                'max_seconds': round(worst, 3),
+                'avg_attempts': round(tries / n, 2),
+            }
+            for reason, (n, total, worst, tries) in sorted(reasons.items(), key=lambda kv: -kv[1][0])
+        }
+
+    @staticmethod
+    def _rate(done) -> Optional[float]:
+        if len(done) < 2 or done[-1] <= done[0]:
+            return None
+        return (len(done) - 1) / (done[-1] - done[0]) * 60
+
+    def per_minute(self) -> Optional[float]:
+        with _metrics_lock:
+            done = list(self._done_at)
+        return self._rate(done)
+
+    def snapshot(self) -> dict:
+        with _metrics_lock:
+            processed, total, success, failed = self.processed, self.total, self.success, self.failed
+            started_at = self.started_at
+            done = list(self._done_at)
+            reasons = {reason: entry[0] for reason, entry in self.reasons.items()}
+            spark = {stage: list(values) for stage, values in self._spark.items()}
+        rate = self._rate(done)
+        remaining = max(total - processed, 0)
+        return {
+            'processed': processed,
+            'total': total,
+            'success': success,
+            'failed': failed,
+            'failure_rate': failed / processed if processed else 0.0,
+            'per_minute': rate,
+            'eta_seconds': remaining / rate * 60 if rate else None,
+            'elapsed': time.monotonic() - started_at,
+            'reasons': reasons,
+            'spark': spark,
+        }
+
+
+run_metrics = RunMetrics()
+
+
+# ============================================================
+# Prometheus 내보내기 (/metrics) — 여러 대의 전송 맥을 대시보드에서 모아 본다.
+# 값은 프로세스가 떠 있는 동안 누적된다. 단계 시간은 전송 스레드, 결과는 기록 스레드가 더하고
+# 수집(scrape)은 HTTP 스레드가 읽으므로, 진행 지표와 같은 _metrics_lock 안에서 더하고 복사한다.
+# 서식(텍스트 만들기)은 복사본으로 잠금 밖에서 하므로 수집이 전송 스레드를 오래 붙잡지 않는다.
+# ============================================================
+PROM_STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # 단계 소요시간 구간 상한(초)
+
+
+class _PromStageHistogram:
+    """Prometheus 히스토그램 한 개(구간별 개수는 누적하지 않고 저장, 내보낼 때 누적)."""
+    __slots__ = ('buckets', 'count', 'sum')
+
+    def __init__(self):
+        self.buckets = [0] * len(PROM_STAGE_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        i = bisect.bisect_left(PROM_STAGE_BUCKETS, seconds)
+        if i < len(self.buckets):
+            self.buckets[i] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+class SenderStats:
+    """/metrics로 내보내는 누적 카운터·단계 히스토그램."""
+
+    def __init__(self):
+        self.runs = 0
+        self.processed = 0
+        self.sent = 0
+        self.failed = {}  # reason → 건수
+        self.stages = {}  # stage → _PromStageHistogram
+
+    def observe_stage(self, stage: str, seconds: float):
+        with _metrics_lock:
+            hist = self.stages.get(stage)
+            if hist is None:
+                hist = self.stages[stage] = _PromStageHistogram()
+            hist.observe(seconds)
+
+    def result(self, sent_ok: bool, reason: str):
+        with _metrics_lock:
+            self.processed += 1
+            if sent_ok:
+                self.sent += 1
+            else:
+                self.failed[reason] = self.failed.get(reason, 0) + 1
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식(0.0.4)."""
+        progress = run_metrics.snapshot()
+        with _metrics_lock:
+            runs, processed, sent = self.runs, self.processed, self.sent
+            failed = sorted(self.failed.items())
+            stages = {stage: (list(hist.buckets), hist.count, hist.sum) for stage, hist in self.stages.items()}
+        out = []
+
+        def metric(name, kind, help_text, samples):
+            out.append(f'# HELP {name} {help_text}')
+            out.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_str = ','.join(f'{k}="{v}"' for k, v in labels.items())
+                out.append(f'{name}{{{label_str}}} {value}' if label_str else f'{name} {value}')
+
+        metric('kakaosender_info', 'gauge', 'Build information.',
+               [({'version': VERSION, 'mode': 'coordinator' if current_coordinator is not None else 'local'}, 1)])
+        metric('kakaosender_runs_total', 'counter', 'Send runs started.', [({}, runs)])
+        metric('kakaosender_recipients_processed_total', 'counter', 'Recipients with a final result.',
+               [({}, processed)])
+        metric('kakaosender_recipients_sent_total', 'counter', 'Recipients sent successfully.', [({}, sent)])
+        metric('kakaosender_recipients_failed_total', 'counter', 'Recipients that failed, by reason.',
+               [({'reason': reason}, n) for reason, n in failed])
+        metric('kakaosender_running', 'gauge', 'Whether a send run is in progress.', [({}, int(is_running))])
+        metric('kakaosender_paused', 'gauge', 'Whether the current run is paused.',
+               [({}, int(is_running and pause_requested))])
+        metric('kakaosender_queue_position', 'gauge', 'Recipients finished in the current run.',
+               [({}, progress['processed'])])
+        metric('kakaosender_queue_total', 'gauge', 'Recipients targeted by the current run.', [({}, progress['total'])])
+        metric('kakaosender_recipients_per_minute', 'gauge', 'Recent throughput of the current run.',
+               [({}, round(progress['per_minute'] or 0.0, 3))])
+        if progress['eta_seconds'] is not None:
+            metric('kakaosender_eta_seconds', 'gauge', 'Estimated time left in the current run.',
+                   [({}, round(progress['eta_seconds'], 1))])
+
+        name = 'kakaosender_stage_seconds'
+        out.append(f'# HELP {name} Time spent per sending stage.')
+        out.append(f'# TYPE {name} histogram')
+        for stage in sorted(stages, key=lambda st: (TIMING_STAGE_ORDER + [st]).index(st)):
+            buckets, count, total = stages[stage]
+            cumulative = 0
+            for bound, n in zip(PROM_STAGE_BUCKETS, buckets):
+                cumulative += n
+                out.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            out.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {max(count, cumulative)}')
+            out.append(f'{name}_sum{{stage="{stage}"}} {total:.6f}')
+            out.append(f'{name}_count{{stage="{stage}"}} {max(count, cumulative)}')
+        return '\n'.join(out) + '\n'
+
+
+sender_stats = SenderStats()
+
+
+# ============================================================
+# 적응형 대기 — 고정 대기 대신, 관측한 준비 소요시간으로 단계별 대기를 학습한다.
+# 관측은 AX 준비 확인(알림/폴링)이 '대기 없이' 돌았을 때의 소요시간만 쓴다
+# (고정 대기 뒤의 확인은 실제보다 늦게 잡혀 값이 계속 커지기 때문).
+# ============================================================
+# 단계: (기본값, 하한, 상한) 초. 기본값은 학습 전(관측 부족) 값 = 기존 고정 대기.
+ADAPTIVE_DELAY_SPECS = {
+    'search_results': (0.8, 0.15, 1.2),  # 검색어 입력 → 결과 행 등장
+    'chat_input': (0.8, 0.15, 1.5),      # 채팅방 열기 → 메시지 입력창 등장
+}
+
+
+class AdaptiveDelays:
+    """단계별 대기시간 컨트롤러.
+
+    delay = 최근 관측(최대 window개)의 percentile 백분위 + margin, [하한, 상한]으로 제한.
+    관측이 min_samples개 미만이면 기본값을 쓴다. 실패(준비 확인 실패·재시도로만 성공)하면
+    현재 값의 backoff배를 바닥값으로 걸고, 이후 정상 관측마다 그 바닥값을 decay배로 줄인다.
+    """
+
+    def __init__(self, specs, path=None, percentile: float = 0.9, margin: float = 0.1,
+                 window: int = 50, min_samples: int = 5, backoff: float = 1.5, decay: float = 0.8):
+        self.specs = dict(specs)
+        self.path = path
+        self.percentile = percentile
+        self.margin = margin
+        self.window = window
+        self.min_samples = min_samples
+        self.backoff = backoff
+        self.decay = decay
+        self._samples = {stage: [] for stage in self.specs}
+        self._floor = {stage: 0.0 for stage in self.specs}
+        self._lock = threading.Lock()
+
+    def _learned(self, stage) -> Optional[float]:
+        samples = sorted(self._samples[stage])
+        if len(samples) < self.min_samples:
+            return None
+        rank = max(0, min(len(samples) - 1, int(math.ceil(self.percentile * len(samples))) - 1))
+        return samples[rank] + self.margin
+
+    def delay(self, stage) -> float:
+        """stage의 현재 대기시간(초). 덮어쓰기 설정이 있으면 그 값."""
+        if stage in ADAPTIVE_DELAY_OVERRIDES:
+            return float(ADAPTIVE_DELAY_OVERRIDES[stage])
+        default, lo, hi = self.specs[stage]
+        if not USE_ADAPTIVE_DELAYS:
+            return default
+        with self._lock:
+            learned = self._learned(stage)
+            value = default if learned is None else learned
+            value = max(value, self._floor[stage])
+        return min(hi, max(lo, value))
+
+    def observe(self, stage, seconds: float):
+        """준비 확인이 대기 없이 걸린 시간(초)을 기록."""
+        with self._lock:
+            samples = self._samples[stage]
+            samples.append(float(seconds))
+            del samples[:-self.window]
+            self._floor[stage] *= self.decay
+
+    def failed(self, stage):
+        """준비가 늦어 실패했음을 기록 → 당분간 대기를 늘린다."""
+        current = self.delay(stage)
+        with self._lock:
+            self._floor[stage] = min(self.specs[stage][2], current * self.backoff)
+
+    def summary(self) -> str:
+        return ", ".join(f"{stage} {self.delay(stage):.2f}초(n={len(self._samples[stage])})"
+                         for stage in self.specs)
+
+    def load(self):
+        """저장된 학습값을 불러온다. 없거나 깨졌으면 조용히 기본값으로 시작."""
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f).get('stages', {})
+        except Exception:
+            return
+        with self._lock:
+            for stage in self.specs:
+                entry = data.get(stage) or {}
+                try:
+                    self._samples[stage] = [float(x) for x in entry.get('samples', [])][-self.window:]
+                    self._floor[stage] = float(entry.get('floor', 0.0))
+                except (TypeError, ValueError):
+                    continue
 
-    # 단계별 집계
-    by_stage = {}
-    for _idx, _name, stage, sec in records:
-        by_stage.setdefault(stage, []).append(sec)
+    def save(self):
+        """학습값을 저장(임시 파일에 쓴 뒤 교체 — 중간에 끊겨도 기존 파일은 온전)."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {'version': 1, 'stages': {
+                stage: {'samples': [round(x, 4) for x in self._samples[stage]], 'floor': round(self._floor[stage], 4)}
+                for stage in self.specs
+            }}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            pass
+
+
+adaptive_delays = AdaptiveDelays(ADAPTIVE_DELAY_SPECS, ADAPTIVE_DELAY_FILE)
+adaptive_delays.load()
+
+# ============================================================
+# 명단(엑셀) 읽기 — openpyxl 읽기 전용 모드로 한 행씩 스트리밍하며 필요한 열만 열 목록에 담는다.
+# 수만 행·열 많은 명단도 전체 DataFrame을 만들지 않는다. 파싱·정규화 결과는 파일 내용
+# 해시로 캐시해, 같은 파일로 다시 실행(모의 전송 → 실제 전송, 중단 후 재실행)하면 엑셀을
+# 다시 읽지 않는다.
+# ============================================================
+ROSTER_COLUMNS = ('이름', '등록형태', '연령')
+ROSTER_CACHE_VERSION = 4  # 정규화 규칙(이름 파생형 열)·읽는 열이 바뀌면 올려서 이전 캐시를 무효화한다
 
-    def stat(vals):
-        n = len(vals)
-        avg = sum(vals) / n
-        s = sorted(vals)
-        mid = s[n // 2] if n % 2 else (s[n // 2 - 1] + s[n // 2]) / 2
-        return n, avg, mid, min(vals), max(vals)
 
-    person_totals = by_stage.get('person_total', [])
-    n_people = len(person_totals)
+def iter_roster_rows(path, stats=None):
+    """엑셀 명단의 첫 시트를 한 행씩 읽어 (이름, 등록형태, 연령, 첨부파일)을 산출(빈 행 제외).
 
-    # CSV 덤프 (raw + 요약)
-    csv_path = None
+    첫 행은 헤더이며 ROSTER_COLUMNS 세 열과 선택 열 ROSTER_ATTACHMENT_COLUMN만 읽는다(나머지 열은
+    건드리지 않음 — 첨부 열이 없으면 첨부파일은 None). stats dict를 주면 stats['total']에 읽은
+    데이터 행 수를 채운다. 필요한 열이 없으면 ValueError."""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
     try:
-        os.makedirs(TIMING_DIR, exist_ok=True)
-        ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-        csv_path = os.path.join(TIMING_DIR, f'timing_{ts}.csv')
-        with open(csv_path, 'w', newline='', encoding='utf-8-sig') as f:
-            w = csv.writer(f)
-            w.writerow(['idx', 'name', 'stage', 'seconds'])
-            for idx, name, stage, sec in records:
-                w.writerow([idx, name, stage, f'{sec:.4f}'])
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [str(v).strip() if v is not None else '' for v in next(rows, ())]
+        missing = [c for c in ROSTER_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"엑셀에 필요한 열이 없습니다: {', '.join(missing)}")
+        name_i, type_i, age_i = (header.index(c) for c in ROSTER_COLUMNS)
+        file_i = header.index(ROSTER_ATTACHMENT_COLUMN) if ROSTER_ATTACHMENT_COLUMN in header else None
+        total = 0
+        for row in rows:
+            name = row[name_i] if name_i < len(row) else None
+            reg_type = row[type_i] if type_i < len(row) else None
+            age = row[age_i] if age_i < len(row) else None
+            if name is None and reg_type is None and age is None:
+                continue
+            attachment = row[file_i] if file_i is not None and file_i < len(row) else None
+            total += 1
+            if stats is not None:
+                stats['total'] = total
+            yield name, reg_type, age, attachment
+    finally:
+        wb.close()
+
+
+def _parse_roster_columns(path) -> dict:
+    """명단 전체를 열 단위 목록 {열 이름: [값...]}으로 파싱(첨부파일·이름 파생형 열 포함).
+    행 목록을 따로 만들지 않고 읽는 즉시 열 목록에 나눠 담는다. 빈 칸은 pandas 읽기와 같게
+    NaN으로 둔다(첨부파일 열만 None). openpyxl로 못 여는 파일(.xls 등)은 pandas 전체 읽기로 폴백한다."""
+    try:
+        columns = {c: [] for c in ROSTER_COLUMNS + (ROSTER_ATTACHMENT_COLUMN,)}
+        names, reg_types, ages, attachments = (columns[c].append for c in columns)
+        for name, reg_type, age, attachment in iter_roster_rows(path):
+            names(math.nan if name is None else name)
+            reg_types(math.nan if reg_type is None else reg_type)
+            ages(math.nan if age is None else age)
+            attachments(attachment)
+    except (InvalidFileException, zipfile.BadZipFile):
+        df = pd.read_excel(path)
+        columns = {c: df[c].tolist() for c in ROSTER_COLUMNS}
+        columns[ROSTER_ATTACHMENT_COLUMN] = (
+            df[ROSTER_ATTACHMENT_COLUMN].where(df[ROSTER_ATTACHMENT_COLUMN].notna(), None).tolist()
+            if ROSTER_ATTACHMENT_COLUMN in df.columns else [None] * len(df))
+    columns.update(compute_name_forms(columns['이름']))
+    return columns
+
+
+def _file_sha256(path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _evict_roster_cache():
+    """오래된(ROSTER_CACHE_MAX_AGE_DAYS 초과) 캐시를 지우고, 개수·총 크기 상한을 넘으면
+    가장 오래 안 쓴 것부터 지운다(적중 시 mtime을 갱신하므로 LRU)."""
+    try:
+        entries = []
+        for fname in os.listdir(ROSTER_CACHE_DIR):
+            if fname.endswith('.pkl'):
+                fpath = os.path.join(ROSTER_CACHE_DIR, fname)
+                st = os.stat(fpath)
+                entries.append((st.st_mtime, st.st_size, fpath))
+    except OSError:
+        return
+    entries.sort(reverse=True)  # 최근 사용 순
+    now, kept, kept_bytes = time.time(), 0, 0
+    for mtime, size, fpath in entries:
+        expired = now - mtime > ROSTER_CACHE_MAX_AGE_DAYS * 86400
+        if expired or kept >= ROSTER_CACHE_MAX_FILES or kept_bytes + size > ROSTER_CACHE_MAX_BYTES:
+            try:
+                os.remove(fpath)
+            except OSError:
+                pass
+            continue
+        kept += 1
+        kept_bytes += size
+
+
+def load_roster(path) -> dict:
+    """파싱된 명단 {열 이름: [값...]} (ROSTER_COLUMNS + 첨부파일 + 이름 파생형).
+    같은 내용의 파일을 이미 파싱했으면 캐시에서 읽고, 적중/미적중을 로그 한 줄로 남긴다."""
+    t0 = time.perf_counter()
+    if not USE_ROSTER_CACHE:
+        return _parse_roster_columns(path)
+    digest = _file_sha256(path)
+    cache_path = os.path.join(ROSTER_CACHE_DIR, f'{digest[:32]}_v{ROSTER_CACHE_VERSION}.pkl')
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('sha256') == digest and set(cached['columns']) >= set(ROSTER_COLUMNS):
+            os.utime(cache_path)
+            log(f"🗃 명단 캐시 적중 — 엑셀 파싱 생략 ({time.perf_counter() - t0:.2f}초)")
+            return cached['columns']
     except Exception:
-        csv_path = None
+        pass
+    columns = _parse_roster_columns(path)
+    try:
+        os.makedirs(ROSTER_CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'sha256': digest, 'columns': columns}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        _evict_roster_cache()
+    except Exception:
+        pass
+    log(f"🗃 명단 캐시 없음 — 엑셀 파싱 후 저장 ({time.perf_counter() - t0:.2f}초)")
+    return columns
 
-    # 요약 로그 (단계 순서대로)
-    ordered = [s for s in TIMING_STAGE_ORDER if s in by_stage]
-    ordered += [s for s in by_stage if s not in TIMING_STAGE_ORDER]
-    log("⏱ 단계별 소요시간(계측) — 평균/중앙값/최소/최대 (초)")
-    for stage in ordered:
-        if stage == 'person_total':
+
+def load_target_roster(path, register_types, age_groups):
+    """필터를 통과한 대상자 DataFrame(ROSTER_COLUMNS + 첨부파일 + 이름 파생형 열)과 전체 행 수 → (target_df, total)."""
+    columns = load_roster(path)
+    register_types, age_groups = set(register_types), set(age_groups)
+    keep = [i for i, (reg_type, age) in enumerate(zip(columns['등록형태'], columns['연령']))
+            if reg_type in register_types and age in age_groups]
+    target_df = pd.DataFrame({c: [values[i] for i in keep] for c, values in columns.items()})
+    return target_df, len(columns['이름'])
+
+
+# 사전 점검 보고서의 항목별 표시 상한 (개수는 counts에 전부 센다)
+PREFLIGHT_REPORT_LIMIT = 50
+# 이보다 짧은 이름(공백 제외 글자 수)은 검색 결과가 너무 많이 떠 경고한다.
+PREFLIGHT_MIN_NAME_CHARS = 2
+
+
+def validate_roster(target_df) -> dict:
+    """대상자 명단 사전 점검 — 모든 문제 유형을 한 번에 계산해 구조화된 보고서로 반환.
+
+    errors(하나라도 있으면 전송 중단):
+      duplicates: 공백 정규화 후 같은 이름 / emoji_only: 텍스트 없이 이모티콘·기호만인 이름 /
+      canonical_collisions: 표기는 다르지만 정확일치(NFC·변형 선택자) 정규화 후 같아지는 이름들
+    warnings(전송은 진행):
+      substring_risk: [이름, 그 이름을 포함하는 다른 이름] — 부분 일치 검증 시 혼동 위험 /
+      short_names: 너무 짧아 검색 결과가 많이 뜨는 이름
+    명단 파생형 열(compute_name_forms)을 pandas 벡터 연산과 2글자 조각 색인으로 다룬다(행별 apply 없음).
+    """
+    t0 = time.perf_counter()
+    normalized = target_df['_normalized'].astype(str)
+    canonical = target_df['_canonical'].astype(str)
+    match = target_df['_match'].astype(str)
+
+    duplicates = normalized[normalized.duplicated(keep=False)].unique().tolist()
+    emoji_only = target_df.loc[match == '', '이름'].astype(str).unique().tolist()
+
+    pairs = pd.DataFrame({'canonical': canonical, 'normalized': normalized}).drop_duplicates()
+    pairs = pairs[pairs['canonical'].duplicated(keep=False)]
+    collisions = pairs.groupby('canonical', sort=False)['normalized'].agg(list).tolist()
+
+    compact_len = match.str.replace(r'\s+', '', regex=True).str.len()
+    short_names = normalized[(compact_len > 0) & (compact_len < PREFLIGHT_MIN_NAME_CHARS)].unique().tolist()
+
+    # 부분 일치 검증(classify_friend_match)은 앞·중간·끝 어디든 포함되면 인정하므로, 충분히 긴 이름마다
+    # 그 이름을 포함하는 다른 이름을 모두 찾는다. 포함하는 쪽은 2글자 조각을 전부 가지므로
+    # 조각 색인의 교집합으로 후보를 추린 뒤 실제 포함 여부를 확인한다(FriendDirectory.candidates와 같은 방식).
+    forms = sorted(set(match[match != ''].tolist()))
+    grams = {}
+    for form in forms:
+        for gram in {form[i:i + 2] for i in range(len(form) - 1)}:
+            grams.setdefault(gram, set()).add(form)
+    risk_pairs = []
+    for form in forms:
+        if comparable_name_length(form) < SUBSTRING_MATCH_MIN_CHARS:
             continue
-        n, avg, mid, lo, hi = stat(by_stage[stage])
-        log(f"   • {stage:<18} avg {avg:5.2f} | med {mid:5.2f} | {lo:5.2f}~{hi:5.2f} (n={n})")
-    if person_totals:
-        n, avg, mid, lo, hi = stat(person_totals)
-        log(f"   ▷ 1인당 합계        avg {avg:5.2f} | med {mid:5.2f} | {lo:5.2f}~{hi:5.2f} (n={n})")
-        log(f"   ▷ {n_people}명 추정 총시간 ≈ {avg * n_people:.0f}초 (≈ {avg * n_people / 60:.1f}분)")
-    if csv_path:
-        log(f"   🗂 상세 CSV: {csv_path}")
-    return csv_path
+        postings = sorted((grams[form[i:i + 2]] for i in range(len(form) - 1)), key=len)
+        keys = set.intersection(*postings) if postings else set()
+        risk_pairs.extend([form, other] for other in sorted(keys) if other != form and form in other)
+
+    errors = {'duplicates': duplicates, 'emoji_only': emoji_only, 'canonical_collisions': collisions}
+    warnings = {'substring_risk': risk_pairs, 'short_names': short_names}
+    counts = {key: len(values) for key, values in {**errors, **warnings}.items()}
+    return {
+        'ok': not any(errors.values()),
+        'total': int(len(target_df)),
+        'counts': counts,
+        'errors': {k: v[:PREFLIGHT_REPORT_LIMIT] for k, v in errors.items()},
+        'warnings': {k: v[:PREFLIGHT_REPORT_LIMIT] for k, v in warnings.items()},
+        'seconds': round(time.perf_counter() - t0, 4),
+    }
+
+
+def log_preflight_report(report: dict):
+    """사전 점검 보고서를 사용자 로그로 요약 (문제 유형마다 한 줄)."""
+    errors, warnings, counts = report['errors'], report['warnings'], report['counts']
+
+    def listed(key, values):
+        more = counts[key] - len(values)
+        return ', '.join(values) + (f" 외 {more}건" if more > 0 else '')
+
+    if errors['duplicates']:
+        log(f"❌ 동명이인 오류: 전송 대상에 같은 이름이 존재합니다 → {listed('duplicates', errors['duplicates'])}")
+    if errors['canonical_collisions']:
+        groups = [' = '.join(g) for g in errors['canonical_collisions']]
+        log(f"❌ 표기만 다른 같은 이름(이모티콘 표현형·한글 조합형 차이)이 있습니다 → "
+            f"{listed('canonical_collisions', groups)}")
+    if errors['emoji_only']:
+        log(f"❌ 이름 오류: 텍스트 없이 이모티콘/기호만으로 된 이름이 있습니다 → {listed('emoji_only', errors['emoji_only'])}")
+    if warnings['substring_risk']:
+        pairs = [f"{a} ⊂ {b}" for a, b in warnings['substring_risk']]
+        log(f"⚠️ 부분 일치 혼동 위험(다른 대상자 이름의 일부) → {listed('substring_risk', pairs)}")
+    if warnings['short_names']:
+        log(f"⚠️ 너무 짧은 이름(검색 결과가 많을 수 있음) → {listed('short_names', warnings['short_names'])}")
+    if not report['ok']:
+        log("🚫 동명이인·식별 불가 이름은 카카오톡 검색/검증 오류(오발송)로 이어질 수 있어 전송을 중단합니다.")
+        log("📋 엑셀에서 해당 이름을 고치거나(중복 제거, 카카오톡 표시 이름의 텍스트 추가) 다시 시도해주세요.")
+
+
+# ============================================================
+# 전송 기록(저널) — 실제 전송 실행마다 추가 전용 JSONL 파일 하나. 프로세스·맥이 비정상
+# 종료돼도 누가 이미 받았는지 남아 있어, /resume_run 으로 이어서 보낼 때 건너뛴다.
+# ============================================================
+class SendJournal:
+    """실제 전송 실행의 추가 전용(append-only) 기록.
+
+    줄마다 {"t", "run", "event", ...}. event: start(실행 설정) / attempt(전송 시도 직전) /
+    verified(AX 친구 확인) / sent / failed / uncertain(전송 단계 도중 오류) / end.
+    대상자는 정규화 이름(key)으로 식별한다.
+    쓰기는 백그라운드 스레드가 모아서 flush+fsync하므로 전송 단계는 기다리지 않는다.
+    attempt만은 sync()로 디스크 반영을 확인한 뒤 전송을 시작한다(person_total 계측 밖) —
+    비정상 종료 후에도 '보냈을 수도 있는' 대상자를 놓치지 않기 위함. 쓰기가 한 번이라도
+    실패하면(디스크 부족·I/O 오류) error에 남기고 이후 sync()는 계속 False다.
+    """
+
+    def __init__(self, run_id: str, path: str):
+        self.run_id = run_id
+        self.path = path
+        self.error = None
+        self._queue = Queue()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def record(self, event: str, **fields):
+        """기록 한 줄을 쓰기 대기열에 넣는다(즉시 반환)."""
+        self._queue.put(json.dumps(
+            {'t': round(time.time(), 3), 'run': self.run_id, 'event': event, **fields}, ensure_ascii=False))
+
+    def record_outcome(self, key: str, outcome: 'SendOutcome', **fields):
+        """전송 결과 기록. 전송 단계 도중 오류는 보냈을 수 있으므로 failed가 아닌 uncertain으로 남긴다
+        (/resume_run은 failed만 다시 보낸다)."""
+        event = 'sent' if outcome.ok else 'uncertain' if outcome.reason == 'send_uncertain' else 'failed'
+        self.record(event, key=key, reason=outcome.reason, **fields)
+
+    def sync(self) -> bool:
+        """지금까지 넣은 기록이 모두 디스크에 반영(fsync)될 때까지 기다린다.
+        쓰기에 실패한 적이 있으면 False — 호출부는 전송하지 않는다."""
+        self._queue.join()
+        return self.error is None
+
+    def close(self):
+        self.sync()
+        self._queue.put(None)
+        self._thread.join(timeout=2.0)
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            try:
+                lines = [line for line in batch if line is not None]
+                if lines:
+                    self._file.write(''.join(line + '\n' for line in lines))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            except Exception as exc:
+                if self.error is None:
+                    self.error = exc
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if None in batch:
+                self._file.close()
+                return
+
+
+def start_send_journal(meta: dict) -> SendJournal:
+    """새 실행의 저널을 열고 start 기록(실행 설정)을 남긴다. 오래된 저널은 정리한다."""
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+    run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.urandom(3).hex()}"
+    journal = SendJournal(run_id, os.path.join(JOURNAL_DIR, f'run_{run_id}.jsonl'))
+    journal.record('start', chain=meta.get('chain') or run_id, **{k: v for k, v in meta.items() if k != 'chain'})
+    if not journal.sync():
+        journal.close()
+        raise OSError(f"전송 기록(저널)을 쓰지 못했습니다: {journal.error}")
+    try:
+        old = sorted(f for f in os.listdir(JOURNAL_DIR) if f.startswith('run_') and f.endswith('.jsonl'))
+        for fname in old[:-JOURNAL_KEEP_RUNS]:
+            os.remove(os.path.join(JOURNAL_DIR, fname))
+    except OSError:
+        pass
+    return journal
+
+
+def _read_journal(path):
+    """저널 파일 → 기록 목록. 비정상 종료로 잘린 마지막 줄은 버린다."""
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def find_resumable_run(roster_sha256: str):
+    """이 명단(내용 해시)으로 한 가장 최근 실제 전송과, 그 실행 계열(chain, 이어보내기 포함)의
+    대상자별 마지막 상태를 찾는다 → (start 기록, {key: 'sent'|'failed'|'uncertain'|'attempt'|'verified'}).
+    없으면 None."""
+    try:
+        files = sorted((f for f in os.listdir(JOURNAL_DIR) if f.startswith('run_') and f.endswith('.jsonl')),
+                       reverse=True)
+    except OSError:
+        return None
+    runs = []
+    for fname in files:
+        try:
+            records = _read_journal(os.path.join(JOURNAL_DIR, fname))
+        except OSError:
+            continue
+        if records and records[0].get('event') == 'start':
+            runs.append(records)
+    latest = next((r for r in runs if r[0].get('roster_sha256') == roster_sha256), None)
+    if latest is None:
+        return None
+    chain = latest[0].get('chain')
+    states = {}
+    for records in reversed([r for r in runs if r[0].get('chain') == chain]):  # 오래된 실행부터
+        for rec in records:
+            if rec.get('key') is not None and rec.get('event') in ('attempt', 'verified', 'sent', 'failed',
+                                                                   'uncertain'):
+                states[rec['key']] = rec['event']
+    return latest[0], states
+
 
 # 선택 가능한 필터 옵션
+# 검증 결과 CSV: 결과 칸 값과 일치 방법 이름
+AUDIT_STATUS_LABELS = {'unique': '확인', 'ambiguous': '보류(후보 여러 명)', 'missing': '없음', 'unknown': '확인 불가'}
+AUDIT_MATCH_LABELS = {'exact': '정확 일치', 'decorated': '장식기호 제거 일치', 'substring': '부분 일치'}
+
+
+class AuditReport:
+    """검증만 모드의 대상자별 결과를 CSV에 바로바로 이어 쓴다(엑셀에서 바로 열리게 utf-8-sig).
+
+    열: 순번·이름·결과(확인/보류/없음/확인 불가)·일치 방법·카카오톡 표시 이름·후보·사유·소요(초).
+    """
+
+    COLUMNS = ('순번', '이름', '결과', '일치 방법', '카카오톡 표시 이름', '후보', '사유', '소요(초)')
+
+    def __init__(self, directory: str = AUDIT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        self._file = open(self.path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.COLUMNS)
+        self.counts = dict.fromkeys(AUDIT_STATUS_LABELS, 0)
+        try:
+            old = sorted(f for f in os.listdir(directory) if f.startswith('audit_') and f.endswith('.csv'))
+            for fname in old[:-AUDIT_KEEP_REPORTS]:
+                os.remove(os.path.join(directory, fname))
+        except OSError:
+            pass
+
+    def add(self, idx, name, result, elapsed: float):
+        """result: search_and_verify_friend의 VerifyResult (실패 사유 포함)."""
+        if result.ok:
+            status = 'unique'
+        elif result.reason == 'ambiguous':
+            status = 'ambiguous'
+        elif result.reason in ('not_found', 'no_results', 'emoji_mismatch'):
+            status = 'missing'
+        else:
+            status = 'unknown'
+        self.counts[status] += 1
+        self._writer.writerow([
+            idx, name, AUDIT_STATUS_LABELS[status],
+            AUDIT_MATCH_LABELS.get(result.reason, '') if result.ok else '',
+            result.candidates[0] if result.ok and result.candidates else '',
+            ' | '.join(result.candidates) if not result.ok else '',
+            '' if result.ok else SEND_REASON_LABELS.get(result.reason, result.reason),
+            f'{elapsed:.2f}',
+        ])
+        self._file.flush()
+
+    def close(self):
+        try:
+            self._file.close()
+        except OSError:
+            pass
+
+
 AVAILABLE_REGISTER_TYPES = ['이월', '재등록', '신규', '이탈', '이탈(단)']
 AVAILABLE_AGE_GROUPS = ['10대', '20대', '30대', '40대', '50대', '60대 이상']
 
@@ -238,6 +1274,11 @@ current_register_types = None
 current_age_groups = None
 current_message_template = None
 current_dry_run = False  # 모의 전송(테스트) 모드: 실제 메시지 발송을 생략
+# 검증만(감사) 모드: 검색·AX 검증만 하고 채팅방은 열지 않는다. current_audit은 이번 실행의
+# AuditReport, last_audit_report는 마지막으로 완성된 검증 결과 CSV 경로(/audit_report로 내려받기).
+current_audit_mode = False
+current_audit = None
+last_audit_report = None
 # 패스트 모드: 고정 대기를 상태 폴링으로 바꾸고 AppleScript delay를 최소화하며,
 # 매크로 탐지 방지용 대기(대상 간/전송 후)를 제거한다.
 # ⚠️ 빠른 연속 발송은 카카오톡 스팸/매크로 탐지로 계정이 제한될 수 있다.
@@ -246,45 +1287,516 @@ current_fast_mode = False
 # current_image_order: 'image_first'(기본, 사진 먼저) | 'text_first'(텍스트 먼저)
 current_image_path = None
 current_image_order = 'image_first'
+# 대상자별 첨부(명단 첨부파일 열)의 상대 경로 기준 폴더. None이면 ATTACHMENT_DIR.
+current_attachment_dir = None
+# 전송 기록(저널)과 이어보내기 상태. current_resume: None | {'chain', 'states'} (/resume_run이 설정)
+current_journal = None
+current_resume = None
+# 분산 전송: --coordinator로 실행하면 WorkCoordinator, work_token은 워커 인증 토큰(없으면 검사 안 함)
+# require_token_everywhere: 루프백이 아닌 주소로 열었을 때 /work/*뿐 아니라 모든 경로에 토큰을 요구
+current_coordinator = None
+work_token = None
+require_token_everywhere = False
+
+
+def fast_delay(normal: float, fast: float) -> float:
+    """현재 모드에 따른 지연값(초). 패스트 모드면 fast, 아니면 normal을 반환.
+    AppleScript의 'delay {fast_delay(...)}'와 Python time.sleep 양쪽에 공용으로 쓴다."""
+    return fast if current_fast_mode else normal
+
+
+@app.before_request
+def require_shared_token():
+    """외부 인터페이스에 열린 서버는 모든 요청에 공유 토큰을 요구한다.
+    토큰은 X-KakaoSender-Token 헤더나 쿠키로 받는다. 브라우저는 처음 한 번 ?token=으로 들어오면
+    쿠키를 받고 토큰이 빠진 주소로 다시 이동한다."""
+    if not require_token_everywhere:
+        return None
+    from_query = request.args.get('token', '')
+    supplied = (request.headers.get(WORK_TOKEN_HEADER) or from_query
+                or request.cookies.get(WORK_TOKEN_COOKIE, ''))
+    if not work_token or not hmac.compare_digest(supplied, work_token):
+        return jsonify({'success': False, 'error': '토큰이 필요합니다 (주소 끝에 ?token=<토큰>)'}), 403
+    if from_query and request.method == 'GET':
+        response = redirect(request.path)
+        response.set_cookie(WORK_TOKEN_COOKIE, work_token, httponly=True, samesite='Strict')
+        return response
+    return None
+
+
+@app.errorhandler(Exception)
+def handle_exception(e):
+    """전역 오류 핸들러"""
+    return jsonify({'success': False, 'error': str(e)}), 500
+
+# ============================================================
+# AppleScript 헬퍼
+# ============================================================
+# AppleScript 실행기 — 호출마다 `osascript -` 프로세스를 띄우면 1인당 6~10회의 프로세스
+# 생성 + 스크립트 컴파일 비용을 낸다. 상주 호스트(osascript JXA + NSAppleScript)에 파이프로
+# 스크립트를 보내면 호출당 비용이 메시지 왕복 1회로 줄고, 같은 스크립트는 한 번만 컴파일된다.
+# 실행기는 교체 가능(set_applescript_runner)해 리눅스에서도 대역(stand-in)으로 계측할 수 있다.
+class _OneShotAppleScriptRunner:
+    """호출마다 프로세스를 새로 띄워 스크립트를 stdin으로 실행하는 기존 방식."""
+    name = 'oneshot'
+
+    def __init__(self, command=None):
+        self.command = list(command or ['osascript', '-'])
+
+    def run(self, script: str) -> tuple:
+        proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        out, err = proc.communicate(input=script.encode('utf-8'))
+        return proc.returncode, out.decode('utf-8'), err.decode('utf-8')
+
+    def load(self, library: str):
+        """1회용 실행기는 라이브러리를 붙잡아 둘 곳이 없어 호출마다 함께 컴파일한다."""
+        return None
+
+    def call(self, library: str, handler: str, args) -> tuple:
+        """라이브러리 소스 뒤에 핸들러 호출 한 줄을 붙여 실행 → (rc, out, err, 컴파일초=None)."""
+        invocation = f"{handler}({', '.join(_applescript_literal(a) for a in args)})"
+        rc, out, err = self.run(library + '\n' + invocation + '\n')
+        return rc, out, err, None
+
+    def close(self):
+        pass
+
+
+class _PersistentAppleScriptRunner:
+    """상주 AppleScript 호스트와 JSON 한 줄 요청/응답으로 통신하는 실행기.
+
+    호스트가 죽었거나 띄우지 못하면 그 호출은 1회용 실행기로 폴백하고, 다음 호출에서
+    호스트를 다시 띄운다. 단, 요청을 보낸 뒤 응답이 끊긴 경우(실행 도중 타임아웃/종료)는
+    키 입력이 중복될 수 있어 재실행하지 않고 실패(rc=1)로 돌려준다.
+    """
+    name = 'persistent'
+
+    def __init__(self, command=None, timeout: float = None):
+        self.command = list(command or ['osascript', '-l', 'JavaScript', '-e', _APPLESCRIPT_HOST_JXA])
+        self.timeout = APPLESCRIPT_TIMEOUT if timeout is None else timeout
+        self._proc = None
+        self._buf = b''
+        self._seq = 0
+        self._loaded = set()  # 현재 호스트 프로세스에 컴파일돼 있는 라이브러리 키
+        self._lock = threading.Lock()
+        self._fallback = _OneShotAppleScriptRunner()
+
+    def _start(self) -> bool:
+        if self._proc is not None and self._proc.poll() is None:
+            return True
+        self._close_locked()
+        try:
+            self._proc = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except Exception:
+            self._proc = None
+            return False
+        return True
+
+    def _close_locked(self):
+        proc, self._proc, self._buf = self._proc, None, b''
+        self._loaded.clear()
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            proc.wait(timeout=0.5)
+        except Exception:
+            try:
+                proc.kill()
+                proc.wait(timeout=0.5)
+            except Exception:
+                pass
+
+    def _read_line(self, deadline: float) -> bytes:
+        while b'\n' not in self._buf:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError('AppleScript 호스트 응답 시간 초과')
+            ready, _, _ = select.select([self._proc.stdout], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(self._proc.stdout.fileno(), 65536)
+            if not chunk:
+                raise EOFError('AppleScript 호스트가 종료됨')
+            self._buf += chunk
+        line, _, self._buf = self._buf.partition(b'\n')
+        return line
+
+    def request(self, payload: dict) -> Optional[dict]:
+        """요청 1건을 보내고 응답(dict)을 돌려준다. 보내기 전 실패면 None(폴백 가능)."""
+        with self._lock:
+            if not self._start():
+                return None
+            self._seq += 1
+            payload = dict(payload, id=self._seq)
+            try:
+                self._proc.stdin.write(json.dumps(payload).encode('ascii') + b'\n')
+                self._proc.stdin.flush()
+            except Exception:
+                self._close_locked()
+                return None
+            try:
+                resp = json.loads(self._read_line(time.perf_counter() + self.timeout))
+                if resp.get('id') != self._seq:
+                    raise ValueError('AppleScript 호스트 응답 순서 불일치')
+                return resp
+            except Exception as exc:
+                self._close_locked()
+                return {'rc': 1, 'out': '', 'err': str(exc)}
+
+    def run(self, script: str) -> tuple:
+        resp = self.request({'op': 'run', 'source': script})
+        if resp is None:
+            return self._fallback.run(script)
+        return resp.get('rc', 1), resp.get('out', ''), resp.get('err', '')
+
+    def _library_request(self, op: str, library: str, extra: dict) -> Optional[dict]:
+        key = hashlib.sha1(library.encode('utf-8')).hexdigest()[:12]
+        payload = dict(extra, op=op, lib=key)
+        if key not in self._loaded:
+            payload['library'] = library
+        resp = self.request(payload)
+        if resp is not None and resp.get('err') == 'library not loaded':
+            # 호스트가 재시작돼 라이브러리를 잃은 경우 — 소스를 실어 한 번 더 보낸다.
+            resp = self.request(dict(payload, library=library))
+        if resp is not None and resp.get('rc') == 0:
+            self._loaded.add(key)
+        return resp
+
+    def load(self, library: str) -> Optional[float]:
+        """라이브러리를 호스트에 미리 컴파일해 둔다. 반환: 이번에 컴파일한 시간(초) 또는 None."""
+        resp = self._library_request('load', library, {})
+        if resp is None or resp.get('rc') != 0:
+            return None
+        return resp.get('compile_ms', 0) / 1000.0 if resp.get('compiled') else None
+
+    def call(self, library: str, handler: str, args) -> tuple:
+        """컴파일된 라이브러리의 핸들러를 인자와 함께 실행 → (rc, out, err, 컴파일초|None)."""
+        resp = self._library_request('call', library, {'handler': handler, 'args': list(args)})
+        if resp is None:
+            return self._fallback.call(library, handler, args)
+        compile_s = resp.get('compile_ms', 0) / 1000.0 if resp.get('compiled') else None
+        return resp.get('rc', 1), resp.get('out', ''), resp.get('err', ''), compile_s
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+
+def _applescript_literal(value) -> str:
+    """Python 값을 AppleScript 리터럴로 (핸들러 인자용: bool/숫자/문자열)."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+# 상주 호스트: osascript(JXA)가 stdin에서 JSON 줄을 읽어 NSAppleScript로 실행한다.
+# 컴파일된 스크립트는 소스 문자열 단위로 캐시한다(모드별 delay 조합 수만큼만 생김).
+# 핸들러 라이브러리는 OSAScript로 한 번 컴파일해 두고 핸들러 이름 + 인자로 호출한다.
+_APPLESCRIPT_HOST_JXA = r'''
+ObjC.import('Foundation');
+ObjC.import('OSAKit');
+function run(argv) {
+    var stdin = $.NSFileHandle.fileHandleWithStandardInput;
+    var stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+    var compiled = {};
+    var compiledCount = 0;
+    var libs = {};
+    var pending = '';
+    function reply(obj) {
+        var s = $.NSString.alloc.initWithUTF8String(JSON.stringify(obj) + '\n');
+        stdout.writeData(s.dataUsingEncoding($.NSUTF8StringEncoding));
+    }
+    function errorText(ref) {
+        var info = ref[0];
+        if (!info || info.isNil()) return 'AppleScript error';
+        var keys = ['NSAppleScriptErrorMessage', 'OSAScriptErrorMessageKey', 'OSAScriptErrorMessage'];
+        for (var i = 0; i < keys.length; i++) {
+            var msg = info.objectForKey(keys[i]);
+            if (msg && !msg.isNil()) return msg.js;
+        }
+        return 'AppleScript error';
+    }
+    function descText(result) {
+        var text = result.stringValue;
+        return (text && !text.isNil()) ? text.js + '\n' : '';
+    }
+    function library(req) {
+        if (req.library) {
+            var t0 = Date.now();
+            var lang = $.OSALanguage.languageForName('AppleScript');
+            var script = $.OSAScript.alloc.initWithSourceLanguage($(req.library), lang);
+            var cerr = Ref();
+            if (!script.compileAndReturnError(cerr)) {
+                return {error: errorText(cerr)};
+            }
+            libs[req.lib] = script;
+            return {script: script, compiled: true, compile_ms: Date.now() - t0};
+        }
+        if (!libs[req.lib]) return {error: 'library not loaded'};
+        return {script: libs[req.lib], compiled: false, compile_ms: 0};
+    }
+    function toDesc(v) {
+        if (typeof v === 'boolean') return $.NSAppleEventDescriptor.descriptorWithBoolean(v);
+        if (typeof v === 'number') {
+            return Number.isInteger(v)
+                ? $.NSAppleEventDescriptor.descriptorWithInt32(v)
+                : $.NSAppleEventDescriptor.descriptorWithDouble(v);
+        }
+        return $.NSAppleEventDescriptor.descriptorWithString($(String(v)));
+    }
+    function handleLibrary(req) {
+        var lib = library(req);
+        if (lib.error) return {id: req.id, rc: 1, out: '', err: lib.error};
+        var base = {id: req.id, rc: 0, out: '', err: '', compiled: lib.compiled, compile_ms: lib.compile_ms};
+        if (req.op === 'load') return base;
+        var eerr = Ref();
+        var result = lib.script.executeHandlerWithNameArgumentsError(
+            $(req.handler.toLowerCase()), $((req.args || []).map(toDesc)), eerr);
+        if (!result || result.isNil()) {
+            base.rc = 1;
+            base.err = errorText(eerr);
+            return base;
+        }
+        base.out = descText(result);
+        return base;
+    }
+    function handle(req) {
+        if (req.op === 'load' || req.op === 'call') return handleLibrary(req);
+        var script = compiled[req.source];
+        var fresh = false;
+        if (!script) {
+            script = $.NSAppleScript.alloc.initWithSource($(req.source));
+            var cerr = Ref();
+            if (!script.compileAndReturnError(cerr)) {
+                return {id: req.id, rc: 1, out: '', err: errorText(cerr)};
+            }
+            if (compiledCount >= 64) { compiled = {}; compiledCount = 0; }
+            compiled[req.source] = script;
+            compiledCount++;
+            fresh = true;
+        }
+        var eerr = Ref();
+        var result = script.executeAndReturnError(eerr);
+        if (result.isNil()) {
+            return {id: req.id, rc: 1, out: '', err: errorText(eerr), compiled: fresh};
+        }
+        return {id: req.id, rc: 0, out: descText(result), err: '', compiled: fresh};
+    }
+    while (true) {
+        var data = stdin.availableData;
+        if (data.length === 0) break;
+        pending += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+        var nl;
+        while ((nl = pending.indexOf('\n')) >= 0) {
+            var line = pending.slice(0, nl);
+            pending = pending.slice(nl + 1);
+            if (!line) continue;
+            var req = JSON.parse(line);
+            var resp;
+            try { resp = handle(req); } catch (e) { resp = {id: req.id, rc: 1, out: '', err: String(e)}; }
+            reply(resp);
+        }
+    }
+}
+'''
+
+_applescript_runner = None
+_applescript_runner_lock = threading.Lock()
+
+
+def get_applescript_runner():
+    """현재 AppleScript 실행기. 처음 호출 시 설정(USE_PERSISTENT_APPLESCRIPT)에 따라 만든다."""
+    global _applescript_runner
+    with _applescript_runner_lock:
+        if _applescript_runner is None:
+            if USE_PERSISTENT_APPLESCRIPT and sys.platform == 'darwin':
+                _applescript_runner = _PersistentAppleScriptRunner()
+            else:
+                _applescript_runner = _OneShotAppleScriptRunner()
+        return _applescript_runner
+
+
+def set_applescript_runner(runner):
+    """AppleScript 실행기를 교체한다(계측/대역용). 이전 실행기는 정리한다."""
+    global _applescript_runner
+    with _applescript_runner_lock:
+        previous, _applescript_runner = _applescript_runner, runner
+    if previous is not None and previous is not runner:
+        previous.close()
+
+
+def _close_applescript_runner():
+    if _applescript_runner is not None:
+        _applescript_runner.close()
+
+
+atexit.register(_close_applescript_runner)
+
+
+def run_applescript(script: str) -> tuple:
+    """AppleScript 실행 → (returncode, stdout, stderr)"""
+    return get_applescript_runner().run(script)
+
+
+def load_applescript_library():
+    """핸들러 라이브러리를 실행기에 미리 컴파일해 둔다(전송 1회당 1번). 컴파일 시간은 as_compile."""
+    compile_s = get_applescript_runner().load(APPLESCRIPT_LIBRARY)
+    if compile_s is not None:
+        record_timing('as_compile', compile_s)
+
+
+def call_applescript_handler(handler: str, *args) -> tuple:
+    """핸들러 라이브러리(APPLESCRIPT_LIBRARY)의 handler를 인자와 함께 실행 → (rc, out, err).
+
+    상주 호스트에선 라이브러리가 한 번만 컴파일되고 호출은 인자 전달만 한다.
+    계측: 왕복 전체에서 (있다면) 컴파일 시간을 뺀 값은 as_invoke, 컴파일 시간은 as_compile."""
+    t0 = time.perf_counter()
+    rc, out, err, compile_s = get_applescript_runner().call(APPLESCRIPT_LIBRARY, handler, args)
+    elapsed = time.perf_counter() - t0
+    if compile_s is not None:
+        record_timing('as_compile', compile_s)
+        elapsed = max(0.0, elapsed - compile_s)
+    record_timing('as_invoke', elapsed)
+    return rc, out, err
+
+
+class _PyperclipClipboard:
+    """pyperclip 클립보드 (macOS에선 복사·읽기마다 pbcopy/pbpaste 프로세스). 확인은 다시 읽어 비교."""
+
+    name = 'pyperclip'
+    verify_delay = CLIPBOARD_VERIFY_DELAY
+
+    def copy_text(self, text: str):
+        pyperclip.copy(text)
+        return True
+
+    def verify(self, token, text: str) -> bool:
+        return pyperclip.paste() == text
+
+    def copy_image(self, image_path: str) -> bool:
+        return False
+
+    def copy_data(self, data, uti: str) -> bool:
+        return False
+
+    def copy_file(self, path: str) -> bool:
+        return False
+
+
+class _NativeClipboard:
+    """NSPasteboard 직접 사용 — 프로세스 없이 쓰고, 확인은 changeCount로 한다.
+
+    쓴 직후의 changeCount(토큰)가 그대로면 그 뒤로 아무도(Handoff 등) 클립보드를 바꾸지 않은
+    것이므로 내용을 다시 읽어 비교할 필요가 없다. 쓰기에 실패하면 토큰 None.
+    """
+
+    name = 'NSPasteboard'
+    verify_delay = NATIVE_CLIPBOARD_VERIFY_DELAY
+
+    def __init__(self, pasteboard=None):
+        self._pb = pasteboard if pasteboard is not None else NSPasteboard.generalPasteboard()
+
+    def copy_text(self, text: str):
+        try:
+            self._pb.clearContents()
+            if not self._pb.setString_forType_(str(text), NSPasteboardTypeString):
+                return None
+            return self._pb.changeCount()
+        except Exception:
+            return None
+
+    def verify(self, token, text: str) -> bool:
+        return token is not None and self._pb.changeCount() == token
+
+    def copy_image(self, image_path: str) -> bool:
+        """이미지 파일을 '사진'(파일 URL이 아닌 이미지 데이터)으로 올린다."""
+        try:
+            img = NSImage.alloc().initWithContentsOfFile_(image_path)
+            if img is None:
+                return False
+            self._pb.clearContents()
+            return bool(self._pb.writeObjects_([img]))
+        except Exception:
+            return False
+
+    def copy_data(self, data, uti: str) -> bool:
+        """이미 인코딩된 데이터(NSData)를 uti 형식으로 올린다 — 디코드·재인코딩 없음."""
+        try:
+            self._pb.clearContents()
+            return bool(self._pb.setData_forType_(data, uti))
+        except Exception:
+            return False
+
+    def copy_file(self, path: str) -> bool:
+        """파일을 '파일'(파일 URL)로 올린다 — 카카오톡은 파일 전송으로 붙여넣는다(PDF 등)."""
+        try:
+            url = NSURL.fileURLWithPath_(os.path.abspath(path))
+            self._pb.clearContents()
+            return bool(self._pb.writeObjects_([url]))
+        except Exception:
+            return False
 
 
-def fast_delay(normal: float, fast: float) -> float:
-    """현재 모드에 따른 지연값(초). 패스트 모드면 fast, 아니면 normal을 반환.
-    AppleScript의 'delay {fast_delay(...)}'와 Python time.sleep 양쪽에 공용으로 쓴다."""
-    return fast if current_fast_mode else normal
+_pyperclip_clipboard = _PyperclipClipboard()
+_clipboard = None
+_clipboard_lock = threading.Lock()
 
 
-@app.errorhandler(Exception)
-def handle_exception(e):
-    """전역 오류 핸들러"""
-    return jsonify({'success': False, 'error': str(e)}), 500
+def get_clipboard():
+    """현재 클립보드 백엔드. 처음 호출 시 설정(USE_NATIVE_PASTEBOARD)에 따라 만든다."""
+    global _clipboard
+    with _clipboard_lock:
+        if _clipboard is None:
+            _clipboard = _pyperclip_clipboard
+            if USE_NATIVE_PASTEBOARD and PASTEBOARD_AVAILABLE:
+                try:
+                    _clipboard = _NativeClipboard()
+                except Exception:
+                    pass
+        return _clipboard
 
-# ============================================================
-# AppleScript 헬퍼
-# ============================================================
-def run_applescript(script: str) -> tuple:
-    """AppleScript 실행"""
-    proc = subprocess.Popen(
-        ['osascript', '-'],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
-    out, err = proc.communicate(input=script.encode('utf-8'))
-    return proc.returncode, out.decode('utf-8'), err.decode('utf-8')
 
+def set_clipboard(clipboard):
+    """클립보드 백엔드를 교체한다(계측/대역용)."""
+    global _clipboard
+    with _clipboard_lock:
+        _clipboard = clipboard
 
-def _reliable_copy(text: str, retries: int = 3, verify_delay: float = 0.05) -> bool:
+
+def _reliable_copy(text: str, retries: int = 3, verify_delay: Optional[float] = None) -> bool:
     """클립보드에 text를 복사하고 즉시 검증한다.
 
-    macOS 보편적 클립보드(Handoff)가 켜져 있어도 복사 직후 값을 확인해
-    다른 기기가 덮어쓴 경우 재시도함으로써 오염 위험을 최소화한다.
+    macOS 보편적 클립보드(Handoff)가 켜져 있어도 복사 직후 클립보드가 바뀌지 않았는지 확인해
+    다른 기기가 덮어쓴 경우 재시도함으로써 오염 위험을 최소화한다. 네이티브 백엔드가 쓰기에
+    실패하면 그 시도는 pyperclip으로 한다. verify_delay: 확인 전 대기(없으면 백엔드별 기본값).
     반환값: 최종적으로 클립보드 내용이 text와 일치하면 True.
     """
+    primary = get_clipboard()
     for attempt in range(retries):
-        pyperclip.copy(text)
-        time.sleep(verify_delay)
-        if pyperclip.paste() == text:
+        clipboard = primary
+        token = clipboard.copy_text(text)
+        if token is None and clipboard is not _pyperclip_clipboard:
+            clipboard = _pyperclip_clipboard
+            token = clipboard.copy_text(text)
+        time.sleep(clipboard.verify_delay if verify_delay is None else verify_delay)
+        if clipboard.verify(token, text):
             return True
         if attempt < retries - 1:
             log(f"   -> ⚠️ 클립보드 검증 실패 (재시도 {attempt + 1}/{retries - 1})...")
@@ -360,6 +1872,57 @@ def name_for_search(name: str) -> str:
     return name
 
 
+class NameForms(NamedTuple):
+    """이름 하나의 비교·검색용 파생형 묶음. 한 번 계산해 검색·검증 단계에서 재사용한다."""
+    raw: object
+    normalized: str   # normalize_name
+    canonical: str    # canonicalize_name
+    match: str        # normalize_name_for_match
+    search: object    # name_for_search
+    has_emoji: bool   # name_contains_emoji_or_symbol
+
+
+@lru_cache(maxsize=8192)
+def name_forms(name) -> NameForms:
+    """이름의 파생형 (메모이즈). 화면의 후보 이름처럼 시도마다 반복해서 보는 문자열용."""
+    return NameForms(
+        name, normalize_name(name), canonicalize_name(name), normalize_name_for_match(name),
+        name_for_search(name), name_contains_emoji_or_symbol(name),
+    )
+
+
+# 명단에 미리 계산해 두는 이름 파생형 열 (NameForms 필드 순서)
+ROSTER_NAME_FORM_COLUMNS = ('_normalized', '_canonical', '_match', '_search', '_has_emoji')
+
+
+def compute_name_forms(names) -> dict:
+    """이름 목록 전체의 파생형을 열 단위로 한 번에 계산 → {ROSTER_NAME_FORM_COLUMNS 열: [값...]}.
+    pandas 문자열 벡터 연산으로, 이름별 함수(normalize_name 등)와 같은 결과를 낸다."""
+    raw = pd.Series(list(names), dtype=object)
+    text = raw.astype(str)
+
+    def squeeze(series):
+        return series.str.replace(r'\s+', ' ', regex=True).str.strip()
+
+    normalized = squeeze(text)
+    match = squeeze(text.str.replace(EMOJI_PATTERN, '', regex=True))
+    canonical = squeeze(text.str.normalize('NFC').str.replace(r'[\uFE00-\uFE0F]', '', regex=True))
+    has_emoji = text.str.contains(EMOJI_PATTERN, regex=True).astype(bool)
+    search = raw.where(~(has_emoji & (match != '')), match)
+    return {
+        '_normalized': normalized.tolist(),
+        '_canonical': canonical.tolist(),
+        '_match': match.tolist(),
+        '_search': search.tolist(),
+        '_has_emoji': has_emoji.tolist(),
+    }
+
+
+def roster_row_forms(row) -> NameForms:
+    """명단 행(미리 계산한 파생형 열 포함)의 NameForms."""
+    return NameForms(row['이름'], *(row[c] for c in ROSTER_NAME_FORM_COLUMNS))
+
+
 # ============================================================
 # AppleScript 명령어
 # ============================================================
@@ -367,30 +1930,183 @@ SCRIPT_ACTIVATE = '''
 tell application "KakaoTalk" to activate
 '''
 
-# 검색창 초기화 (다음 검색을 위해)
-def _reset_search_script() -> str:
-    """다음 검색 준비 스크립트(모드별 delay): Esc 3회로 레이어 닫고 Cmd+1로 친구 목록 복귀."""
-    return f'''
-tell application "KakaoTalk" to activate
-delay {fast_delay(0.3, 0.15)}
-tell application "System Events"
-    tell process "KakaoTalk"
-        set frontmost to true
+# 핸들러 라이브러리 — 전송 1회당 한 번 컴파일하고 핸들러 이름 + 인자(delay 값 등)로 호출한다.
+# (호출부마다 f-string 스크립트를 만들어 매번 파싱·컴파일하던 비용 제거)
+# delay 인자는 호출부가 fast_delay()로 모드별 값을 골라 넘긴다.
+APPLESCRIPT_LIBRARY = '''
+on clickPaste()
+    tell application "System Events"
+        tell process "KakaoTalk"
+            set frontmost to true
+            try
+                click menu item "붙여넣기" of menu "편집" of menu bar 1
+            on error
+                try
+                    click menu item "Paste" of menu "편집" of menu bar 1
+                on error
+                    try
+                        click menu item "Paste" of menu "Edit" of menu bar 1
+                    end try
+                end try
+            end try
+        end tell
+    end tell
+end clickPaste
+
+on bringToFront(activateDelay, frontDelay)
+    tell application "KakaoTalk" to activate
+    delay activateDelay
+    tell application "System Events"
+        tell process "KakaoTalk"
+            set frontmost to true
+        end tell
+    end tell
+    delay frontDelay
+end bringToFront
+
+-- 카카오톡 활성화 + 최전면 (창이 없으면 새 창 열기 시도)
+on ensureReady(activateDelay, newWindowDelay)
+    tell application "KakaoTalk" to activate
+    delay activateDelay
+    tell application "System Events"
+        tell process "KakaoTalk"
+            set frontmost to true
+            if (count of windows) is 0 then
+                keystroke "n" using command down
+                delay newWindowDelay
+            end if
+        end tell
+    end tell
+end ensureReady
+
+-- 다음 검색 준비: Esc 3회(채팅창/검색창/알림 등 모든 레이어 닫기) + Cmd+1(친구 목록)
+on resetSearch(activateDelay, frontDelay, escDelay, listDelay)
+    bringToFront(activateDelay, frontDelay)
+    tell application "System Events"
+        repeat 3 times
+            key code 53
+            delay escDelay
+        end repeat
+        keystroke "1" using command down
+        delay listDelay
+    end tell
+end resetSearch
+
+-- AX 입력용 검색창 띄우기: Esc → Cmd+1 → Cmd+F → 필드 노출용 1글자('.')
+on primeSearch(activateDelay, frontDelay, escDelay, listDelay, openDelay, typeDelay)
+    bringToFront(activateDelay, frontDelay)
+    typePrime(escDelay, listDelay, openDelay, typeDelay)
+end primeSearch
+
+-- [융합] 활성화·창 확인(ensureReady) + 검색창 띄우기(primeSearch)를 활성화 1회로
+on readyAndPrimeSearch(activateDelay, newWindowDelay, escDelay, listDelay, openDelay, typeDelay)
+    ensureReady(activateDelay, newWindowDelay)
+    typePrime(escDelay, listDelay, openDelay, typeDelay)
+end readyAndPrimeSearch
+
+on typePrime(escDelay, listDelay, openDelay, typeDelay)
+    tell application "System Events"
+        key code 53
+        delay escDelay
+        keystroke "1" using command down
+        delay listDelay
+        key code 3 using command down
+        delay openDelay
+        keystroke "."
+        delay typeDelay
+    end tell
+end typePrime
+
+-- 키 입력 폴백 검색: 검색창 열고 기존 검색어 삭제 후 클립보드 붙여넣기 (메뉴 클릭 또는 Cmd+V)
+on pasteSearch(useKeystroke)
+    bringToFront(0.3, 0.2)
+    tell application "System Events"
+        key code 53
+        delay 0.2
+        keystroke "1" using command down
+        delay 0.3
+        key code 3 using command down
+        delay 0.4
+        key code 0 using command down
+        delay 0.15
+        key code 51
+        delay 0.2
+    end tell
+    if useKeystroke then
+        tell application "System Events" to keystroke "v" using command down
+    else
+        clickPaste()
+    end if
+    delay 0.5
+end pasteSearch
+
+-- 검색창에서 아래 화살표로 결과 리스트로 포커스 이동
+on moveFocusDown(arrowCount)
+    tell application "System Events"
+        tell process "KakaoTalk"
+            set frontmost to true
+        end tell
+        repeat arrowCount times
+            key code 125
+            delay 0.2
+        end repeat
+    end tell
+end moveFocusDown
+
+-- 선택된 검색 결과의 채팅방 열기 (Enter)
+on openChat(beforeEnter, afterEnter)
+    bringToFront(0.3, beforeEnter)
+    tell application "System Events" to key code 36
+    delay afterEnter
+end openChat
+
+-- [융합] 결과 리스트로 포커스 이동(moveFocusDown) + 채팅방 열기(openChat)를 활성화 없이 한 번에
+on focusAndOpenChat(arrowCount, beforeEnter, afterEnter)
+    moveFocusDown(arrowCount)
+    delay beforeEnter
+    tell application "System Events" to key code 36
+    delay afterEnter
+end focusAndOpenChat
+
+-- 채팅방 입력창에 이미 들어간 메시지를 Enter로 전송
+on pressEnter(settleDelay)
+    tell application "System Events"
+        tell process "KakaoTalk"
+            set frontmost to true
+            delay settleDelay
+            key code 36
+        end tell
+    end tell
+end pressEnter
+
+-- 클립보드 내용을 '편집>붙여넣기'로 넣고 Enter (텍스트/이미지 공용, 대기만 다름)
+on pasteAndSend(pasteDelay, afterDelay)
+    clickPaste()
+    delay pasteDelay
+    tell application "System Events" to key code 36
+    delay afterDelay
+end pasteAndSend
+
+-- 이미지 붙여넣기 전송: 먼저 카카오톡을 활성화한 뒤 붙여넣기 + Enter
+on pasteImageAndSend(ingestDelay, afterDelay)
+    tell application "KakaoTalk" to activate
+    delay 0.3
+    pasteAndSend(ingestDelay, afterDelay)
+end pasteImageAndSend
+
+-- 채팅방 닫기 (Esc 2회)
+on closeChat(frontDelay, firstEscDelay, secondEscDelay)
+    tell application "System Events"
+        tell process "KakaoTalk"
+            set frontmost to true
+        end tell
+        delay frontDelay
+        key code 53
+        delay firstEscDelay
+        key code 53
+        delay secondEscDelay
     end tell
-    delay {fast_delay(0.2, 0.1)}
-
-    -- 1. Esc 3회 (채팅창/검색창/알림 등 모든 레이어 닫기)
-    key code 53
-    delay {fast_delay(0.3, 0.1)}
-    key code 53
-    delay {fast_delay(0.3, 0.1)}
-    key code 53
-    delay {fast_delay(0.3, 0.1)}
-
-    -- 2. 친구 목록으로 이동 (Cmd+1)
-    keystroke "1" using command down
-    delay {fast_delay(0.5, 0.2)}
-end tell
+end closeChat
 '''
 
 
@@ -407,121 +2123,59 @@ def is_kakaotalk_running() -> bool:
         return True
 
 
-def ensure_kakaotalk_ready() -> bool:
+def ensure_kakaotalk_ready(prime_search: bool = False) -> bool:
     """카카오톡을 활성화하고 최전면으로 올린다(창이 없으면 새 창 시도). 준비되면 True.
 
     검증·전송은 AX(NSWorkspace 기반)라 창 ID(Quartz)가 필요 없다. 따라서 Quartz 창 탐지는
-    하지 않고, AppleScript로 활성화만 한 뒤 앱 실행 여부를 AX로 확인한다."""
-    script = f'''
-    tell application "KakaoTalk"
-        activate
-        delay {fast_delay(0.5, 0.15)}
-    end tell
-    tell application "System Events"
-        tell process "KakaoTalk"
-            set frontmost to true
-            -- 창이 없으면 새 창 열기 시도
-            if (count of windows) is 0 then
-                keystroke "n" using command down
-                delay {fast_delay(0.5, 0.3)}
-            end if
-        end tell
-    end tell
-    '''
-    run_applescript(script)
+    하지 않고, AppleScript로 활성화만 한 뒤 앱 실행 여부를 AX로 확인한다.
+    prime_search=True(융합 실행)면 같은 스크립트에서 AX 입력용 검색창까지 띄워 둔다
+    → 이어지는 search_friend(primed=True)는 프라임 스크립트를 생략한다."""
+    if prime_search:
+        call_applescript_handler(
+            'readyAndPrimeSearch',
+            fast_delay(0.5, 0.15), fast_delay(0.5, 0.3), fast_delay(0.2, 0.1),
+            fast_delay(0.3, 0.15), fast_delay(0.4, 0.25), fast_delay(0.3, 0.15),
+        )
+        return is_kakaotalk_running()
+    call_applescript_handler('ensureReady', fast_delay(0.5, 0.15), fast_delay(0.5, 0.3))
     time.sleep(fast_delay(0.5, 0.1))
     return is_kakaotalk_running()
 
 
-def _paste_into_search(name: str, use_keystroke: bool) -> None:
+def _ax_search_input_enabled() -> bool:
+    """검색어를 AX로 써넣는 경로(프라임 → AX 쓰기)를 쓰는지."""
+    return AX_WRITE_AVAILABLE and USE_AX_INPUT
+
+
+def _fused_plain_text(image_path: Optional[str]) -> bool:
+    """이번 대상(보낼 첨부 image_path)에 융합 실행을 적용하는지. 이미지 동반 발송은 검증된 기존 경로를 유지한다."""
+    return USE_FUSED_APPLESCRIPT and not image_path
+
+
+def _paste_into_search(name: str, use_keystroke: bool, primed: bool = False) -> None:
     """검색창 열고 검색어를 입력.
 
     1순위(use_keystroke=False): 검색창을 열고 한 글자로 필드를 띄운 뒤 AX로 이름을 직접 써넣는다.
                                  (키보드 비의존, 이모티콘 이름도 정확, 포커스 영향 없음)
+                                 primed=True면 검색창이 이미 떠 있어(융합 실행) 여는 단계를 생략.
     2순위(use_keystroke=True 또는 AX 실패): 기존 방식(클립보드 + 메뉴 클릭/Cmd+V).
     """
     # AX 경로: 검색창 열기 → 필드 노출용 1글자 입력 → AX로 전체 값 덮어쓰기
-    if AX_WRITE_AVAILABLE and USE_AX_INPUT and not use_keystroke:
-        prime_script = f'''
-        tell application "KakaoTalk" to activate
-        delay {fast_delay(0.3, 0.15)}
-        tell application "System Events"
-            tell process "KakaoTalk"
-                set frontmost to true
-            end tell
-            delay {fast_delay(0.2, 0.1)}
-            key code 53
-            delay {fast_delay(0.2, 0.1)}
-            keystroke "1" using command down
-            delay {fast_delay(0.3, 0.15)}
-            key code 3 using command down
-            delay {fast_delay(0.4, 0.25)}
-            keystroke "."
-            delay {fast_delay(0.3, 0.15)}
-        end tell
-        '''
-        run_applescript(prime_script)
+    if _ax_search_input_enabled() and not use_keystroke:
+        if not primed:
+            call_applescript_handler(
+                'primeSearch',
+                fast_delay(0.3, 0.15), fast_delay(0.2, 0.1), fast_delay(0.2, 0.1),
+                fast_delay(0.3, 0.15), fast_delay(0.4, 0.25), fast_delay(0.3, 0.15),
+            )
         time.sleep(fast_delay(0.2, 0.1))
         if _ax_write_search(name):
             return
         # AX 실패 → 아래 키 입력 폴백 (Cmd+A + delete로 프라임 문자 '.'까지 함께 정리됨)
 
     _reliable_copy(name)
-    if use_keystroke:
-        paste_block = '''
-        keystroke "v" using command down
-        '''
-    else:
-        paste_block = '''
-        tell process "KakaoTalk"
-            set frontmost to true
-            try
-                click menu item "붙여넣기" of menu "편집" of menu bar 1
-            on error
-                try
-                    click menu item "Paste" of menu "편집" of menu bar 1
-                on error
-                    try
-                        click menu item "Paste" of menu "Edit" of menu bar 1
-                    end try
-                end try
-            end try
-        end tell
-        '''
-    script = f'''
-    tell application "KakaoTalk" to activate
-    delay 0.3
-
-    tell application "System Events"
-        tell process "KakaoTalk"
-            set frontmost to true
-        end tell
-        delay 0.2
-
-        -- 채팅창/검색창 닫기
-        key code 53
-        delay 0.2
-
-        -- 친구 목록으로 이동 (Cmd+1)
-        keystroke "1" using command down
-        delay 0.3
-
-        -- 검색창 열기 (Cmd+F)
-        key code 3 using command down
-        delay 0.4
-
-        -- 기존 검색어 전체 선택 + 삭제
-        key code 0 using command down
-        delay 0.15
-        key code 51
-        delay 0.2
-
-        -- 붙여넣기 (메뉴 클릭 또는 Cmd+V)
-        {paste_block}
-        delay 0.5
-    end tell
-    '''
-    run_applescript(script)
+    # 1회차는 메뉴 클릭 붙여넣기, 재시도(use_keystroke=True)는 Cmd+V
+    call_applescript_handler('pasteSearch', bool(use_keystroke))
 
 
 def _read_search_field_text() -> str:
@@ -543,24 +2197,15 @@ def _read_search_field_text() -> str:
 
 def _move_focus_to_search_results() -> None:
     """검색창에서 아래 화살표로 결과 리스트로 포커스 이동."""
-    n_down = SEARCH_RESULT_DOWN_ARROW_COUNT
-    script = f'''
-    tell application "System Events"
-        tell process "KakaoTalk"
-            set frontmost to true
-        end tell
-        repeat with _k from 1 to {n_down}
-            key code 125
-            delay 0.2
-        end repeat
-    end tell
-    '''
-    run_applescript(script)
+    call_applescript_handler('moveFocusDown', SEARCH_RESULT_DOWN_ARROW_COUNT)
 
 
-def search_friend(name: str) -> bool:
+def search_friend(name: str, primed: bool = False, move_focus: bool = True) -> bool:
     """친구 검색. 검색창에 검색어가 실제로 들어갔는지 검증하고, 실패 시 Cmd+V로 재시도.
 
+    primed=True: 검색창이 이미 떠 있음(융합 실행의 readyAndPrimeSearch) → 1회차 프라임 생략.
+    move_focus=False: 결과 리스트 포커스 이동을 채팅방 열기(focusAndOpenChat)로 미룬다.
+
     Returns:
         True  - 검색창 입력 검증까지 성공
         False - 두 번 시도해도 검증 실패 (그래도 결과 리스트로 포커스는 이동시켜 둠)
@@ -569,7 +2214,7 @@ def search_friend(name: str) -> bool:
     verified = False
     for attempt in range(SEARCH_INPUT_VERIFY_ATTEMPTS):
         use_keystroke = attempt > 0  # 1회차는 메뉴 클릭, 재시도부터 Cmd+V
-        _paste_into_search(name, use_keystroke=use_keystroke)
+        _paste_into_search(name, use_keystroke=use_keystroke, primed=primed and attempt == 0)
         # 검색 결과가 로드돼야 아래화살표가 결과를 선택하고 Enter로 채팅방이 열린다.
         # 이 대기는 채팅방 열기 신뢰성에 직결되므로 패스트 모드라도 줄이지 않는다.
         time.sleep(0.3)
@@ -580,7 +2225,8 @@ def search_friend(name: str) -> bool:
         method = "Cmd+V" if use_keystroke else "메뉴 클릭"
         log(f"   -> ⚠️ 검색창 입력 확인 실패 ({method} 시도, 실제: '{actual[:30]}'). 재시도합니다.")
 
-    _move_focus_to_search_results()
+    if move_focus:
+        _move_focus_to_search_results()
     return verified
 
 
@@ -590,8 +2236,13 @@ def search_friend(name: str) -> bool:
 #   - 검색창(AXSearchField)과 친구행(AXStaticText id='Display Name')이
 #     role/identifier로 명확히 구분되어 검색창 텍스트를 친구로 오인하지 않는다.
 # ============================================================
+# AX 호출(IPC) 계수기 — 카카오톡 프로세스로 가는 왕복 수. 위치 캐시 효과 측정용.
+_ax_stats = {'ipc': 0}
+
+
 def _ax_copy(element, attr):
     """AX 속성 한 개를 안전하게 읽어 반환. 실패 시 None."""
+    _ax_stats['ipc'] += 1
     try:
         err, value = AXUIElementCopyAttributeValue(element, attr, None)
         if err != 0:
@@ -601,18 +2252,101 @@ def _ax_copy(element, attr):
         return None
 
 
-def _ax_get_kakao_app_element():
-    """실행 중인 카카오톡의 AX 앱 요소를 반환. 없으면 None."""
+def _ax_is_error_value(value) -> bool:
+    """일괄 읽기 결과 중 '속성 없음/읽기 실패'를 뜻하는 AXValue(오류형)인지."""
+    if value is None or 'AXValue' not in type(value).__name__:
+        return False
+    try:
+        return AXValueGetType(value) == kAXValueAXErrorType
+    except Exception:
+        return False
+
+
+class _AXLazyAttrs:
+    """일괄 읽기를 못 쓸 때의 폴백: 실제로 조회한 속성만 그때 개별로 읽는다(dict.get 호환)."""
+
+    def __init__(self, element):
+        self._element = element
+        self._values = {}
+
+    def get(self, attr, default=None):
+        if attr not in self._values:
+            self._values[attr] = _ax_copy(self._element, attr)
+        value = self._values[attr]
+        return default if value is None else value
+
+    def __getitem__(self, attr):
+        return self.get(attr)
+
+
+def _ax_copy_many(element, attrs):
+    """여러 AX 속성을 한 번에 읽어 {속성: 값|None}으로 반환.
+    일괄 읽기를 못 쓰거나 실패하면, 조회 시점에 속성별로 읽는 _AXLazyAttrs로 폴백한다."""
+    if AX_MULTI_AVAILABLE and USE_AX_BATCH_READS:
+        _ax_stats['ipc'] += 1
+        try:
+            err, values = AXUIElementCopyMultipleAttributeValues(element, list(attrs), 0, None)
+            if err == 0 and values is not None and len(values) == len(attrs):
+                return {a: (None if _ax_is_error_value(v) else v) for a, v in zip(attrs, values)}
+        except Exception:
+            pass
+    return _AXLazyAttrs(element)
+
+
+# 카카오톡 AX 앱 요소 캐시 (PID 단위). 폴링 루프(50ms)마다 실행 중인 전체 프로세스를
+# 열거하지 않도록, 한 번 찾은 요소를 그 PID가 살아 있는 동안 재사용한다.
+# 종료/재실행은 PID 생존 확인(os.kill(pid, 0))으로 감지한다 — 워크스페이스 알림은
+# 메인 런루프가 필요해 Flask 스레드에서는 쓰지 않는다.
+_ax_app_cache = {'pid': None, 'element': None}
+_ax_app_cache_lock = threading.Lock()
+
+
+def _pid_alive(pid) -> bool:
+    """프로세스가 살아 있는지 (시그널 0 전송으로 확인, 부수효과 없음)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except Exception:
+        return False
+    return True
+
+
+def _ax_find_kakao_app():
+    """NSWorkspace에서 카카오톡을 찾아 (pid, AX 앱 요소)를 반환. 없으면 (None, None)."""
     try:
         workspace = NSWorkspace.sharedWorkspace()
         for app in workspace.runningApplications():
             bundle_id = app.bundleIdentifier() or ""
             name = app.localizedName() or ""
             if bundle_id in KAKAO_BUNDLE_IDS or 'KakaoTalk' in name or '카카오톡' in name:
-                return AXUIElementCreateApplication(app.processIdentifier())
+                pid = app.processIdentifier()
+                return pid, AXUIElementCreateApplication(pid)
     except Exception:
-        return None
-    return None
+        return None, None
+    return None, None
+
+
+def invalidate_ax_app_cache():
+    """AX 앱 요소 캐시를 비운다(다음 조회 때 다시 탐색)."""
+    with _ax_app_cache_lock:
+        _ax_app_cache['pid'] = None
+        _ax_app_cache['element'] = None
+
+
+def _ax_get_kakao_app_element():
+    """실행 중인 카카오톡의 AX 앱 요소를 반환. 없으면 None.
+    캐시된 PID가 살아 있으면 그대로 돌려주고, 죽었으면(종료/재실행) 다시 탐색한다."""
+    with _ax_app_cache_lock:
+        pid = _ax_app_cache['pid']
+        if pid is not None and _pid_alive(pid):
+            return _ax_app_cache['element']
+        pid, element = _ax_find_kakao_app()
+        _ax_app_cache['pid'] = pid
+        _ax_app_cache['element'] = element
+        return element
 
 
 def _ax_get_main_window(app_element):
@@ -630,35 +2364,236 @@ def _ax_get_main_window(app_element):
 
 def _ax_walk(element, max_depth, depth=0):
     """AX 트리를 깊이 우선으로 순회하며 모든 요소를 산출."""
-    yield element
+    for el, _path, _attrs in _ax_walk_attrs(element, (), max_depth, depth):
+        yield el
+
+
+def _ax_walk_attrs(element, attrs, max_depth, depth=0, path=()):
+    """(요소, 자식 인덱스 경로, {속성: 값})을 산출하는 순회. 경로는 위치 캐시에 기억된다.
+    노드마다 attrs와 자식 목록을 한 번에 읽는다(일괄 읽기 가능 시 노드당 AX 호출 1회)."""
+    values = _ax_copy_many(element, ('AXChildren',) + tuple(attrs))
+    yield element, path, values
     if depth >= max_depth:
         return
-    children = _ax_copy(element, "AXChildren") or []
-    for child in children:
-        yield from _ax_walk(child, max_depth, depth + 1)
+    for i, child in enumerate(values.get('AXChildren') or []):
+        yield from _ax_walk_attrs(child, attrs, max_depth, depth + 1, path + (i,))
+
+
+def _ax_follow_path(element, path):
+    """자식 인덱스 경로를 따라 내려간 요소. 구조가 바뀌어 경로가 끊기면 None."""
+    for i in path:
+        children = _ax_copy(element, "AXChildren") or []
+        if i >= len(children):
+            return None
+        element = children[i]
+    return element
+
+
+# 스냅숏 한 번에 노드마다 읽는 속성 (색인 3종 + 값/설명류). 일괄 읽기 시 노드당 AX 호출 1회.
+AX_SNAPSHOT_ATTRS = ('AXRole', 'AXSubrole', 'AXIdentifier', 'AXValue', 'AXDescription', 'AXPlaceholderValue')
+AX_SNAPSHOT_MAX_DEPTH = 35
+# 결과 리스트 범위로 인정하는 role (친구행들의 공통 조상 중 가장 가까운 리스트 계열)
+AX_RESULT_CONTAINER_ROLES = ('AXTable', 'AXOutline', 'AXList', 'AXScrollArea')
+
+
+def _ax_display_name_value(attrs) -> Optional[str]:
+    value = attrs.get('AXValue')
+    if value:
+        text = name_forms(str(value)).normalized
+        if text:
+            return text
+    return None
+
+
+def _ax_is_message_input(attrs) -> bool:
+    """채팅 말풍선도 AXTextArea라서 설명/placeholder로 입력창만 정확히 식별한다."""
+    if attrs.get('AXRole') != "AXTextArea":
+        return False
+    desc = attrs.get('AXDescription')
+    if desc and "메시지" in str(desc):
+        return True
+    placeholder = attrs.get('AXPlaceholderValue')
+    return bool(placeholder and "메시지" in str(placeholder))
+
+
+class AXSnapshot:
+    """창(또는 그 안의 몇몇 하위 트리)을 한 번만 순회해 만든 AX 스냅숏.
+
+    노드 (요소, 창 기준 자식 인덱스 경로, {속성: 값})를 subrole·identifier·role로 색인해 둔다.
+    수신자 한 단계의 검색창 값 확인·결과 이름 수집·메시지 입력창 조회가 모두 이 한 번의 순회를
+    읽으므로, 조회마다 트리를 다시 돌지 않는다. 화면이 바뀐 뒤(입력·채팅방 열기)엔 새로 찍는다.
+    roots: [(순회 시작 요소, 그 요소의 창 기준 경로)] — 창 전체면 [(window, ())].
+    """
+
+    def __init__(self, roots, max_depth: int = AX_SNAPSHOT_MAX_DEPTH):
+        self.by_path = {}
+        self.by_subrole = {}
+        self.by_identifier = {}
+        self.by_role = {}
+        for root, base_path in roots:
+            for el, path, attrs in _ax_walk_attrs(root, AX_SNAPSHOT_ATTRS, max_depth - len(base_path)):
+                node = (el, tuple(base_path) + path, attrs)
+                self.by_path[node[1]] = node
+                for index, attr in ((self.by_subrole, 'AXSubrole'),
+                                    (self.by_identifier, 'AXIdentifier'),
+                                    (self.by_role, 'AXRole')):
+                    key = attrs.get(attr)
+                    if key is not None:
+                        index.setdefault(str(key), []).append(node)
+
+    def search_field(self):
+        """검색창(AXSearchField) 노드. 없으면 None."""
+        nodes = self.by_subrole.get('AXSearchField')
+        return nodes[0] if nodes else None
+
+    def search_value(self) -> Optional[str]:
+        """검색창에 입력된 텍스트. 값을 못 읽는 검색창은 건너뛰고 다음 검색창을 본다.
+        검색창이 없거나 어느 것도 값을 못 읽으면 None."""
+        for node in self.by_subrole.get('AXSearchField', []):
+            if node[2].get('AXValue') is not None:
+                return str(node[2]['AXValue'])
+        return None
+
+    def result_nodes(self) -> list:
+        """검색 결과 행의 친구 이름 노드(AXStaticText id='Display Name', 값 있는 것만)."""
+        return [n for n in self.by_identifier.get(AX_DISPLAY_NAME_ID, []) if _ax_display_name_value(n[2])]
+
+    def result_names(self) -> List[str]:
+        return [_ax_display_name_value(n[2]) for n in self.result_nodes()]
+
+    def message_input(self):
+        """채팅방 메시지 입력창 노드. 없으면 None."""
+        for node in self.by_role.get('AXTextArea', []):
+            if _ax_is_message_input(node[2]):
+                return node
+        return None
+
+    def needed(self, key) -> list:
+        """key 단계에 꼭 있어야 하는 노드 묶음 [(노드 목록, 리스트 컨테이너로 넓힐지)].
+        하나라도 없으면 빈 목록(=준비 안 됨)."""
+        fields = self.by_subrole.get('AXSearchField', [])  # 범위는 검색창 전부를 덮는다(search_value)
+        if key == 'search_field':
+            groups = [(fields, False)] if fields else []
+        elif key == 'search_results':
+            results = self.result_nodes()
+            groups = [(fields, False), (results, True)] if fields and results else []
+        elif key == 'message_input':
+            node = self.message_input()
+            groups = [([node], False)] if node else []
+        else:
+            raise ValueError(f"알 수 없는 AX 스냅숏 키: {key}")
+        return groups
+
+
+class _AXLocator:
+    """단계(key)별로 AXSnapshot을 찍을 범위(창 기준 자식 인덱스 경로들)를 기억하는 탐색기.
+
+    처음엔 창 전체를 순회해 스냅숏을 만들고, 그 단계에 필요한 노드 묶음마다 범위 루트를 기억한다
+    (검색창은 그 요소 자체, 결과 행들은 공통 조상 중 가장 가까운 리스트 계열 요소).
+    다음부터는 현재 창에서 그 경로들만 따라가 하위 트리만 순회하고, 범위 루트의 role이
+    달라졌거나 필요한 노드가 다 없으면(miss) 창 전체를 다시 순회해 범위를 새로 잡는다.
+    요소 자체가 아니라 '현재 창에서의 경로'를 기억하므로, 닫히는 중인 이전 채팅방의 입력창을
+    잘못 재사용하지 않는다. 키별 적중/실패 횟수와 조회당 AX 호출 수를 stats에 남긴다.
+    """
+
+    def __init__(self):
+        self._paths = {}
+        self._roles = {}
+        self.stats = {}
+
+    def reset(self):
+        self._paths.clear()
+        self._roles.clear()
+        self.stats.clear()
+
+    def _record(self, key, hit: bool, ipc0: int):
+        st = self.stats.setdefault(key, {'hit': 0, 'miss': 0, 'ipc_total': 0, 'ipc_last': 0})
+        st['hit' if hit else 'miss'] += 1
+        st['ipc_last'] = _ax_stats['ipc'] - ipc0
+        st['ipc_total'] += st['ipc_last']
+
+    def snapshot(self, key, window, max_depth: int = AX_SNAPSHOT_MAX_DEPTH, full: bool = False) -> AXSnapshot:
+        """key 단계의 AXSnapshot (트리 순회 1회, 범위 밖에서 miss면 창 전체 순회 1회 추가).
+        full이면 기억한 범위를 쓰지 않고 창 전체를 순회한다(범위는 새로 기억, 통계는 miss)."""
+        ipc0 = _ax_stats['ipc']
+        scopes = None if full else self._paths.get(key)
+        if scopes is not None:
+            roots = [(_ax_follow_path(window, path), path) for path in scopes]
+            if all(root is not None for root, _path in roots):
+                snap = AXSnapshot(roots, max_depth)
+                roles = [snap.by_path[path][2].get('AXRole') if path in snap.by_path else None
+                         for path in scopes]
+                if roles == self._roles.get(key) and snap.needed(key):
+                    self._record(key, True, ipc0)
+                    return snap
+        snap = AXSnapshot([(window, ())], max_depth)
+        self._remember_scope(key, snap, snap.needed(key))
+        self._record(key, False, ipc0)
+        return snap
+
+    def _remember_scope(self, key, snap, groups):
+        """노드 묶음마다 공통 조상(가장 깊은 것)을 다음 스냅숏 범위 루트로 기억.
+        widen이면 그 조상부터 위로 가장 가까운 리스트 계열 요소까지 넓힌다(결과 수가 바뀌어도 포함)."""
+        self._paths.pop(key, None)
+        self._roles.pop(key, None)
+        if not groups:
+            return
+        scopes = []
+        for nodes, widen in groups:
+            prefix = list(nodes[0][1])
+            for _el, path, _attrs in nodes[1:]:
+                n = 0
+                while n < len(prefix) and n < len(path) and prefix[n] == path[n]:
+                    n += 1
+                del prefix[n:]
+            scope = tuple(prefix)
+            if widen:
+                for depth in range(len(prefix), -1, -1):
+                    node = snap.by_path.get(tuple(prefix[:depth]))
+                    if node is not None and node[2].get('AXRole') in AX_RESULT_CONTAINER_ROLES:
+                        scope = tuple(prefix[:depth])
+                        break
+            scopes.append(scope)
+        # 다른 범위 안에 포함되는 범위는 빼서 같은 노드를 두 번 순회하지 않는다.
+        scopes = [p for p in scopes if not any(q != p and p[:len(q)] == q for q in scopes)]
+        scopes = list(dict.fromkeys(scopes))
+        self._paths[key] = scopes
+        self._roles[key] = [snap.by_path[p][2].get('AXRole') for p in scopes]
+
+
+_ax_locator = _AXLocator()
+
+
+def get_ax_locator_stats() -> dict:
+    """위치 캐시 통계 {key: {'hit', 'miss', 'ipc_total', 'ipc_last'}} 사본."""
+    return {k: dict(v) for k, v in _ax_locator.stats.items()}
+
+
+def log_ax_locator_summary():
+    """전송 종료 시 위치 캐시 적중률과 조회당 평균 AX 호출 수를 로그로 남긴다."""
+    stats = get_ax_locator_stats()
+    if not stats:
+        return
+    log("🔎 AX 위치 캐시 — 적중/전체 | 조회당 평균 AX 호출")
+    for key, st in stats.items():
+        lookups = st['hit'] + st['miss']
+        log(f"   • {key:<14} {st['hit']}/{lookups} | {st['ipc_total'] / lookups:5.1f}회")
+
 
+def take_ax_snapshot(key, window, full: bool = False) -> AXSnapshot:
+    """key('search_field' | 'search_results' | 'message_input') 단계의 스냅숏 (위치 캐시 경유).
+    full=True면 창 전체를 순회한다."""
+    return _ax_locator.snapshot(key, window, full=full)
 
-def _ax_collect_result_names(window, max_depth: int = 30) -> List[str]:
+
+def _ax_collect_result_names(window) -> List[str]:
     """검색 결과 행의 친구 이름(AXStaticText id='Display Name')을 모두 수집."""
-    names = []
-    for el in _ax_walk(window, max_depth):
-        if _ax_copy(el, "AXIdentifier") == AX_DISPLAY_NAME_ID:
-            value = _ax_copy(el, "AXValue")
-            if value:
-                text = normalize_name(str(value))
-                if text:
-                    names.append(text)
-    return names
-
-
-def _ax_read_search_field(window, max_depth: int = 30) -> Optional[str]:
+    return take_ax_snapshot('search_results', window).result_names()
+
+
+def _ax_read_search_field(window) -> Optional[str]:
     """검색창(AXSearchField)에 입력된 텍스트를 읽어 반환. 없으면 None."""
-    for el in _ax_walk(window, max_depth):
-        if _ax_copy(el, "AXSubrole") == "AXSearchField":
-            value = _ax_copy(el, "AXValue")
-            if value is not None:
-                return str(value)
-    return None
+    return take_ax_snapshot('search_field', window).search_value()
 
 
 # ============================================================
@@ -671,6 +2606,7 @@ def _ax_set(element, attr, value) -> bool:
     """AX 속성에 값을 쓴다. 성공 시 True."""
     if not AX_WRITE_AVAILABLE or element is None:
         return False
+    _ax_stats['ipc'] += 1
     try:
         return AXUIElementSetAttributeValue(element, attr, value) == 0
     except Exception:
@@ -681,6 +2617,7 @@ def _ax_is_settable(element, attr) -> bool:
     """AX 속성이 쓰기 가능한지 여부."""
     if not AX_WRITE_AVAILABLE or element is None:
         return False
+    _ax_stats['ipc'] += 1
     try:
         err, settable = AXUIElementIsAttributeSettable(element, attr, None)
         return err == 0 and bool(settable)
@@ -688,26 +2625,11 @@ def _ax_is_settable(element, attr) -> bool:
         return False
 
 
-def _ax_get_search_field_element(window, max_depth: int = 30):
-    """검색창(AXSearchField) 요소 자체를 반환. 없으면 None."""
-    for el in _ax_walk(window, max_depth):
-        if _ax_copy(el, "AXSubrole") == "AXSearchField":
-            return el
-    return None
-
-
-def _ax_get_message_input(window, max_depth: int = 35):
-    """채팅방 메시지 입력창(AXTextArea, 설명='메시지 입력')을 반환. 없으면 None.
-    채팅 말풍선도 AXTextArea라서 설명/placeholder로 입력창만 정확히 식별한다."""
-    for el in _ax_walk(window, max_depth):
-        if _ax_copy(el, "AXRole") != "AXTextArea":
-            continue
-        desc = _ax_copy(el, "AXDescription")
-        placeholder = _ax_copy(el, "AXPlaceholderValue")
-        if (desc and "메시지" in str(desc)) or (placeholder and "메시지" in str(placeholder)):
-            return el
-    return None
-
+def _ax_get_message_input(window):
+    """채팅방 메시지 입력창(AXTextArea, 설명='메시지 입력')을 반환. 없으면 None. (위치 캐시 경유)"""
+    node = take_ax_snapshot('message_input', window).message_input()
+    return node[0] if node else None
+
 
 def _ax_write_search(name: str) -> bool:
     """AX로 검색창에 name을 직접 써넣는다(필터링도 이 값으로 작동).
@@ -721,7 +2643,8 @@ def _ax_write_search(name: str) -> bool:
         window = _ax_get_main_window(_ax_get_kakao_app_element())
         if window is None:
             return False
-        field = _ax_get_search_field_element(window)
+        node = take_ax_snapshot('search_field', window).search_field()
+        field = node[0] if node else None
         if field is None or not _ax_is_settable(field, "AXValue"):
             return False
         if _ax_is_settable(field, "AXFocused"):
@@ -730,7 +2653,9 @@ def _ax_write_search(name: str) -> bool:
         if not _ax_set(field, "AXValue", name):
             return False
         time.sleep(0.1)
-        return _ax_read_search_field(window) == name
+        # 되읽기는 찾아 둔 검색창 요소에서 직접 (트리 재순회 없음)
+        value = _ax_copy(field, "AXValue")
+        return value is not None and str(value) == name
     except Exception:
         return False
 
@@ -769,15 +2694,7 @@ def _ax_input_and_send(message: str) -> bool:
             return False
 
         # 전송: Enter
-        run_applescript('''
-        tell application "System Events"
-            tell process "KakaoTalk"
-                set frontmost to true
-                delay 0.15
-                key code 36
-            end tell
-        end tell
-        ''')
+        call_applescript_handler('pressEnter', 0.15)
 
         # 전송 확인: 입력창이 비워질 때까지 폴링한다.
         # (Enter가 실제로 전송하면 입력창이 즉시 비워짐. 끝까지 안 비워지면 미전송으로 판정 →
@@ -799,38 +2716,135 @@ def _ax_input_and_send(message: str) -> bool:
         return False
 
 
-def _ax_wait_for_search_results(timeout: float = 1.2, interval: float = 0.05) -> bool:
-    """검색 결과 행(AXStaticText)이 나타날 때까지 폴링. (패스트 모드의 고정 대기 대체)
-    결과가 빨리 뜨면 즉시 True로 반환하고, 안 뜨면 timeout까지 기다린 뒤 False.
-    AX를 못 쓰는 환경이면 timeout 동안 폴링하다 빠지므로 기존 고정 대기와 동급(상한)."""
-    deadline = time.perf_counter() + timeout
-    while time.perf_counter() < deadline:
+class _AXEventWaiter:
+    """카카오톡 앱 요소에 AXObserver를 붙여, 알림이 오면 깨어나는 대기 도구.
+
+    앱 요소에 등록하면 하위 모든 요소의 알림(값 변경·생성·포커스 이동·창 생성)이 온다.
+    런루프 소스는 만든 스레드(전송 스레드)의 런루프에 붙고, wait()가 그 런루프를 직접
+    돌리므로 메인 런루프가 없는 Flask 스레드에서도 동작한다."""
+
+    def __init__(self, pid, app_element):
+        self.pid = pid
+        self.thread = threading.get_ident()
+        self.events = 0
+        self._callback = self._on_event  # pyobjc 콜백 참조 유지
+        err, observer = AXObserverCreate(pid, self._callback, None)
+        if err != 0 or observer is None:
+            raise RuntimeError(f"AXObserverCreate 실패 (err={err})")
+        added = 0
+        for notification in AX_WAIT_NOTIFICATIONS:
+            try:
+                if AXObserverAddNotification(observer, app_element, notification, None) == 0:
+                    added += 1
+            except Exception:
+                pass
+        if not added:
+            raise RuntimeError("AX 알림 등록 실패")
+        self._observer = observer
+        self._source = AXObserverGetRunLoopSource(observer)
+        self._runloop = CFRunLoopGetCurrent()
+        CFRunLoopAddSource(self._runloop, self._source, kCFRunLoopDefaultMode)
+
+    def _on_event(self, observer, element, notification, refcon):
+        self.events += 1
+
+    def wait(self, timeout: float) -> bool:
+        """알림이 오거나 timeout이 지날 때까지 런루프를 돌린다. 알림으로 깼으면 True.
+        깬 뒤엔 밀려 있는 알림을 한꺼번에 비워, 알림 폭주 시에도 재확인은 한 번만 한다."""
+        before = self.events
+        CFRunLoopRunInMode(kCFRunLoopDefaultMode, timeout, True)
+        if self.events != before:
+            CFRunLoopRunInMode(kCFRunLoopDefaultMode, 0, False)
+        return self.events != before
+
+    def close(self):
         try:
-            window = _ax_get_main_window(_ax_get_kakao_app_element())
-            if window is not None and _ax_collect_result_names(window):
-                return True
+            CFRunLoopRemoveSource(self._runloop, self._source, kCFRunLoopDefaultMode)
         except Exception:
             pass
-        time.sleep(interval)
-    return False
 
 
-def _ax_wait_for_message_input(timeout: float = 1.5, interval: float = 0.05) -> bool:
-    """채팅방 메시지 입력창(AXTextArea)이 나타날 때까지 폴링. (패스트 모드의 레이아웃 대기 대체)
-    입력창이 준비된 시점에만 다음 단계로 진행하므로 미입력/오입력 실패율을 낮춘다."""
-    deadline = time.perf_counter() + timeout
-    while time.perf_counter() < deadline:
+# 알림 대기 도구는 (카카오톡 PID, 전송 스레드)당 하나. 만들기에 실패한 PID는 기억해 두고
+# 그 PID 동안은 다시 시도하지 않는다(폴링 폴백).
+_ax_event_waiter = {'waiter': None, 'failed_pid': None}
+
+
+def _ax_get_event_waiter():
+    """현재 스레드에서 쓸 _AXEventWaiter. 쓸 수 없으면 None(→ 폴링)."""
+    if not (AX_OBSERVER_AVAILABLE and USE_AX_EVENT_WAIT):
+        return None
+    app_element = _ax_get_kakao_app_element()
+    with _ax_app_cache_lock:
+        pid = _ax_app_cache['pid']
+    if app_element is None or pid is None or pid == _ax_event_waiter['failed_pid']:
+        return None
+    waiter = _ax_event_waiter['waiter']
+    if waiter is not None and waiter.pid == pid and waiter.thread == threading.get_ident():
+        return waiter
+    if waiter is not None:
+        waiter.close()
+        _ax_event_waiter['waiter'] = None
+    try:
+        _ax_event_waiter['waiter'] = _AXEventWaiter(pid, app_element)
+    except Exception:
+        _ax_event_waiter['failed_pid'] = pid
+        return None
+    return _ax_event_waiter['waiter']
+
+
+def _ax_wait_until(check, timeout: float, interval: float = 0.05, learn_stage: Optional[str] = None) -> bool:
+    """check()가 참이 될 때까지 대기. 참이면 True, timeout이 지나면 False.
+    AX 알림을 쓸 수 있으면 알림이 올 때(또는 AX_EVENT_RECHECK_SECONDS마다)만 다시 확인하고,
+    아니면 interval 간격으로 폴링한다.
+    learn_stage: 앞선 고정 대기 없이 부른 경우, 준비까지 걸린 시간을 적응형 대기에 기록한다."""
+    start = time.perf_counter()
+    deadline = start + timeout
+    try:
+        waiter = _ax_get_event_waiter()
+    except Exception:
+        waiter = None
+    while True:
         try:
-            window = _ax_get_main_window(_ax_get_kakao_app_element())
-            if window is not None and _ax_get_message_input(window) is not None:
+            if check():
+                if learn_stage:
+                    adaptive_delays.observe(learn_stage, time.perf_counter() - start)
                 return True
         except Exception:
             pass
-        time.sleep(interval)
-    return False
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        if waiter is not None:
+            try:
+                waiter.wait(min(remaining, AX_EVENT_RECHECK_SECONDS))
+                continue
+            except Exception:
+                waiter = None
+        time.sleep(min(interval, remaining))
+
+
+def _ax_wait_for_search_results(timeout: float = 1.2, interval: float = 0.05,
+                                learn_stage: Optional[str] = None) -> bool:
+    """검색 결과 행(AXStaticText)이 나타날 때까지 대기. (패스트 모드의 고정 대기 대체)
+    결과가 빨리 뜨면 즉시 True로 반환하고, 안 뜨면 timeout까지 기다린 뒤 False.
+    AX를 못 쓰는 환경이면 timeout 동안 폴링하다 빠지므로 기존 고정 대기와 동급(상한)."""
+    def results_ready():
+        window = _ax_get_main_window(_ax_get_kakao_app_element())
+        return window is not None and bool(_ax_collect_result_names(window))
+    return _ax_wait_until(results_ready, timeout, interval, learn_stage)
+
+
+def _ax_wait_for_message_input(timeout: float = 1.5, interval: float = 0.05,
+                               learn_stage: Optional[str] = None) -> bool:
+    """채팅방 메시지 입력창(AXTextArea)이 나타날 때까지 대기. (패스트 모드의 레이아웃 대기 대체)
+    입력창이 준비된 시점에만 다음 단계로 진행하므로 미입력/오입력 실패율을 낮춘다."""
+    def input_ready():
+        window = _ax_get_main_window(_ax_get_kakao_app_element())
+        return window is not None and _ax_get_message_input(window) is not None
+    return _ax_wait_until(input_ready, timeout, interval, learn_stage)
 
 
-def _chat_input_ready(timeout: float) -> bool:
+def _chat_input_ready(timeout: float, learn_stage: Optional[str] = None) -> bool:
     """채팅방 메시지 입력창이 떴는지(=채팅방이 실제로 열렸는지) 확인.
 
     AX를 못 쓰는 환경(권한/라이브러리 부재)에서는 확인 수단이 없으므로 True(낙관)로 둬
@@ -842,91 +2856,361 @@ def _chat_input_ready(timeout: float) -> bool:
             return True
     except Exception:
         return True
-    return _ax_wait_for_message_input(timeout=timeout)
+    return _ax_wait_for_message_input(timeout=timeout, learn_stage=learn_stage)
+
+
+# 전송 결과 사유(reason) → 사람이 읽는 이름. 성공 사유와 실패 사유를 한 표로 관리한다.
+SEND_REASON_LABELS = {
+    'sent': '전송',
+    'sent_clipboard': '전송(AX 입력 실패 → 붙여넣기)',
+    'dry_run': '모의 전송',
+    'verified': '친구 확인(검증만)',
+    'kakao_not_ready': '카카오톡 준비 안 됨',
+    'search_input_failed': '검색어 입력 확인 실패',
+    'search_field_missing': '검색창 못 찾음',
+    'search_value_mismatch': '검색창 값 불일치',
+    'no_results': '검색 결과 없음',
+    'not_found': '일치하는 친구 없음',
+    'ambiguous': '후보 여러 명(보류)',
+    'emoji_mismatch': '이모티콘 불일치',
+    'no_window': '카카오톡 창 없음',
+    'ax_unavailable': '접근성 사용 불가',
+    'ax_error': 'AX 읽기 오류',
+    'chat_open_timeout': '채팅방 열기 실패',
+    'send_uncertain': '전송 중 오류(전송 여부 불확실)',
+    'error': '오류',
+    'unknown': '알 수 없음',
+}
+
+
+class VerifyResult(NamedTuple):
+    """verify_friend_by_ax / classify_friend_match 결과.
+
+    reason: 확인 방법('exact'|'decorated'|'substring') 또는 실패 사유,
+    candidates: 일치한 화면 이름(보류면 후보들).
+    """
+    ok: bool
+    reason: str
+    candidates: tuple = ()
+
+    def __bool__(self):
+        return self.ok
+
+
+class SendOutcome(NamedTuple):
+    """send_message / send_message_to_friend 결과. bool()은 성공 여부(기존 True/False 호출부 호환).
+
+    reason: SEND_REASON_LABELS 키, stage: 결과가 정해진 계측 단계,
+    attempts: 검색·채팅방 열기 시도 횟수, elapsed: 소요 초.
+    """
+    ok: bool
+    reason: str
+    stage: str
+    attempts: int = 1
+    elapsed: float = 0.0
 
+    def __bool__(self):
+        return self.ok
 
-def verify_friend_by_ax(name: str) -> bool:
-    """접근성(AX) API로 친구 검증. 확인되면 True, 아니면 False.
+
+def as_send_outcome(value) -> SendOutcome:
+    """SendOutcome 또는 bool(워커 시뮬레이션 등) → SendOutcome."""
+    if isinstance(value, SendOutcome):
+        return value
+    return SendOutcome(bool(value), 'sent' if value else 'unknown', 'person_total')
+
+
+def classify_friend_match(name, names, forms: Optional[NameForms] = None) -> VerifyResult:
+    """화면(또는 친구 목록)의 표시 이름들 중 name에 해당하는 친구를 가린다. 로그·AX 호출 없음.
+
+    규칙은 순서대로: 1) 정확 일치(canonicalize_name — ❤ == ❤️, 한글 조합/분해형)
+    2) 이모티콘이 든 이름은 여기서 끝(정확 일치만 허용) 3) 장식기호 제거 후 일치(후보 1명만)
+    4) 부분 일치(SUBSTRING_MATCH_MIN_CHARS 이상, 더 긴 이름 중 후보 1명만).
+    같은 문자열은 한 명으로 본다. names에 이 규칙과 무관한 이름이 섞여 있어도 결과는 같으므로,
+    FriendDirectory는 색인으로 추린 후보만 넘긴다.
+    """
+    if forms is None:
+        forms = name_forms(name)
+    names = list(dict.fromkeys(names))
+    exact = [n for n in names if name_forms(n).canonical == forms.canonical]
+    if exact:
+        return VerifyResult(True, 'exact', tuple(exact))
+    # 이모티콘이 포함된 이름은 오발송 방지를 위해 '정확 일치'만 허용한다.
+    # (이모티콘을 떼면 텍스트가 같은 다른 친구에게 잘못 보내는 일을 원천 차단)
+    if forms.has_emoji:
+        return VerifyResult(False, 'emoji_mismatch')
+    # 카카오톡 표시 이름에 이모티콘이 붙은 경우
+    decorated = [n for n in names if name_forms(n).match == forms.match]
+    if len(decorated) == 1:
+        return VerifyResult(True, 'decorated', tuple(decorated))
+    if decorated:
+        return VerifyResult(False, 'ambiguous', tuple(decorated))
+    # 카톡 표시이름에 '…30대 남' 같은 꼬리표가 더 붙어 엑셀 이름이 그 일부인 경우.
+    # 충분히 긴 이름에 한해, 정확히 한 명의 이름에 포함될 때만 인정한다.
+    if comparable_name_length(forms.match) >= SUBSTRING_MATCH_MIN_CHARS:
+        partial = [n for n in names if forms.match in name_forms(n).match]
+        if len(partial) == 1:
+            return VerifyResult(True, 'substring', tuple(partial))
+        if partial:
+            return VerifyResult(False, 'ambiguous', tuple(partial))
+    return VerifyResult(False, 'not_found')
+
+
+def verify_friend_by_ax(name: str, forms: Optional[NameForms] = None) -> 'VerifyResult':
+    """접근성(AX) API로 친구 검증. 확인되면 참인 VerifyResult(어떻게 확인했는지/왜 못 했는지 사유 포함).
 
     검색창(AXSearchField)과 친구행(AXStaticText)이 role/identifier로 구분되므로
     검색창 텍스트를 친구로 오인할 위험이 없다.
     실패(미확인/읽기 불가) 시 친구를 찾지 못한 것으로 처리한다(오발송 방지).
+    forms: 명단에서 미리 계산한 이름 파생형(없으면 여기서 계산). 화면의 후보 이름은
+    name_forms 메모이즈로 시도마다 다시 정규화하지 않는다.
     """
     if not (AX_AVAILABLE and USE_AX_VERIFICATION):
-        return False
+        return VerifyResult(False, 'ax_unavailable')
 
     if not AXIsProcessTrusted():
         log("   -> ⚠️ 접근성 권한이 없어 친구 검증을 할 수 없습니다. (시스템 설정 > 손쉬운 사용 권한 확인)")
-        return False
+        return VerifyResult(False, 'ax_unavailable')
 
     # 어떤 예외가 나더라도 크래시 없이 '미확인(False)'으로 안전하게 처리한다.
     try:
         app_element = _ax_get_kakao_app_element()
         window = _ax_get_main_window(app_element)
         if window is None:
-            return False
+            return VerifyResult(False, 'no_window')
 
-        normalized = normalize_name(name)
-        decorated_normalized = normalize_name_for_match(name)
+        if forms is None:
+            forms = name_forms(name)
+        normalized = forms.normalized
+        decorated_normalized = forms.match
 
         # 오발송 방지 가드: 검색창에 실제로 이 검색어가 들어가 있을 때만 결과를 신뢰한다.
         # (검색 필터가 안 된 채 전체 목록이 보이는 상태에서 우연히 일치해 잘못 보내는 것을 차단)
-        search_value = _ax_read_search_field(window)
+        # 검색창 값과 결과 이름을 같은 스냅숏(트리 순회 1회)에서 읽는다. 기억한 결과 리스트 범위만 보면
+        # 다른 구역의 같은 이름 행을 놓쳐 '후보 여러 명'이 '확인됨'이 될 수 있으므로 창 전체를 순회한다.
+        snapshot = take_ax_snapshot('search_results', window, full=True)
+        search_value = snapshot.search_value()
         if search_value is None:
             log("   -> ⚠️ 검색창을 찾지 못해 친구 검증을 보류합니다.")
-            return False
-        search_normalized = normalize_name(search_value)
-        if search_normalized != normalized and normalize_name_for_match(search_value) != decorated_normalized:
+            return VerifyResult(False, 'search_field_missing')
+        search_forms = name_forms(search_value)
+        search_normalized = search_forms.normalized
+        if search_normalized != normalized and search_forms.match != decorated_normalized:
             log(
                 f"   -> ⚠️ 검색창 값('{search_normalized[:30]}')이 검색어와 달라 "
                 f"친구 검증을 보류합니다."
             )
-            return False
+            return VerifyResult(False, 'search_value_mismatch')
 
-        names = _ax_collect_result_names(window)
+        names = snapshot.result_names()
         if not names:
-            return False
+            return VerifyResult(False, 'no_results')
+
+        result = classify_friend_match(name, names, forms)
+        if result.reason == 'decorated':
+            log(f"   -> ✅ AX(장식기호 제거) 확인됨: '{result.candidates[0]}'")
+        elif result.reason == 'substring':
+            log(f"   -> ✅ AX(부분 일치) 확인됨: '{result.candidates[0]}' ⊇ '{normalized}'")
+        elif result.reason == 'ambiguous':
+            log(f"   -> ⚠️ AX 후보가 여러 개라 오발송 방지를 위해 보류: {', '.join(result.candidates)}")
+        return result
+    except Exception as exc:
+        log(f"   -> ⚠️ 친구 검증 중 예외 발생, 미확인으로 처리합니다: {exc}")
+        return VerifyResult(False, 'ax_error')
 
-        # 1) 정확 일치 (이모티콘 표현형 차이는 정규화로 흡수: ❤ == ❤️, 한글 조합/분해형)
-        #    가장 흔한 경로 — 로그는 호출부의 '친구 확인됨 (AX)'로 통합.
-        canon_target = canonicalize_name(name)
-        if any(canonicalize_name(n) == canon_target for n in names):
-            return True
 
-        # 이모티콘이 포함된 이름은 오발송 방지를 위해 '정확 일치'만 허용한다.
-        # (이모티콘을 떼면 텍스트가 같은 다른 친구에게 잘못 보내는 일을 원천 차단)
-        if name_contains_emoji_or_symbol(name):
-            return False
+# 친구 목록 사전 분류: 있음 → 평소처럼 검색·검증, 후보 여러 명/없음 → UI를 건드리지 않고 건너뜀
+FRIEND_DIRECTORY_STATUS = {'exact': 'unique', 'decorated': 'unique', 'substring': 'unique',
+                           'ambiguous': 'ambiguous'}  # 그 밖의 사유는 'missing'
 
-        # 2) 장식기호(이모티콘) 제거 후 일치 — 카카오톡 표시 이름에 이모티콘이 붙은 경우.
-        decorated_matches = {n for n in names if normalize_name_for_match(n) == decorated_normalized}
-        if len(decorated_matches) == 1:
-            log(f"   -> ✅ AX(장식기호 제거) 확인됨: '{next(iter(decorated_matches))}'")
-            return True
-        if len(decorated_matches) > 1:
-            log(f"   -> ⚠️ AX 후보가 여러 개라 오발송 방지를 위해 보류: {', '.join(decorated_matches)}")
-            return False
 
-        # 3) 부분 일치 — 카톡 표시이름에 '…30대 남' 같은 꼬리표가 더 붙어 엑셀 이름이 그 일부인 경우.
-        #    오발송 방지를 위해: 충분히 긴 이름에 한해, 검색 결과 중 '정확히 한 명'의 이름에
-        #    포함될 때만 인정한다. 후보가 2명 이상이면 보류(어느 쪽인지 확신 불가).
-        if comparable_name_length(decorated_normalized) >= SUBSTRING_MATCH_MIN_CHARS:
-            substring_matches = [
-                n for n in names
-                if normalize_name_for_match(n) != decorated_normalized
-                and decorated_normalized in normalize_name_for_match(n)
-            ]
-            if len(substring_matches) == 1:
-                log(f"   -> ✅ AX(부분 일치) 확인됨: '{substring_matches[0]}' ⊇ '{normalize_name(name)}'")
-                return True
-            if len(substring_matches) > 1:
-                log(f"   -> ⚠️ 부분 일치 후보가 여러 개라 오발송 방지를 위해 보류: {', '.join(substring_matches)}")
-                return False
+class FriendDirectory:
+    """친구 탭 목록의 표시 이름 색인 — 대상자를 검색 없이 미리 분류한다.
 
-        return False
-    except Exception as exc:
-        log(f"   -> ⚠️ 친구 검증 중 예외 발생, 미확인으로 처리합니다: {exc}")
-        return False
+    정확(표시 이름 그대로)·정규(canonicalize_name)·장식기호 제거(normalize_name_for_match) 사전과
+    부분 일치용 2글자 조각 색인을 두고, 대상자마다 규칙에 걸릴 수 있는 후보만 추려
+    classify_friend_match로 넘긴다(검색 결과 검증과 같은 규칙). update()는 새로 훑은 목록과의
+    차이(추가·삭제된 이름)만 색인에 반영한다.
+    """
+
+    def __init__(self):
+        self.names = {}          # 표시 이름 → NameForms (훑은 순서)
+        self.by_canonical = {}   # canonical → {표시 이름}
+        self.by_match = {}       # match → {표시 이름}
+        self._grams = {}         # match의 2글자 조각 → {match}
+        self.scanned_at = None   # 마지막으로 끝까지 훑은 시각(time.monotonic), 없으면 None
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def _bigrams(text: str) -> set:
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def _add(self, display: str):
+        forms = name_forms(display)
+        self.names[display] = forms
+        self.by_canonical.setdefault(forms.canonical, set()).add(display)
+        group = self.by_match.setdefault(forms.match, set())
+        if not group:
+            for gram in self._bigrams(forms.match):
+                self._grams.setdefault(gram, set()).add(forms.match)
+        group.add(display)
+
+    def _remove(self, display: str):
+        forms = self.names.pop(display)
+        self.by_canonical[forms.canonical].discard(display)
+        if not self.by_canonical[forms.canonical]:
+            del self.by_canonical[forms.canonical]
+        group = self.by_match[forms.match]
+        group.discard(display)
+        if not group:
+            del self.by_match[forms.match]
+            for gram in self._bigrams(forms.match):
+                self._grams[gram].discard(forms.match)
+                if not self._grams[gram]:
+                    del self._grams[gram]
+
+    def update(self, names) -> tuple:
+        """새로 훑은 표시 이름 목록으로 색인을 맞춘다 → (추가된 수, 삭제된 수)."""
+        fresh = dict.fromkeys(n for n in names if n)
+        removed = [n for n in self.names if n not in fresh]
+        added = [n for n in fresh if n not in self.names]
+        for display in removed:
+            self._remove(display)
+        for display in added:
+            self._add(display)
+        self.scanned_at = time.monotonic()
+        return len(added), len(removed)
+
+    def candidates(self, forms: NameForms) -> list:
+        """forms에 정확·장식기호 제거·부분 일치로 걸릴 수 있는 표시 이름들(그 외는 규칙상 무관)."""
+        found = set(self.by_canonical.get(forms.canonical, ()))
+        found |= self.by_match.get(forms.match, set())
+        if comparable_name_length(forms.match) >= SUBSTRING_MATCH_MIN_CHARS:
+            postings = sorted((self._grams.get(g, set()) for g in self._bigrams(forms.match)), key=len)
+            keys = set.intersection(*postings) if postings else set()
+            for key in keys:
+                if forms.match in key:
+                    found |= self.by_match[key]
+        return sorted(found)
+
+    def classify(self, forms: NameForms) -> VerifyResult:
+        return classify_friend_match(forms.raw, self.candidates(forms), forms)
+
+    def classify_roster(self, target_df) -> dict:
+        """명단의 대상자를 분류 → {'unique'|'ambiguous'|'missing': [(행 위치, 이름, VerifyResult)]}."""
+        groups = {'unique': [], 'ambiguous': [], 'missing': []}
+        for pos, row in enumerate(target_df.to_dict('records')):
+            result = self.classify(roster_row_forms(row))
+            groups[FRIEND_DIRECTORY_STATUS.get(result.reason, 'missing')].append((pos, row['이름'], result))
+        return groups
+
+
+friend_directory = FriendDirectory()
+
+
+def _ax_page_names(root, path) -> List[str]:
+    return AXSnapshot([(root, path)]).result_names()
+
+
+def _ax_scan_friend_list() -> Optional[List[str]]:
+    """친구 탭 목록을 스크롤바로 처음부터 끝까지 넘기며 표시 이름을 모두 모은다.
+
+    화면에 그려진 행만 AX 트리에 나타나므로, 앞 화면과 이름이 겹치도록 스크롤 폭을 조절한다
+    (안 겹치면 반으로 줄여 다시, 많이 겹치면 늘림). 스크롤 영역·스크롤바를 못 찾았거나, 최소 폭으로도
+    앞 화면과 겹치지 않았거나, 끝까지 못 훑었으면 None — 일부만 훑은 목록으로 대상자를 '없음'
+    처리하면 안 되기 때문이다(None이면 대상자마다 검색·검증). 마치면 맨 위로 되돌린다.
+    """
+    if not (AX_AVAILABLE and AX_WRITE_AVAILABLE and AXIsProcessTrusted()):
+        return None
+    window = _ax_get_main_window(_ax_get_kakao_app_element())
+    if window is None:
+        return None
+    snap = AXSnapshot([(window, ())])
+    nodes = snap.result_nodes()
+    if not nodes:
+        return None
+    # 이름 행들의 공통 조상에서 가장 가까운 스크롤 영역
+    prefix = list(nodes[0][1])
+    for _el, path, _attrs in nodes[1:]:
+        n = 0
+        while n < len(prefix) and n < len(path) and prefix[n] == path[n]:
+            n += 1
+        del prefix[n:]
+    area_path = next((tuple(prefix[:d]) for d in range(len(prefix), -1, -1)
+                      if snap.by_path.get(tuple(prefix[:d]), (None, None, {}))[2].get('AXRole') == 'AXScrollArea'),
+                     None)
+    if area_path is None:
+        return None
+    area = snap.by_path[area_path][0]
+    bar = _ax_copy(area, 'AXVerticalScrollBar')
+    if bar is None:
+        return None  # 한 화면에 다 보이는지, 스크롤바를 못 읽은 것인지 구분할 수 없다
+    names = {}
+    if not _ax_set(bar, 'AXValue', 0.0):
+        return None
+    try:
+        time.sleep(FRIEND_DIRECTORY_SETTLE)
+        page = _ax_page_names(area, area_path)
+        names.update(dict.fromkeys(page))
+        position, step = 0.0, FRIEND_DIRECTORY_SCROLL_STEP
+        for _ in range(FRIEND_DIRECTORY_MAX_PAGES):
+            if position >= 1.0:
+                return list(names)
+            check_stop_requested()
+            target = min(1.0, position + step)
+            if not _ax_set(bar, 'AXValue', target):
+                return None
+            time.sleep(FRIEND_DIRECTORY_SETTLE)
+            fresh = _ax_page_names(area, area_path)
+            if not fresh:
+                return None
+            overlap = len(set(page) & set(fresh))
+            if not overlap:
+                if step <= FRIEND_DIRECTORY_MIN_STEP:
+                    return None  # 최소 폭으로도 이어지지 않는다 → 건너뛴 행이 없다고 확신할 수 없다
+                step /= 2  # 건너뛴 행이 있을 수 있다 → 반 칸만 다시
+                continue
+            names.update(dict.fromkeys(fresh))
+            if overlap > len(fresh) // 2:
+                step *= 1.5
+            page, position = fresh, target
+        return None
+    finally:
+        _ax_set(bar, 'AXValue', 0.0)
+
+
+def refresh_friend_directory(force: bool = False) -> Optional[FriendDirectory]:
+    """친구 목록 색인을 준비한다. 최근에 훑었으면 그대로, 아니면 다시 훑어 바뀐 이름만 반영.
+    끝까지 훑지 못하면 None(색인 없이 진행)."""
+    directory = friend_directory
+    fresh = (directory.scanned_at is not None
+             and time.monotonic() - directory.scanned_at < FRIEND_DIRECTORY_MAX_AGE)
+    if fresh and not force:
+        log(f"📒 친구 목록 색인 재사용 — {len(directory)}명")
+        return directory
+    log("📒 친구 목록을 훑는 중...")
+    reset_search(silent=True)
+    with time_stage('friend_directory'):
+        try:
+            names = _ax_scan_friend_list()
+        except StopRequestedException:
+            raise
+        except Exception as exc:
+            log(f"   -> ⚠️ 친구 목록을 읽지 못했습니다: {exc}")
+            names = None
+    if not names:
+        directory.scanned_at = None
+        log("   -> ⚠️ 친구 목록을 끝까지 읽지 못해 대상자마다 검색으로 확인합니다.")
+        return None
+    first = not directory.names
+    added, removed = directory.update(names)
+    if first:
+        log(f"   -> ✅ 친구 {len(directory)}명 색인")
+    else:
+        log(f"   -> ✅ 친구 {len(directory)}명 (추가 {added} · 삭제 {removed})")
+    return directory
 
 
 def get_ax_permission_state() -> dict:
@@ -977,167 +3261,323 @@ def request_ax_permission_prompt() -> dict:
     return get_ax_permission_state()
 
 
+def _attachment_clipboard():
+    """첨부(사진·파일)를 올릴 클립보드. 텍스트는 pyperclip으로 설정했어도 첨부는 NSPasteboard로만
+    올릴 수 있으므로 그때는 네이티브 백엔드를 따로 만든다. pyobjc/AppKit이 없으면 None."""
+    clipboard = get_clipboard()
+    if clipboard is _pyperclip_clipboard:
+        if not PASTEBOARD_AVAILABLE:
+            return None
+        try:
+            clipboard = _NativeClipboard()
+        except Exception:
+            return None
+    return clipboard
+
+
 def _copy_image_to_clipboard(image_path: str) -> bool:
     """이미지 파일을 클립보드에 '사진'으로 복사한다. 성공 시 True.
 
     NSImage로 읽어 클립보드에 이미지 데이터로 올린다(파일 URL이 아니라 이미지 데이터라
     카카오톡이 '사진'으로 붙여넣는다). pyobjc/AppKit이 없으면 False.
     """
+    clipboard = _attachment_clipboard()
+    return clipboard is not None and clipboard.copy_image(image_path)
+
+
+def _copy_file_to_clipboard(path: str) -> bool:
+    """파일을 클립보드에 '파일'로 복사한다(PDF 첨부). pyobjc/AppKit이 없으면 False."""
+    clipboard = _attachment_clipboard()
+    return clipboard is not None and clipboard.copy_file(path)
+
+
+class PreparedAttachment(NamedTuple):
+    """한 번 준비해 둔 첨부 (대상자마다 그대로 클립보드에 올린다)."""
+    key: tuple          # (원본 경로, 수정 시각, 크기) — 파일이 바뀌면 다시 준비
+    data: object        # 클립보드에 올릴 인코딩된 데이터(NSData). PDF는 None(파일로 붙여넣음)
+    uti: str            # 'public.jpeg' | 'public.png' | ATTACHMENT_PDF_UTI
+    size: int           # data 바이트 수
+    width: int
+    height: int
+    source_size: int    # 원본 파일 바이트 수
+    seconds: float      # 준비에 걸린 시간
+
+
+ATTACHMENT_PDF_UTI = 'com.adobe.pdf'
+
+
+def _attachment_key(path: str) -> tuple:
+    st = os.stat(path)
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def is_pdf_attachment(path: str) -> bool:
+    return str(path).lower().endswith('.pdf')
+
+
+def prepare_attachment(path: str) -> Optional[PreparedAttachment]:
+    """원본 이미지(HEIC/TIFF/BMP/PNG/JPEG 등)를 ImageIO로 한 번 디코드해 긴 변 ATTACHMENT_MAX_EDGE
+    이하로 줄이고(사진 회전 정보 반영), 불투명하면 JPEG·투명도가 있으면 PNG로 인코딩한다.
+    PDF는 쪽을 사진으로 바꾸지 않고 파일로 붙여넣으므로, 끝까지 한 번 읽어 형식만 확인한다(OS 파일
+    캐시에 올라가 붙여넣을 때 카카오톡이 디스크를 기다리지 않는다).
+    준비할 수 없으면(pyobjc 없음·디코드 실패) None → 원본을 붙여넣는 기존 경로."""
+    if not USE_PREPARED_ATTACHMENTS:
+        return None
+    t0 = time.perf_counter()
     try:
-        from AppKit import NSPasteboard, NSImage
-    except Exception:
-        return False
-    try:
-        img = NSImage.alloc().initWithContentsOfFile_(image_path)
-        if img is None:
-            return False
-        pb = NSPasteboard.generalPasteboard()
-        pb.clearContents()
-        return bool(pb.writeObjects_([img]))
+        key = _attachment_key(path)
+        if is_pdf_attachment(path):
+            with open(path, 'rb') as f:
+                head = f.read(5)
+                while f.read(1 << 20):
+                    pass
+            if head != b'%PDF-':
+                return None
+            return PreparedAttachment(key, None, ATTACHMENT_PDF_UTI, key[2], 0, 0, key[2], time.perf_counter() - t0)
+        if not ATTACHMENT_PREP_AVAILABLE:
+            return None
+        source = NSData.dataWithContentsOfFile_(path)
+        if source is None:
+            return None
+        image_source = CGImageSourceCreateWithData(source, None)
+        if image_source is None:
+            return None
+        image = CGImageSourceCreateThumbnailAtIndex(image_source, 0, {
+            kCGImageSourceCreateThumbnailFromImageAlways: True,
+            kCGImageSourceCreateThumbnailWithTransform: True,
+            kCGImageSourceThumbnailMaxPixelSize: ATTACHMENT_MAX_EDGE,
+        })
+        if image is None:
+            return None
+        rep = NSBitmapImageRep.alloc().initWithCGImage_(image)
+        # kCGImageAlphaNone / NoneSkipLast / NoneSkipFirst → 불투명
+        if CGImageGetAlphaInfo(image) in (0, 5, 6):
+            data = rep.representationUsingType_properties_(
+                NSBitmapImageFileTypeJPEG, {NSImageCompressionFactor: ATTACHMENT_JPEG_QUALITY})
+            uti = 'public.jpeg'
+        else:
+            data = rep.representationUsingType_properties_(NSBitmapImageFileTypePNG, {})
+            uti = 'public.png'
+        if data is None:
+            return None
+        return PreparedAttachment(key, data, uti, int(data.length()), int(CGImageGetWidth(image)),
+                                  int(CGImageGetHeight(image)), key[2], time.perf_counter() - t0)
     except Exception:
-        return False
+        return None
+
+
+class AttachmentCache:
+    """준비된 첨부(PreparedAttachment)의 메모리 캐시 — 개수·바이트 상한을 넘으면 오래 안 쓴 것부터 내린다.
+
+    get은 없으면 그 자리에서 준비하고, prefetch는 다음 대상자들의 첨부 준비를 백그라운드 스레드에
+    맡긴다. 선읽기가 준비 중인 파일을 전송이 요청하면 두 번 준비하지 않고 끝나기를 기다린다.
+    전송 쪽 요청만 센다: ready(이미 준비됨)·waited(준비 중이라 기다림)·cold(그 자리에서 준비).
+    """
+
+    def __init__(self, max_items: int = ATTACHMENT_CACHE_MAX, max_bytes: int = ATTACHMENT_CACHE_MAX_BYTES,
+                 prepare=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._prepare = prepare or prepare_attachment
+        self._cond = threading.Condition()
+        self._items = OrderedDict()  # path → PreparedAttachment (최근 사용이 뒤)
+        self._loading = set()
+        self._queue = deque()
+        self._worker = None
+        self.stats = {'ready': 0, 'waited': 0, 'cold': 0}
+
+    def get(self, path, prefetching: bool = False) -> Optional[PreparedAttachment]:
+        """path의 준비된 첨부. 처음 보거나 파일이 바뀌었으면 준비한다(준비 못 하면 None)."""
+        if not path:
+            return None
+        try:
+            key = _attachment_key(path)
+        except OSError:
+            return None
+        with self._cond:
+            counted = 'ready'
+            while path in self._loading:
+                counted = 'waited'
+                self._cond.wait()
+            item = self._items.get(path)
+            if item is not None and item.key == key:
+                self._items.move_to_end(path)
+                if not prefetching:
+                    self.stats[counted] += 1
+                return item
+            if not prefetching:
+                self.stats['cold'] += 1
+            self._loading.add(path)
+        prepared = None
+        try:
+            prepared = self._prepare(path)
+        finally:
+            with self._cond:
+                self._loading.discard(path)
+                self._items.pop(path, None)
+                if prepared is not None:
+                    self._items[path] = prepared
+                    self._evict()
+                self._cond.notify_all()
+        return prepared
+
+    def _evict(self):
+        total = sum(item.size for item in self._items.values() if item.data is not None)
+        while len(self._items) > 1 and (len(self._items) > self.max_items or total > self.max_bytes):
+            _path, item = self._items.popitem(last=False)
+            if item.data is not None:
+                total -= item.size
+
+    def prefetch(self, paths):
+        """아직 준비되지 않은 paths를 백그라운드에서 순서대로 준비한다(기다리지 않음)."""
+        with self._cond:
+            for path in paths:
+                if path and path not in self._items and path not in self._loading and path not in self._queue:
+                    self._queue.append(path)
+            if self._queue and self._worker is None:
+                self._worker = threading.Thread(target=self._run_prefetch, daemon=True)
+                self._worker.start()
+
+    def _run_prefetch(self):
+        while True:
+            with self._cond:
+                if not self._queue:
+                    self._worker = None
+                    return
+                path = self._queue.popleft()
+            self.get(path, prefetching=True)
+
+    def discard(self, path):
+        """path의 준비본을 메모리에서 내린다(이미지 제거·교체 시)."""
+        with self._cond:
+            self._items.pop(path, None)
+
+    def reset_stats(self):
+        with self._cond:
+            self._queue.clear()
+            self.stats = {'ready': 0, 'waited': 0, 'cold': 0}
+
+
+attachment_cache = AttachmentCache()
+
+
+def attachment_ingest_delay(size: Optional[int]) -> float:
+    """붙여넣은 사진을 카카오톡이 받아들일 때까지의 대기(초). 크기를 모르면(원본 경로) 최댓값."""
+    if size is None:
+        return ATTACHMENT_INGEST_DELAY
+    return min(ATTACHMENT_INGEST_DELAY, ATTACHMENT_INGEST_MIN + ATTACHMENT_INGEST_PER_MB * size / (1024 * 1024))
 
 
 def _send_image_via_clipboard(image_path: str) -> bool:
-    """열린 채팅방에 이미지 1장을 전송한다: 클립보드 복사 → '편집>붙여넣기' 메뉴 클릭 → Enter.
+    """열린 채팅방에 이미지 1장(PDF면 파일 1개)을 전송한다: 클립보드 복사 → '편집>붙여넣기' 메뉴 클릭 → Enter.
 
     Cmd+V(키 이벤트)는 채팅 연 직후 '첫 동작'일 때 입력창 포커스 레이스로 붙여넣기가 실패하는
     경우가 있었다(사진 먼저 순서에서 재현). 그래서 텍스트와 동일하게 '편집>붙여넣기' 메뉴 클릭
     방식으로 붙여넣는다 — 메뉴 클릭은 첫 동작이어도 안정적으로 입력창에 붙는다.
-    붙여넣기 대기는 이미지 첨부 시간이 텍스트보다 길어 넉넉히 둔다(이미지는 1인당 1회).
+    붙여넣기 대기는 이미지 첨부 시간이 텍스트보다 길어 넉넉히 둔다(이미지는 1인당 1회) — 준비된
+    사진은 그 크기만큼만, PDF 파일과 준비 못 한 원본은 ATTACHMENT_INGEST_DELAY.
     복사 실패/파일 없음 시 False(텍스트만 전송되도록 호출부에서 처리)."""
     if not image_path or not os.path.exists(image_path):
         return False
-    if not _copy_image_to_clipboard(image_path):
+    prepared = attachment_cache.get(image_path)
+    clipboard = _attachment_clipboard()  # 텍스트 백엔드가 pyperclip이어도 준비본은 NSPasteboard로 올린다
+    if is_pdf_attachment(image_path):
+        if not _copy_file_to_clipboard(image_path):
+            return False
+        ingest = attachment_ingest_delay(None)  # 파일 붙여넣기는 크기별 대기를 계측하지 않았다
+    elif prepared is not None and clipboard is not None and clipboard.copy_data(prepared.data, prepared.uti):
+        ingest = attachment_ingest_delay(prepared.size)
+    elif _copy_image_to_clipboard(image_path):
+        ingest = attachment_ingest_delay(None)
+    else:
         return False
-    script = '''
-    tell application "KakaoTalk" to activate
-    delay 0.3
-    tell application "System Events"
-        tell process "KakaoTalk"
-            set frontmost to true
-            try
-                click menu item "붙여넣기" of menu "편집" of menu bar 1
-            on error
-                try
-                    click menu item "Paste" of menu "편집" of menu bar 1
-                on error
-                    try
-                        click menu item "Paste" of menu "Edit" of menu bar 1
-                    end try
-                end try
-            end try
-        end tell
-        delay 1.2
-        key code 36
-        delay 0.6
-    end tell
-    '''
-    run_applescript(script)
+    call_applescript_handler('pasteImageAndSend', ingest, 0.6)
     return True
 
 
-def send_message_to_friend(message: str) -> bool:
-    """채팅방에서 메시지(+선택적 이미지 1장) 전송. 전송을 시도했으면 True, 채팅방을
-    열지 못해 전송 불가면 False.
+def send_message_to_friend(message: str, focus_pending: bool = False,
+                           image_path: Optional[str] = None) -> SendOutcome:
+    """채팅방에서 메시지(+선택적 이미지 1장) 전송. 전송을 시도했으면 참(reason 'sent', AX 입력이
+    실패해 붙여넣기로 보냈으면 'sent_clipboard'), 채팅방을 열지 못해 전송 불가면
+    거짓(reason 'chat_open_timeout')인 SendOutcome.
 
     텍스트: AX 입력 우선(실패 시 클립보드 붙여넣기 폴백).
-    이미지: 클립보드 복사 → 붙여넣기 → Enter.
+    이미지: 클립보드 복사 → 붙여넣기 → Enter. image_path는 이 대상자에게 보낼 첨부(대상자별 첨부
+    또는 공용 이미지 current_image_path, 없으면 None).
     이미지가 있으면 current_image_order('image_first'=사진 먼저 / 'text_first'=텍스트 먼저)
     순서로 보낸다. (기본: 사진 먼저)
+    focus_pending=True(융합 실행): 결과 리스트 포커스 이동을 채팅방 열기와 한 스크립트로 묶는다.
     """
     # 이미지 첨부 발송은 정상 모드에서만 안정적으로 검증됐다(패스트에선 즉시 AX 폴링·짧은
     # 대기가 렌더링 중인 카카오톡의 이미지 붙여넣기를 깨뜨림). 따라서 이미지가 있으면 이
     # '사람 처리 구간'은 패스트라도 정상 동작으로 수행한다. 패스트의 핵심 이득(대상 간/전송
     # 후 대기 제거)은 사람 사이에서 일어나므로 대량 속도는 그대로 유지된다.
-    per_send_fast = current_fast_mode and not current_image_path
+    per_send_fast = current_fast_mode and not image_path
 
     # 채팅방 열기(검색결과 선택 → Enter)는 신뢰성이 최우선이라 db/activate 대기는 항상 일반값.
     db = CHAT_DELAY_BEFORE_ENTER
     da = 0.3 if per_send_fast else CHAT_DELAY_AFTER_ENTER
 
-    # 채팅방 열기
-    open_script = f'''
-    tell application "KakaoTalk" to activate
-    delay 0.3
-    tell application "System Events"
-        tell process "KakaoTalk"
-            set frontmost to true
-        end tell
-        delay {db}
-        key code 36
-        delay {da}
-    end tell
-    '''
-
-    def _open_and_check() -> bool:
+    def _open_and_check(with_focus: bool = False) -> bool:
         """채팅방 열기 Enter → 입력창이 뜰 때까지 대기/확인. 떴으면 True."""
         with time_stage('open_chat'):
-            run_applescript(open_script)
+            if with_focus:
+                call_applescript_handler('focusAndOpenChat', SEARCH_RESULT_DOWN_ARROW_COUNT, db, da)
+            else:
+                call_applescript_handler('openChat', db, da)
         with time_stage('layout_wait'):
             if per_send_fast:
-                return _chat_input_ready(timeout=2.0)
-            time.sleep(0.8)  # 렌더링 대기
-            if current_image_path:
+                return _chat_input_ready(timeout=2.0, learn_stage='chat_input')
+            if image_path:
                 # 이미지 발송: 정상 모드에서 검증된 경로. 입력창 AX 폴링이 붙여넣기를
                 # 방해하는 정황이 있어, 추가 AX 접근 없이 고정 대기만으로 진행한다.
+                time.sleep(0.8)  # 렌더링 대기
                 return True
+            time.sleep(adaptive_delays.delay('chat_input'))  # 렌더링 대기(학습값)
             return _chat_input_ready(timeout=1.5)  # 일반 텍스트: 입력창 확인(안전망)
 
     # 채팅방이 안 열리는 경우(Enter 미반영 등)를 대비해 1회 재시도하고,
-    # 그래도 입력창이 안 뜨면 허공 전송을 막기 위해 전송하지 않고 False를 반환한다.
-    chat_ready = _open_and_check()
+    # 그래도 입력창이 안 뜨면 허공 전송을 막기 위해 전송하지 않고 실패를 반환한다.
+    t0 = time.perf_counter()
+    attempts = 1
+    chat_ready = _open_and_check(with_focus=focus_pending)
     if not chat_ready:
+        adaptive_delays.failed('chat_input')
         log("   -> ↻ 채팅방이 열리지 않아 다시 시도합니다...")
+        attempts = 2
         chat_ready = _open_and_check()
     if not chat_ready:
         log("   -> ⚠️ 채팅방을 열지 못해 이 대상은 전송하지 못했습니다. (입력창 미확인)")
-        return False
+        return SendOutcome(False, 'chat_open_timeout', 'layout_wait', attempts, time.perf_counter() - t0)
+
+    ax_fallback = False
 
     def _send_text(prefer_clipboard=False):
         # prefer_clipboard=True(이미지 동반)면 AX를 건너뛰고 클립보드(키보드 붙여넣기)로 보낸다.
         # AX로 텍스트를 보내면 입력창의 키보드 포커스(first responder)가 풀려, 곧이은 이미지
         # Cmd+V 붙여넣기가 입력창에 안 들어가 미리보기가 안 뜬다. 키보드 붙여넣기는 포커스를
         # 유지하므로 이미지 붙여넣기와 호환된다.
+        nonlocal ax_fallback
         with time_stage('ax_input_send'):
             # 1순위: AX 입력(이미지 없을 때만). 성공하면 종료.
-            if not prefer_clipboard and _ax_input_and_send(message):
-                return
+            if not prefer_clipboard:
+                if _ax_input_and_send(message):
+                    return
+                ax_fallback = True
             # 2순위(또는 이미지 동반 시 기본): 클립보드 붙여넣기 + Enter
             _reliable_copy(message)  # 붙여넣기 직전 복사 — Handoff 오염 최소화
-            paste_send_script = '''
-            tell application "System Events"
-                tell process "KakaoTalk"
-                    set frontmost to true
-                    try
-                        click menu item "붙여넣기" of menu "편집" of menu bar 1
-                    on error
-                        try
-                            click menu item "Paste" of menu "편집" of menu bar 1
-                        on error
-                            try
-                                click menu item "Paste" of menu "Edit" of menu bar 1
-                            end try
-                        end try
-                    end try
-                end tell
-                delay 0.5
-                key code 36
-                delay 0.5
-            end tell
-            '''
-            run_applescript(paste_send_script)
+            call_applescript_handler('pasteAndSend', 0.5, 0.5)
 
     def _send_image():
         # 주의: 붙여넣기→Enter는 전송 트리거이며, 텍스트처럼 '전송 완료'를 확인하지는 못한다.
         # 여기서 False는 '클립보드 준비 실패'(파일 없음/형식 불가/pyobjc 부재)를 의미한다.
         with time_stage('image_send'):
-            if not _send_image_via_clipboard(current_image_path):
+            if not _send_image_via_clipboard(image_path):
                 log("   -> ⚠️ 이미지를 클립보드에 준비하지 못해 이미지를 건너뜁니다(텍스트만 전송). 파일/형식을 확인하세요.")
 
     # 텍스트(+이미지)를 순서대로 전송. 이미지가 있으면 current_image_order를 따른다.
     # 두 전송 사이엔 앞 전송이 반영될 짧은 정착 간격을 둔다(연속 전송 시 두 번째가 누락되는 것 방지).
-    if current_image_path:
+    if image_path:
         # 이미지 동반 시 텍스트도 클립보드(키보드) 방식 → 입력창 포커스 유지로 이미지 붙여넣기 호환
         if current_image_order == 'text_first':
             _send_text(prefer_clipboard=True)
@@ -1151,73 +3591,43 @@ def send_message_to_friend(message: str) -> bool:
         _send_text()
 
     # 채팅방 닫기 (Esc 2회) — AX/키 입력 경로 공통.
-    # 패스트 모드는 직후 reset_search(Esc 3회 + Cmd+1)가 모든 레이어를 닫으므로 생략(중복 제거).
-    if not current_fast_mode:
-        close_script = '''
-        tell application "System Events"
-            tell process "KakaoTalk"
-                set frontmost to true
-                key code 53
-                delay 0.4
-                key code 53
-                delay 0.3
-            end tell
-        end tell
-        '''
+    # 패스트 모드·융합 실행은 직후 reset_search(Esc 3회 + Cmd+1)가 모든 레이어를 닫으므로 생략(중복 제거).
+    if not current_fast_mode and not _fused_plain_text(image_path):
         with time_stage('close_chat'):
-            run_applescript(close_script)
+            call_applescript_handler('closeChat', 0, 0.4, 0.3)
 
-    return True
+    return SendOutcome(True, 'sent_clipboard' if ax_fallback else 'sent', 'send_total',
+                       attempts, time.perf_counter() - t0)
 
 
-def open_chat_then_close(wait_seconds: float = 1.0):
+def open_chat_then_close(wait_seconds: float = 1.0, focus_pending: bool = False):
     """[모의 전송용] 선택된 검색 결과의 채팅방을 열고, 잠시 후 닫는다.
 
     메시지 붙여넣기/전송은 하지 않는다. 채팅방 진입·복귀 흐름만 실전과 동일하게 검증한다.
+    focus_pending=True면 결과 리스트 포커스 이동을 채팅방 열기와 함께 한다(융합 실행).
     """
     # 채팅방 열기 신뢰성을 위해 db/activate 대기는 일반값 유지(send_message_to_friend와 동일).
     db = CHAT_DELAY_BEFORE_ENTER
     da = fast_delay(CHAT_DELAY_AFTER_ENTER, 0.3)
 
     # 채팅방 열기 (Enter)
-    open_script = f'''
-    tell application "KakaoTalk" to activate
-    delay 0.3
-    tell application "System Events"
-        tell process "KakaoTalk"
-            set frontmost to true
-        end tell
-        delay {db}
-        key code 36
-        delay {da}
-    end tell
-    '''
-    run_applescript(open_script)
+    if focus_pending:
+        call_applescript_handler('focusAndOpenChat', SEARCH_RESULT_DOWN_ARROW_COUNT, db, da)
+    else:
+        call_applescript_handler('openChat', db, da)
 
-    # 채팅방 레이아웃 전환 대기 (실전과 동일). 패스트는 입력창 등장 폴링으로 대체.
+    # 채팅방 레이아웃 전환 대기 (실전과 동일). 패스트는 입력창 등장 대기로 대체.
     if current_fast_mode:
-        _ax_wait_for_message_input(timeout=1.5)
+        _ax_wait_for_message_input(timeout=1.5, learn_stage='chat_input')
     else:
-        time.sleep(0.8)
+        time.sleep(adaptive_delays.delay('chat_input'))
 
     # 채팅방을 연 상태로 잠시 유지 (중단 요청은 즉시 반영). 패스트 모드는 짧게.
     hold = fast_delay(wait_seconds, 0.2)
     safe_sleep((hold, hold))
 
     # 채팅방 닫기 (Esc 2회) — 모드별 delay
-    close_script = f'''
-    tell application "System Events"
-        tell process "KakaoTalk"
-            set frontmost to true
-        end tell
-        delay {fast_delay(0.2, 0.1)}
-        key code 53
-        delay {fast_delay(0.3, 0.1)}
-        key code 53
-        delay {fast_delay(0.3, 0.1)}
-    end tell
-    '''
-    run_applescript(close_script)
+    call_applescript_handler('closeChat', fast_delay(0.2, 0.1), fast_delay(0.3, 0.1), fast_delay(0.3, 0.1))
 
 # ============================================================
 # HTML 템플릿
@@ -1456,6 +3866,12 @@ HTML_TEMPLATE = '''
             color: #8d6e63;
             font-size: 12px;
         }
+        .audit-download {
+            display: inline-block;
+            margin-left: 10px;
+            font-size: 13px;
+            color: #1c4e80;
+        }
         .image-section {
             background: #eef6ff;
             border: 1px solid #bcdcff;
@@ -1519,6 +3935,21 @@ HTML_TEMPLATE = '''
             gap: 5px;
             cursor: pointer;
         }
+        .attach-dir {
+            margin-top: 12px;
+            font-size: 12px;
+            color: #5a82a8;
+        }
+        .attach-dir input {
+            width: 100%;
+            box-sizing: border-box;
+            margin-top: 5px;
+            padding: 6px 8px;
+            border: 1px solid #c5d8ee;
+            border-radius: 8px;
+            font-size: 13px;
+            color: #1c4e80;
+        }
         .fastmode-section {
             background: #fdecec;
             border: 1px solid #f5b7b7;
@@ -1569,6 +4000,22 @@ HTML_TEMPLATE = '''
             background: #ccc;
             cursor: not-allowed;
         }
+        .btn-resume {
+            background: #fff;
+            color: #3C1E1E;
+            border: 2px solid #FEE500;
+            font-size: 15px;
+            padding: 12px;
+            margin-top: 8px;
+        }
+        .btn-resume:hover:not(:disabled) {
+            background: #FFF9C4;
+        }
+        .btn-resume:disabled {
+            color: #aaa;
+            border-color: #ddd;
+            cursor: not-allowed;
+        }
         .btn-stop {
             background: #dc3545;
             color: white;
@@ -1581,6 +4028,78 @@ HTML_TEMPLATE = '''
             background: #e4606d;
             cursor: not-allowed;
         }
+        .live-panel {
+            margin-top: 20px;
+            border: 1px solid #eee;
+            border-radius: 12px;
+            padding: 12px 16px;
+        }
+        .live-stats {
+            display: grid;
+            grid-template-columns: repeat(4, 1fr);
+            gap: 8px;
+            text-align: center;
+        }
+        .live-label {
+            display: block;
+            font-size: 11px;
+            color: #888;
+        }
+        .live-value {
+            font-size: 18px;
+            font-weight: bold;
+            color: #3C1E1E;
+        }
+        .live-value.bad {
+            color: #dc3545;
+        }
+        .live-sparks {
+            display: grid;
+            grid-template-columns: repeat(2, 1fr);
+            gap: 4px 16px;
+            margin-top: 10px;
+            font-size: 11px;
+            color: #666;
+            font-family: 'Menlo', 'Monaco', monospace;
+        }
+        .live-spark {
+            display: flex;
+            align-items: center;
+            gap: 6px;
+        }
+        .live-spark svg {
+            flex: 1;
+            height: 20px;
+        }
+        .timing-panel {
+            margin-top: 20px;
+            border: 1px solid #eee;
+            border-radius: 12px;
+            padding: 12px 16px;
+            font-size: 12px;
+        }
+        .timing-panel summary {
+            cursor: pointer;
+            font-weight: bold;
+            color: #555;
+        }
+        .timing-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 8px;
+            font-family: 'Menlo', 'Monaco', monospace;
+        }
+        .timing-table th, .timing-table td {
+            text-align: right;
+            padding: 2px 6px;
+        }
+        .timing-table th:first-child, .timing-table td:first-child {
+            text-align: left;
+        }
+        .timing-table tr.total td {
+            font-weight: bold;
+            border-top: 1px solid #ddd;
+        }
         .log-wrapper {
             position: relative;
             margin-top: 25px;
@@ -1820,6 +4339,10 @@ HTML_TEMPLATE = '''
                     <label class="image-order-opt"><input type="radio" name="imageOrder" value="image_first" checked> 사진 먼저</label>
                     <label class="image-order-opt"><input type="radio" name="imageOrder" value="text_first"> 텍스트 먼저</label>
                 </div>
+                <div class="attach-dir">
+                    명단에 <b>첨부파일</b> 열이 있으면 그 사람에게는 적힌 파일(사진 또는 PDF)을 대신 보냅니다. 상대 경로의 기준 폴더:
+                    <input type="text" id="attachmentDir" placeholder="{{ attachment_dir }}">
+                </div>
             </div>
 
             <!-- 모의 전송(dry-run) 옵션 -->
@@ -1830,6 +4353,12 @@ HTML_TEMPLATE = '''
                         <span class="dryrun-desc">친구 검색·검증까지만 수행하고 <b>실제 메시지는 보내지 않습니다.</b> 대량 테스트용으로 안전합니다.</span>
                     </span>
                 </label>
+                <label class="dryrun-label" style="margin-top: 10px;">
+                    <input type="checkbox" id="auditCheck">
+                    <span>🔍 검증만 모드<br>
+                        <span class="dryrun-desc">채팅방을 <b>열지 않고</b> 친구 검색·검증만 최고 속도로 수행해, 대상자별 결과(일치한 표시 이름·일치 방법·후보·소요시간)를 CSV로 남깁니다. 명단 점검용.</span>
+                    </span>
+                </label>
             </div>
 
             <!-- 패스트 모드 옵션 -->
@@ -1844,6 +4373,7 @@ HTML_TEMPLATE = '''
             </div>
 
             <span class="status-badge status-idle" id="statusBadge">대기 중</span>
+            <a class="audit-download" id="auditDownload" href="/audit_report" style="display:none;">📥 검증 결과 내려받기 (CSV)</a>
 
             <div class="perm-panel" id="permPanel" style="display:none;">
                 <div class="perm-title">⚠️ 접근성(손쉬운 사용) 권한이 필요합니다</div>
@@ -1860,12 +4390,34 @@ HTML_TEMPLATE = '''
             <button class="btn btn-start" id="startBtn" disabled onclick="startSending()">
                 🚀 카카오톡 전송 시작
             </button>
+            <button class="btn btn-resume" id="resumeRunBtn" disabled onclick="startSending(true)"
+                    title="같은 명단으로 중단된 지난 실제 전송을, 지난 설정 그대로 이미 보낸 사람만 빼고 이어서 보냅니다.">
+                ↩ 중단된 전송 이어서 보내기
+            </button>
             <button class="btn btn-pause" id="pauseBtn" style="display:none;" onclick="togglePause()">
                 ⏸ 일시정지
             </button>
             <button class="btn btn-stop" id="stopBtn" style="display:none;" onclick="stopSending()">
                 ⏹ 전송 중단
             </button>
+
+            <div class="live-panel" id="livePanel" style="display:none;">
+                <div class="live-stats">
+                    <div><span class="live-label">진행</span><span class="live-value" id="liveProgress">-</span></div>
+                    <div><span class="live-label">분당 인원</span><span class="live-value" id="liveRate">-</span></div>
+                    <div><span class="live-label">남은 시간</span><span class="live-value" id="liveEta">-</span></div>
+                    <div><span class="live-label">실패율</span><span class="live-value" id="liveFail">-</span></div>
+                </div>
+                <div class="live-sparks" id="liveSparks"></div>
+            </div>
+
+            <details class="timing-panel" id="timingPanel" style="display:none;">
+                <summary>⏱ 단계별 소요시간 (실시간, 초)</summary>
+                <table class="timing-table">
+                    <thead><tr><th>단계</th><th>n</th><th>평균</th><th>p50</th><th>p90</th><th>p99</th><th>최대</th></tr></thead>
+                    <tbody id="timingRows"></tbody>
+                </table>
+            </details>
             
             <div class="log-wrapper">
                 <button class="log-copy-btn" onclick="copyLog()" title="로그 복사">📋 복사</button>
@@ -1882,6 +4434,7 @@ HTML_TEMPLATE = '''
         let eventSource = null;
         let isPaused = false;
         let axPollTimer = null;
+        let pendingResume = false;  // 권한 대기 후 시작할 때도 이어보내기 여부 유지
         let hasImage = false;
         
         function toggleFilter(btn) {
@@ -1943,6 +4496,7 @@ HTML_TEMPLATE = '''
                 document.getElementById('fileName').textContent = '✅ ' + selectedFile.name;
                 document.getElementById('uploadArea').classList.add('has-file');
                 document.getElementById('startBtn').disabled = false;
+                document.getElementById('resumeRunBtn').disabled = false;
                 addLog('파일 선택됨: ' + selectedFile.name, 'info');
             }
         }
@@ -1956,28 +4510,33 @@ HTML_TEMPLATE = '''
             logArea.scrollTop = logArea.scrollHeight;
         }
         
-        function startSending() {
+        function startSending(resume = false) {
             if (!selectedFile) return;
+            pendingResume = resume;
 
-            const registerTypes = getSelectedValues('registerTypeButtons');
-            const ageGroups = getSelectedValues('ageGroupButtons');
-            const messageText = document.getElementById('messageText').value;
+            // 이어보내기는 지난 실행의 설정(필터·메시지·이미지)을 서버 기록에서 그대로 복원한다.
+            if (!resume) {
+                const registerTypes = getSelectedValues('registerTypeButtons');
+                const ageGroups = getSelectedValues('ageGroupButtons');
+                const messageText = document.getElementById('messageText').value;
 
-            if (registerTypes.length === 0) {
-                alert('등록형태를 최소 1개 이상 선택해주세요.');
-                return;
-            }
-            if (ageGroups.length === 0) {
-                alert('연령대를 최소 1개 이상 선택해주세요.');
-                return;
-            }
-            if (!messageText.trim()) {
-                alert('발송 메시지를 입력해주세요.');
-                return;
+                if (registerTypes.length === 0) {
+                    alert('등록형태를 최소 1개 이상 선택해주세요.');
+                    return;
+                }
+                if (ageGroups.length === 0) {
+                    alert('연령대를 최소 1개 이상 선택해주세요.');
+                    return;
+                }
+                if (!messageText.trim()) {
+                    alert('발송 메시지를 입력해주세요.');
+                    return;
+                }
             }
 
             // 사전 점검: 접근성 권한이 없으면 시작 자체를 막고 안내 패널을 띄운다.
             document.getElementById('startBtn').disabled = true;
+            document.getElementById('resumeRunBtn').disabled = true;
             fetch('/ax_status')
                 .then(r => r.json())
                 .then(s => {
@@ -2000,11 +4559,13 @@ HTML_TEMPLATE = '''
             const messageText = document.getElementById('messageText').value;
             const dryRun = document.getElementById('dryRunCheck').checked;
             const fastMode = document.getElementById('fastModeCheck').checked;
+            const audit = !pendingResume && document.getElementById('auditCheck').checked;
 
             const formData = new FormData();
             formData.append('file', selectedFile);
 
             document.getElementById('startBtn').style.display = 'none';
+            document.getElementById('resumeRunBtn').style.display = 'none';
             document.getElementById('pauseBtn').style.display = 'block';
             document.getElementById('pauseBtn').disabled = false;
             document.getElementById('pauseBtn').textContent = '⏸ 일시정지';
@@ -2013,8 +4574,12 @@ HTML_TEMPLATE = '''
             document.getElementById('stopBtn').disabled = false;
             document.getElementById('stopBtn').textContent = '⏹ 전송 중단';
             document.getElementById('statusBadge').className = 'status-badge status-running';
-            document.getElementById('statusBadge').textContent = '전송 중...';
+            document.getElementById('statusBadge').textContent = audit ? '검증 중...' : '전송 중...';
+            document.getElementById('auditDownload').style.display = 'none';
             setImageControlsEnabled(false);  // 전송 중 이미지 교체 방지(서버도 차단)
+            document.getElementById('timingRows').innerHTML = '';
+            document.getElementById('timingPanel').style.display = 'none';
+            document.getElementById('livePanel').style.display = 'none';
 
             // 파일 업로드
             fetch('/upload', {
@@ -2024,12 +4589,12 @@ HTML_TEMPLATE = '''
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    addLog('🚀 작업을 시작합니다...', 'info');
+                    addLog(pendingResume ? '↩ 중단된 전송을 이어서 시작합니다...' : '🚀 작업을 시작합니다...', 'info');
                     // 로그 스트림을 연결하고, 연결이 '열린 뒤'(onopen)에 전송을 시작한다.
                     // 서버는 브로드캐스트만 하고 버퍼링하지 않으므로, 구독자 등록 전에 전송을
                     // 시작하면 백엔드의 초기 로그(모의전송·패스트 모드 안내 등)가 유실된다.
                     startLogStream(function() {
-                    fetch('/start', {
+                    fetch(pendingResume ? '/resume_run' : '/start', {
                         method: 'POST',
                         headers: { 'Content-Type': 'application/json' },
                         body: JSON.stringify({
@@ -2037,9 +4602,11 @@ HTML_TEMPLATE = '''
                             age_groups: ageGroups,
                             message_template: messageText,
                             dry_run: dryRun,
+                            audit: audit,
                             fast_mode: fastMode,
                             attach_image: hasImage,
-                            image_order: getImageOrder()
+                            image_order: getImageOrder(),
+                            attachment_dir: document.getElementById("attachmentDir").value.trim()
                         })
                     })
                     .then(r => r.json())
@@ -2085,6 +4652,7 @@ HTML_TEMPLATE = '''
             stopAxPolling();
             document.getElementById('permPanel').style.display = 'none';
             document.getElementById('startBtn').disabled = false;
+            document.getElementById('resumeRunBtn').disabled = !selectedFile;
             document.getElementById('statusBadge').className = 'status-badge status-idle';
             document.getElementById('statusBadge').textContent = '대기 중';
         }
@@ -2172,7 +4740,12 @@ HTML_TEMPLATE = '''
                 .then(d => {
                     if (d.success) {
                         hasImage = true;
-                        document.getElementById('imageName').textContent = '📷 ' + (d.filename || file.name);
+                        let label = '📷 ' + (d.filename || file.name);
+                        if (d.prepared) {
+                            label += ' (' + d.prepared.width + '×' + d.prepared.height + ', ' +
+                                     Math.round(d.prepared.bytes / 1024) + 'KB로 준비됨)';
+                        }
+                        document.getElementById('imageName').textContent = label;
                         document.getElementById('imageInfo').style.display = 'flex';
                         document.getElementById('imageOrderRow').style.display = 'flex';
                     } else {
@@ -2207,7 +4780,87 @@ HTML_TEMPLATE = '''
                 setTimeout(() => { btn.textContent = orig; }, 1500);
             });
         }
-        
+        
+        function formatPreflight(report) {
+            // 사전 점검 보고서 → 알림 문구 (항목별 개수 + 앞부분 목록)
+            const labels = {
+                duplicates: '동명이인',
+                canonical_collisions: '표기만 다른 같은 이름',
+                emoji_only: '이모티콘/기호만인 이름',
+                substring_risk: '부분 일치 혼동 위험(경고)',
+                short_names: '너무 짧은 이름(경고)'
+            };
+            const lines = ['사전 점검에서 문제가 발견되어 전송하지 않았습니다. (대상 ' + report.total + '명)'];
+            const sections = Object.assign({}, report.errors, report.warnings);
+            Object.keys(labels).forEach(function(key) {
+                const items = sections[key] || [];
+                if (!items.length) return;
+                const shown = items.slice(0, 10).map(function(v) {
+                    return Array.isArray(v) ? v.join(key === 'substring_risk' ? ' ⊂ ' : ' = ') : v;
+                });
+                const more = report.counts[key] - shown.length;
+                lines.push('\\n' + labels[key] + ' (' + report.counts[key] + '건)\\n• ' + shown.join('\\n• ') +
+                           (more > 0 ? '\\n… 외 ' + more + '건' : ''));
+            });
+            return lines.join('\\n');
+        }
+
+        function formatDuration(sec) {
+            sec = Math.round(sec);
+            const m = Math.floor(sec / 60), s = sec % 60;
+            return m >= 60 ? Math.floor(m / 60) + '시간 ' + (m % 60) + '분' : m + '분 ' + String(s).padStart(2, '0') + '초';
+        }
+
+        function sparkSvg(values) {
+            const w = 100, h = 20;
+            const max = Math.max(...values, 0.001);
+            const step = values.length > 1 ? w / (values.length - 1) : 0;
+            const points = values.map((v, i) => (i * step).toFixed(1) + ',' + (h - 1 - (v / max) * (h - 2)).toFixed(1)).join(' ');
+            return '<svg viewBox="0 0 ' + w + ' ' + h + '" preserveAspectRatio="none">' +
+                   '<polyline fill="none" stroke="#f5a623" stroke-width="1.5" points="' + points + '"/></svg>';
+        }
+
+        function renderMetrics(m) {
+            document.getElementById('liveProgress').textContent = m.processed + '/' + m.total;
+            document.getElementById('liveRate').textContent = m.per_minute ? m.per_minute.toFixed(1) + '명' : '계산 중';
+            document.getElementById('liveEta').textContent = m.processed >= m.total ? '완료'
+                : (m.eta_seconds != null ? formatDuration(m.eta_seconds) : '계산 중');
+            const fail = document.getElementById('liveFail');
+            fail.textContent = (m.failure_rate * 100).toFixed(1) + '% (' + m.failed + ')';
+            fail.className = 'live-value' + (m.failed ? ' bad' : '');
+            const sparks = document.getElementById('liveSparks');
+            sparks.innerHTML = '';
+            Object.keys(m.spark).forEach(stage => {
+                const values = m.spark[stage];
+                if (!values.length) return;
+                const row = document.createElement('div');
+                row.className = 'live-spark';
+                const label = stage === 'person_total' ? '1인당' : stage;
+                row.innerHTML = '<span>' + label + '</span>' + sparkSvg(values) +
+                                '<span>' + values[values.length - 1].toFixed(2) + 's</span>';
+                sparks.appendChild(row);
+            });
+            document.getElementById('livePanel').style.display = 'block';
+        }
+
+        function renderTiming(stages) {
+            const rows = document.getElementById('timingRows');
+            rows.innerHTML = '';
+            Object.keys(stages).forEach(stage => {
+                const st = stages[stage];
+                const tr = document.createElement('tr');
+                if (stage === 'person_total') tr.className = 'total';
+                const label = stage === 'person_total' ? '1인당 합계' : stage;
+                [label, st.n, st.avg, st.p50, st.p90, st.p99, st.max].forEach((v, i) => {
+                    const td = document.createElement('td');
+                    td.textContent = i < 2 ? v : v.toFixed(2);
+                    tr.appendChild(td);
+                });
+                rows.appendChild(tr);
+            });
+            document.getElementById('timingPanel').style.display = 'block';
+        }
+
         function startLogStream(onReady) {
             if (eventSource) {
                 eventSource.close();
@@ -2235,6 +4888,10 @@ HTML_TEMPLATE = '''
                     else if (data.message.includes('▶️')) logType = 'info';
                     
                     addLog(data.message, logType);
+                } else if (data.type === 'metrics') {
+                    renderMetrics(data);
+                } else if (data.type === 'timing') {
+                    renderTiming(data.stages);
                 } else if (data.type === 'paused') {
                     document.getElementById('pauseBtn').textContent = '▶️ 재개';
                     document.getElementById('pauseBtn').disabled = false;
@@ -2243,11 +4900,23 @@ HTML_TEMPLATE = '''
                 } else if (data.type === 'complete') {
                     eventSource.close();
                     resetUI();
-                    if (data.stopped) {
+                    if (data.audit) {
+                        document.getElementById('auditDownload').style.display = 'inline-block';
+                    }
+                    if (data.preflight && !data.preflight.ok) {
+                        alert(formatPreflight(data.preflight));
+                    } else if (data.audit) {
+                        alert((data.stopped ? '검증이 중단되었습니다.' : '검증 완료!') + '\\n\\n' +
+                              Object.entries(data.audit).map(([k, v]) => k + ' ' + v + '명').join(' · ') +
+                              '\\n\\n대상자별 결과는 "검증 결과 내려받기"로 받을 수 있습니다.');
+                    } else if (data.stopped) {
                         alert('전송이 중단되었습니다.\\n\\n성공: ' + data.success + '/' + data.total);
                     } else if (data.failed_names && data.failed_names.length > 0) {
+                        const failed = data.failed_details
+                            ? data.failed_details.map(f => f.name + ' — ' + f.label)
+                            : data.failed_names;
                         alert('완료!\\n\\n성공: ' + data.success + '/' + data.total + 
-                              '\\n\\n실패한 대상자:\\n• ' + data.failed_names.join('\\n• '));
+                              '\\n\\n실패한 대상자:\\n• ' + failed.join('\\n• '));
                     } else {
                         alert('완료! 모두 성공했습니다. (' + data.success + '/' + data.total + ')');
                     }
@@ -2263,6 +4932,8 @@ HTML_TEMPLATE = '''
         function resetUI() {
             document.getElementById('startBtn').style.display = 'block';
             document.getElementById('startBtn').disabled = false;
+            document.getElementById('resumeRunBtn').style.display = 'block';
+            document.getElementById('resumeRunBtn').disabled = !selectedFile;
             document.getElementById('pauseBtn').style.display = 'none';
             document.getElementById('stopBtn').style.display = 'none';
             document.getElementById('statusBadge').className = 'status-badge status-idle';
@@ -2295,6 +4966,7 @@ def index():
         default_register_types=DEFAULT_REGISTER_TYPES,
         default_age_groups=DEFAULT_AGE_GROUPS,
         default_message=DEFAULT_MESSAGE_TEMPLATE,
+        attachment_dir=ATTACHMENT_DIR,
         version=VERSION
     )
 
@@ -2385,8 +5057,15 @@ def upload_image():
         # 직전 이미지가 다른 경로(다른 확장자)면 정리 후 교체 — 임시파일 누적 방지
         if current_image_path and current_image_path != path:
             _remove_temp_image(current_image_path)
+            attachment_cache.discard(current_image_path)
         current_image_path = path
-        return jsonify({'success': True, 'filename': f.filename})
+        # 전송용으로 한 번 준비(축소·재인코딩)해 메모리에 둔다. 못 하면 전송 때 원본을 쓴다.
+        prepared = attachment_cache.get(path)
+        info = None
+        if prepared is not None:
+            info = {'width': prepared.width, 'height': prepared.height, 'bytes': prepared.size,
+                    'source_bytes': prepared.source_size, 'seconds': round(prepared.seconds, 3)}
+        return jsonify({'success': True, 'filename': f.filename, 'prepared': info})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
@@ -2398,6 +5077,7 @@ def clear_image():
     if is_running:
         return jsonify({'success': False, 'error': '전송 중에는 이미지를 변경할 수 없습니다.'})
     _remove_temp_image(current_image_path)
+    attachment_cache.discard(current_image_path)
     current_image_path = None
     return jsonify({'success': True})
 
@@ -2418,13 +5098,20 @@ def ax_request_permission():
 def start_sending():
     global is_running, stop_requested
     global current_register_types, current_age_groups, current_message_template, current_dry_run
-    global current_fast_mode, current_image_path, current_image_order
+    global current_fast_mode, current_image_path, current_image_order, current_resume, current_audit_mode
+    global current_attachment_dir
 
     if is_running:
         return jsonify({'success': False, 'error': '이미 실행 중입니다'})
 
+    data = request.get_json() or {}
+    audit_mode = bool(data.get('audit', False))
+    if audit_mode and current_coordinator is not None:
+        return jsonify({'success': False, 'error': '검증만 모드는 코디네이터가 아닌 맥에서 실행하세요'})
+
     # 사전 점검(preflight): 접근성 권한이 없으면 한 명도 보낼 수 없으므로 시작 자체를 차단한다.
-    perm = get_ax_permission_state()
+    # (코디네이터는 직접 보내지 않으므로 권한이 필요 없다)
+    perm = get_ax_permission_state() if current_coordinator is None else {'state': 'ok'}
     if perm['state'] != 'ok':
         return jsonify({
             'success': False,
@@ -2433,16 +5120,19 @@ def start_sending():
             'can_prompt': perm.get('can_prompt', False),
         })
 
-    data = request.get_json() or {}
     current_register_types = data.get('register_types', DEFAULT_REGISTER_TYPES)
     current_age_groups = data.get('age_groups', DEFAULT_AGE_GROUPS)
     current_message_template = data.get('message_template', DEFAULT_MESSAGE_TEMPLATE)
     current_dry_run = bool(data.get('dry_run', False))
-    current_fast_mode = bool(data.get('fast_mode', False))
+    # 검증만 모드는 아무것도 보내지 않으므로 스팸 위험 없이 패스트 모드 대기(폴링)로 돈다.
+    current_audit_mode = audit_mode
+    current_fast_mode = bool(data.get('fast_mode', False)) or audit_mode
     # 이미지 첨부: 순서 옵션 반영. attach_image=False면 이전 실행의 stale 이미지를 해제한다.
     current_image_order = 'text_first' if data.get('image_order') == 'text_first' else 'image_first'
     if not data.get('attach_image'):
         current_image_path = None
+    current_attachment_dir = os.path.expanduser(str(data.get('attachment_dir') or '').strip()) or None
+    current_resume = None
 
     is_running = True
     stop_requested = False
@@ -2454,6 +5144,137 @@ def start_sending():
     return jsonify({'success': True})
 
 
+@app.route('/resume_run', methods=['POST'])
+def resume_run():
+    """중단된 실제 전송 이어보내기: 업로드한 명단(내용 해시)의 최근 전송 기록을 찾아
+    그 실행의 설정을 그대로 복원하고, 이미 보낸 대상자를 빼고 다시 시작한다."""
+    global is_running, stop_requested
+    global current_register_types, current_age_groups, current_message_template, current_dry_run
+    global current_fast_mode, current_image_path, current_image_order, current_resume, current_audit_mode
+    global current_attachment_dir
+
+    if is_running:
+        return jsonify({'success': False, 'error': '이미 실행 중입니다'})
+
+    perm = get_ax_permission_state() if current_coordinator is None else {'state': 'ok'}
+    if perm['state'] != 'ok':
+        return jsonify({
+            'success': False,
+            'error_code': perm['state'],
+            'error': perm['message'],
+            'can_prompt': perm.get('can_prompt', False),
+        })
+
+    if not current_file_path or not os.path.exists(current_file_path):
+        return jsonify({'success': False, 'error': '명단 파일을 먼저 업로드하세요'})
+    found = find_resumable_run(_file_sha256(current_file_path))
+    if found is None:
+        return jsonify({'success': False, 'error': '이 명단으로 이어서 보낼 이전 전송 기록이 없습니다'})
+    meta, states = found
+    image_path = meta.get('image_path')
+    if image_path and not os.path.exists(image_path):
+        return jsonify({'success': False, 'error': '이전 전송의 첨부 이미지가 없어 이어보낼 수 없습니다. 새로 전송을 시작하세요'})
+
+    current_register_types = meta.get('register_types', DEFAULT_REGISTER_TYPES)
+    current_age_groups = meta.get('age_groups', DEFAULT_AGE_GROUPS)
+    current_message_template = meta.get('message_template', DEFAULT_MESSAGE_TEMPLATE)
+    current_fast_mode = bool(meta.get('fast_mode', False))
+    current_image_path = image_path
+    current_image_order = meta.get('image_order', 'image_first')
+    current_attachment_dir = meta.get('attachment_dir')
+    current_dry_run = False
+    current_audit_mode = False
+    current_resume = {'chain': meta.get('chain'), 'states': states}
+
+    is_running = True
+    stop_requested = False
+    pause_event.set()
+    thread = threading.Thread(target=run_sending_logic, daemon=True)
+    thread.start()
+
+    return jsonify({'success': True})
+
+
+@app.route('/audit_report')
+def audit_report():
+    """마지막 검증만 모드 실행의 대상자별 결과 CSV 내려받기."""
+    if not last_audit_report or not os.path.exists(last_audit_report):
+        return jsonify({'success': False, 'error': '내려받을 검증 결과가 없습니다'}), 404
+    return send_file(last_audit_report, mimetype='text/csv', as_attachment=True,
+                     download_name=os.path.basename(last_audit_report))
+
+
+def _work_request_error():
+    """분산 전송 API 요청 검사: 코디네이터 모드가 아니거나 토큰이 틀리면 (응답, 상태코드)."""
+    if current_coordinator is None:
+        return jsonify({'success': False, 'error': '코디네이터 모드가 아닙니다'}), 404
+    if work_token and not hmac.compare_digest(request.headers.get(WORK_TOKEN_HEADER, ''), work_token):
+        return jsonify({'success': False, 'error': '워커 토큰이 올바르지 않습니다'}), 403
+    return None
+
+
+@app.route('/work/lease', methods=['POST'])
+def work_lease():
+    error = _work_request_error()
+    if error:
+        return error
+    data = request.get_json() or {}
+    max_jobs = max(1, min(int(data.get('max_jobs', 1)), 10))
+    return jsonify(current_coordinator.lease(str(data.get('worker_id', request.remote_addr)), max_jobs))
+
+
+@app.route('/work/heartbeat', methods=['POST'])
+def work_heartbeat():
+    error = _work_request_error()
+    if error:
+        return error
+    data = request.get_json() or {}
+    return jsonify(current_coordinator.heartbeat(str(data.get('worker_id', request.remote_addr)),
+                                                 data.get('lease_ids') or []))
+
+
+@app.route('/work/release', methods=['POST'])
+def work_release():
+    error = _work_request_error()
+    if error:
+        return error
+    data = request.get_json() or {}
+    return jsonify(current_coordinator.release(str(data.get('worker_id', request.remote_addr)),
+                                               [str(x) for x in data.get('lease_ids') or []]))
+
+
+@app.route('/work/begin', methods=['POST'])
+def work_begin():
+    error = _work_request_error()
+    if error:
+        return error
+    data = request.get_json() or {}
+    return jsonify(current_coordinator.begin(str(data.get('worker_id', request.remote_addr)),
+                                             str(data.get('lease_id', ''))))
+
+
+@app.route('/work/result', methods=['POST'])
+def work_result():
+    error = _work_request_error()
+    if error:
+        return error
+    data = request.get_json() or {}
+    return jsonify(current_coordinator.result(str(data.get('worker_id', request.remote_addr)),
+                                              str(data.get('lease_id', '')), bool(data.get('sent_ok')),
+                                              data.get('outcome')))
+
+
+@app.route('/work/image')
+def work_image():
+    error = _work_request_error()
+    if error:
+        return error
+    path = current_coordinator.fetch_image(request.args.get('run_id', ''))
+    if not path or not os.path.exists(path):
+        return jsonify({'success': False, 'error': '첨부 이미지가 없습니다'}), 404
+    return send_file(path)
+
+
 @app.route('/stop', methods=['POST'])
 def stop_sending():
     global stop_requested
@@ -2477,6 +5298,12 @@ def resume_sending():
     return jsonify({'success': True})
 
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus 수집용 지표 (텍스트 형식)."""
+    return Response(sender_stats.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/logs')
 def stream_logs():
     # 연결마다 독립 큐를 만들어 구독자로 등록. 연결이 끊기면 해제한다.
@@ -2514,7 +5341,9 @@ def log(msg):
 def reset_search(silent=False) -> bool:
     """Esc·친구목록 복귀로 다음 검색을 준비. (AppleScript Esc+Cmd+1이 복귀를 수행하며,
     AX 전송엔 창 ID가 불필요하므로 Quartz 창 확인은 하지 않는다.)"""
-    run_applescript(_reset_search_script())
+    call_applescript_handler(
+        'resetSearch', fast_delay(0.3, 0.15), fast_delay(0.2, 0.1), fast_delay(0.3, 0.1), fast_delay(0.5, 0.2),
+    )
     time.sleep(fast_delay(0.3, 0.1))
     return True
 
@@ -2549,99 +5378,140 @@ def safe_sleep(duration_range, show_log=False):
         check_stop_requested()
 
 
-def send_message(name: str, message: str, dry_run: bool = False) -> bool:
-    """카카오톡 메시지 전송 (접근성(AX) 검증).
+def search_and_verify_friend(name: str, forms: NameForms, primed: bool = False, move_focus: bool = True) -> tuple:
+    """친구 검색 + AX 검증 → (VerifyResult, 시도 횟수). 채팅방은 열지 않는다.
+
+    검색 화면이 안 떴거나 타이밍 문제일 수 있어 MAX_SEARCH_ATTEMPTS회까지 시도한다.
+    이모티콘 포함 이름은 검색은 '텍스트만'으로(필터 신뢰성↑), 검증은 이모티콘까지 포함한
+    정규화 정확 일치(AX)로 한다. 실패면 마지막 시도의 사유(검색어 입력부터 확인되지 않았으면
+    'search_input_failed').
+    """
+    result = VerifyResult(False, 'not_found')
+    for attempt in range(MAX_SEARCH_ATTEMPTS):
+        check_stop_requested()
+        suffix = f" (재시도 {attempt}/{MAX_SEARCH_ATTEMPTS - 1})" if attempt else ""
+        log(f"   -> 📋 검색 중...{suffix}")
+        with time_stage('search'):
+            search_ok = search_friend(forms.search, primed=primed and attempt == 0, move_focus=move_focus)
+        if not search_ok:
+            log("   -> ⚠️ 검색창 입력 검증에 실패했지만 AX로 추가 확인을 시도합니다.")
+        with time_stage('search_result_wait'):
+            if current_fast_mode:
+                # 결과 행 등장까지 대기 (걸린 시간은 적응형 대기 학습에 쓴다)
+                _ax_wait_for_search_results(timeout=1.2, learn_stage='search_results')
+            else:
+                # 검색 결과 로딩 대기 (학습값부터 +0.4초 랜덤, 중단 체크 포함)
+                wait = adaptive_delays.delay('search_results')
+                safe_sleep((wait, wait + 0.4))
+
+        # 친구 검증: 접근성(AX) API (창 크기와 무관하게 정확한 문자열 비교)
+        check_stop_requested()
+        with time_stage('verify_ax'):
+            result = verify_friend_by_ax(name, forms)
+        if result:
+            if current_journal is not None:
+                current_journal.record('verified', key=forms.normalized)
+            if attempt:
+                adaptive_delays.failed('search_results')  # 재시도로만 확인됨 → 대기 늘림
+            return result, attempt + 1
+        if not search_ok:
+            result = result._replace(reason='search_input_failed')  # 검색어 입력부터 확인 안 됨
+
+        if attempt < MAX_SEARCH_ATTEMPTS - 1:
+            log("   -> ↻ 검색을 한 번 더 시도합니다.")
+            reset_search(silent=True)
+            if not current_fast_mode:
+                safe_sleep((0.5, 1.0))
+    return result, MAX_SEARCH_ATTEMPTS
+
+
+def send_message(name: str, message: str, dry_run: bool = False, forms: Optional[NameForms] = None,
+                 attachment: Optional[str] = None) -> SendOutcome:
+    """카카오톡 메시지 전송 (접근성(AX) 검증). 결과는 SendOutcome(사유·단계·시도 수·소요시간).
 
     dry_run=True이면 친구 검색·검증까지만 수행하고 실제 메시지는 보내지 않는다.
+    forms: 명단에서 미리 계산한 이름 파생형(없으면 여기서 계산).
+    attachment: 이 대상자의 첨부(명단 첨부파일 열). 없으면 공용 이미지(current_image_path).
     """
+    t0 = time.perf_counter()
+    stage = 'ensure_ready'
+    attempts = 0
+
+    def outcome(ok: bool, reason: str, extra_attempts: int = 0) -> SendOutcome:
+        return SendOutcome(ok, reason, stage, max(attempts, 1) + extra_attempts, time.perf_counter() - t0)
+
     try:
         check_stop_requested()
-        
+
+        # 융합 실행(텍스트 전용 대상): 활성화+검색창 띄우기, 결과 포커스+채팅방 열기를 각각 한
+        # 스크립트로 묶고, 채팅방 닫기는 검색 초기화에 맡긴다. AX 확인 지점은 그대로다.
+        image_path = attachment or current_image_path
+        fused = _fused_plain_text(image_path)
+        primed = fused and _ax_search_input_enabled()
+
         # 1. 카카오톡 활성화 및 준비 확인 (검증·전송은 AX 기반)
         with time_stage('ensure_ready'):
-            ready = ensure_kakaotalk_ready()
+            ready = ensure_kakaotalk_ready(prime_search=primed)
         check_stop_requested()
         if not ready:
             log(f"   -> ⚠️ 카카오톡이 준비되지 않아 복구를 시도합니다.")
             reset_search(silent=True)
+            primed = False
             ready = ensure_kakaotalk_ready()
             check_stop_requested()
             if not ready:
                 log(f"   -> ❌ 카카오톡을 찾을 수 없습니다. (실행/로그인 확인)")
-                return False
-
-        # 2~3. 친구 검색 + AX 검증 (검색 화면이 안 떴거나 타이밍 문제일 수 있어 1회 재시도)
-        #  - 이모티콘 포함 이름: 검색은 '텍스트만'으로(필터 신뢰성↑), 검증은 이모티콘까지
-        #    포함한 정규화 정확 일치(AX). 검증은 접근성(AX) API로만 수행한다.
-        is_emoji_name = name_contains_emoji_or_symbol(name)
-        search_term = name_for_search(name)
-        verified = False
-        for attempt in range(MAX_SEARCH_ATTEMPTS):
-            check_stop_requested()
-            suffix = f" (재시도 {attempt}/{MAX_SEARCH_ATTEMPTS - 1})" if attempt else ""
-            log(f"   -> 📋 검색 중...{suffix}")
-            with time_stage('search'):
-                search_ok = search_friend(search_term)
-            if not search_ok:
-                log("   -> ⚠️ 검색창 입력 검증에 실패했지만 AX로 추가 확인을 시도합니다.")
-            with time_stage('search_result_wait'):
-                if current_fast_mode:
-                    _ax_wait_for_search_results(timeout=1.2)  # 결과 행 등장까지 폴링
-                else:
-                    safe_sleep((0.8, 1.2))  # 검색 결과 로딩 대기 (랜덤, 중단 체크 포함)
-
-            # 친구 검증: 접근성(AX) API (창 크기와 무관하게 정확한 문자열 비교)
-            check_stop_requested()
-            with time_stage('verify_ax'):
-                _ax_verified = verify_friend_by_ax(name)
-            if _ax_verified:
-                verified = True
-                break
-
-            if attempt < MAX_SEARCH_ATTEMPTS - 1:
-                log("   -> ↻ 검색을 한 번 더 시도합니다.")
-                reset_search(silent=True)
-                if not current_fast_mode:
-                    safe_sleep((0.5, 1.0))
-
+                return outcome(False, 'kakao_not_ready')
+
+        # 2~3. 친구 검색 + AX 검증
+        if forms is None:
+            forms = name_forms(name)
+        stage = 'search'
+        verified, attempts = search_and_verify_friend(name, forms, primed=primed, move_focus=not fused)
+        stage = 'verify_ax'
         if not verified:
-            if is_emoji_name:
+            if forms.has_emoji:
                 log(f"   -> ❌ '{name}' 친구를 찾을 수 없습니다. (이모티콘 정확 일치 실패 — 카카오톡 표시 이름과 이모티콘까지 동일해야 합니다)")
             else:
                 log(f"   -> ❌ '{name}' 친구를 찾을 수 없습니다. (AX 검증 실패)")
-            return False
+            return outcome(False, verified.reason)
 
         log(f"   -> ✅ 친구 확인됨 (AX)")
 
         # 4. 메시지 전송 (모의 전송 모드면 채팅방만 열었다 닫고 발송은 생략)
         check_stop_requested()
+        stage = 'send_total'
         if dry_run:
-            if current_image_path:
+            if image_path:
                 order_label = '텍스트 → 사진' if current_image_order == 'text_first' else '사진 → 텍스트'
                 log(f"   -> 🧪 (모의 전송) 실제로는 [{order_label}] 순서로 전송됩니다 — 지금은 채팅방만 열고 닫음")
             else:
                 log(f"   -> 🧪 (모의 전송) 채팅방 열고 1초 후 닫음 — 실제 메시지는 보내지 않음")
-            open_chat_then_close(wait_seconds=1.0)
-            return True
+            open_chat_then_close(wait_seconds=1.0, focus_pending=fused)
+            return outcome(True, 'dry_run')
         with time_stage('send_total'):
-            sent_ok = send_message_to_friend(message)
-        if not sent_ok:
+            sent = send_message_to_friend(message, focus_pending=fused, image_path=image_path)
+        if not sent:
             # 채팅방을 열지 못해 전송하지 못함 → 실패로 처리(허공 전송 방지)
-            return False
+            stage = sent.stage
+            return outcome(False, sent.reason, sent.attempts - 1)
         with time_stage('post_send_wait'):
             if current_fast_mode:
                 check_stop_requested()  # 패스트: 탐지방지 대기 제거(⚠️스팸 위험), 중단만 확인
             else:
                 safe_sleep((0.3, 0.8))  # 전송 후 대기 (랜덤, 중단 체크 포함)
         log(f"   -> ✅ 전송 완료!")
-        return True
+        return outcome(True, sent.reason, sent.attempts - 1)
         
     except StopRequestedException:
         log(f"   -> ⏹ 전송 중단됨")
         raise  # 상위로 전파하여 즉시 중단
     except Exception as e:
         log(f"   -> ❌ 오류 발생: {e}")
-        return False
+        if stage == 'send_total' and not dry_run:
+            # 메시지를 이미 붙여넣었거나 보냈을 수 있다 → 실패로 재전송하지 않도록 '불확실'
+            return outcome(False, 'send_uncertain')
+        return outcome(False, 'error')
     finally:
         # 성공/실패 관계없이 다음 검색을 위해 검색창 초기화 (중단 요청이 아닌 경우에만)
         if not stop_requested:
@@ -2655,35 +5525,773 @@ def send_message(name: str, message: str, dry_run: bool = False) -> bool:
                 pass
 
 
+def audit_recipient(name: str, forms: Optional[NameForms] = None) -> tuple:
+    """검증만(감사) 모드 한 명: 친구 검색 + AX 검증만 하고 채팅방은 열지 않는다.
+    → (SendOutcome — 확인되면 reason 'verified', VerifyResult — 일치 방법·표시 이름·후보)."""
+    t0 = time.perf_counter()
+    stage = 'ensure_ready'
+    attempts = 1
+    result = VerifyResult(False, 'error')
+    try:
+        check_stop_requested()
+        primed = _ax_search_input_enabled()
+        with time_stage('ensure_ready'):
+            ready = ensure_kakaotalk_ready(prime_search=primed)
+        if not ready:
+            reset_search(silent=True)
+            primed = False
+            ready = ensure_kakaotalk_ready()
+        if not ready:
+            log("   -> ❌ 카카오톡을 찾을 수 없습니다. (실행/로그인 확인)")
+            result = VerifyResult(False, 'kakao_not_ready')
+        else:
+            stage = 'verify_ax'
+            result, attempts = search_and_verify_friend(name, forms or name_forms(name), primed=primed,
+                                                        move_focus=False)
+            if result:
+                log(f"   -> ✅ 확인 — {AUDIT_MATCH_LABELS.get(result.reason, result.reason)}: '{result.candidates[0]}'")
+            else:
+                log(f"   -> ❌ {SEND_REASON_LABELS.get(result.reason, result.reason)}")
+    except StopRequestedException:
+        log("   -> ⏹ 검증 중단됨")
+        raise
+    except Exception as e:
+        log(f"   -> ❌ 오류 발생: {e}")
+        result = VerifyResult(False, 'error')
+    finally:
+        if not stop_requested:
+            try:
+                with time_stage('reset_search'):
+                    reset_search(silent=True)
+            except Exception:
+                pass
+    return SendOutcome(result.ok, 'verified' if result else result.reason, stage, attempts,
+                       time.perf_counter() - t0), result
+
+
+class SendJob(NamedTuple):
+    """파이프라인 준비 단계가 UI 구동 단계로 넘기는 대상자 한 명분."""
+    index: int  # 1부터
+    name: str
+    message: str
+    forms: NameForms
+    key: str  # 저널 키(정규화 이름)
+    skip: Optional[str] = None  # 친구 목록 사전 분류로 건너뛸 사유(SEND_REASON_LABELS 키)
+    attachment: Optional[str] = None  # 대상자별 첨부 절대 경로(없으면 공용 이미지)
+
+
+def _prepare_send_job(index: int, row, message_template: str) -> SendJob:
+    """명단 행 → SendJob (메시지 서식 + 미리 계산한 이름 파생형 + 대상자별 첨부)."""
+    name = row['이름']
+    return SendJob(index, name, message_template.format(name=name), roster_row_forms(row), row['_normalized'],
+                   row.get('_directory_skip') or None, row.get('_attachment') or None)
+
+
+class SendPipeline:
+    """명단 → 준비(스레드) → [jobs] → UI 구동(호출 스레드) → [results] → 기록(스레드).
+
+    카카오톡 UI 구동은 지금처럼 전송 스레드 하나에서만 하고, 그 앞뒤의 준비(메시지 서식·이름
+    파생형)와 결과 기록(성공/실패 집계·저널)은 별도 스레드가 크기 제한 큐를 사이에 두고 맡는다.
+    N번째를 보내는 동안 N+1번째 준비와 N-1번째 기록이 함께 진행된다. 대상자별 첨부가 있으면
+    N번째를 꺼낼 때 N~N+ATTACHMENT_PREFETCH번째 첨부의 준비를 attachment_cache 선읽기에 맡긴다.
+    """
+
+    def __init__(self, target_df, message_template: str, journal=None, depth: int = PIPELINE_QUEUE_SIZE,
+                 prefetch: int = ATTACHMENT_PREFETCH):
+        self.jobs = Queue(maxsize=depth)
+        self.results = Queue(maxsize=depth)
+        self.journal = journal
+        self.prefetch = prefetch
+        self._attachments = []
+        if '_attachment' in target_df.columns and target_df['_attachment'].notna().any():
+            skips = target_df['_directory_skip'] if '_directory_skip' in target_df.columns else [None] * len(target_df)
+            self._attachments = [None if skip else path for path, skip in zip(target_df['_attachment'], skips)]
+        self.has_attachments = bool(self._attachments)
+        self.success_count = 0
+        self.failed_names = []
+        self._closed = threading.Event()
+        self._preparer = threading.Thread(target=self._prepare, args=(target_df, message_template), daemon=True)
+        self._recorder = threading.Thread(target=self._record, daemon=True)
+        self._preparer.start()
+        self._recorder.start()
+
+    def _put_job(self, item) -> bool:
+        """jobs 큐에 넣는다. 파이프라인이 닫히면(중단) 포기한다."""
+        while not self._closed.is_set():
+            try:
+                self.jobs.put(item, timeout=0.2)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _prepare(self, target_df, message_template):
+        try:
+            for i, row in enumerate(target_df.to_dict('records'), 1):
+                job = _prepare_send_job(i, row, message_template)
+                if not self._put_job(job):
+                    return
+        except Exception as exc:
+            self._put_job(exc)  # 서식 오류 등은 UI 단계에서 다시 일으킨다
+            return
+        self._put_job(None)
+
+    def _record(self):
+        while True:
+            item = self.results.get()
+            if item is None:
+                return
+            job, outcome = item
+            if outcome.ok:
+                self.success_count += 1
+            else:
+                self.failed_names.append(job.name)
+            if self.journal is not None:
+                self.journal.record_outcome(job.key, outcome)
+            run_metrics.result(outcome, job.index, job.name)
+
+    def __iter__(self):
+        while True:
+            item = self.jobs.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            if self._attachments:
+                attachment_cache.prefetch(self._attachments[item.index - 1:item.index + self.prefetch])
+            yield item
+
+    def done(self, job: SendJob, outcome):
+        """UI 단계의 결과(SendOutcome)를 기록 단계로 넘긴다."""
+        self.results.put((job, as_send_outcome(outcome)))
+
+    def close(self):
+        """기록 단계가 남은 결과를 모두 반영할 때까지 기다리고 준비 단계를 멈춘다."""
+        self._closed.set()
+        self.results.put(None)
+        self._recorder.join()
+
+
+def resolve_attachment_path(value, base_dir: str) -> Optional[str]:
+    """명단 첨부파일 칸 → 절대 경로(빈 칸이면 None). 상대 경로는 base_dir 기준."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    path = os.path.expanduser(text)
+    if not os.path.isabs(path):
+        path = os.path.join(base_dir, path)
+    return os.path.normpath(path)
+
+
+def apply_roster_attachments(target_df, base_dir: str):
+    """명단 첨부파일 열을 절대 경로 _attachment 열로 풀고, 보낼 수 없는 첨부를 모은다.
+    → (target_df, problems[(이름, 경로, 사유)]) — 파일이 없거나 사진·PDF가 아니면 문제로 센다."""
+    if ROSTER_ATTACHMENT_COLUMN in target_df.columns:
+        paths = [resolve_attachment_path(v, base_dir) for v in target_df[ROSTER_ATTACHMENT_COLUMN]]
+    else:
+        paths = [None] * len(target_df)
+    problems = []
+    for name, path in zip(target_df['이름'], paths):
+        if path is None:
+            continue
+        if not os.path.isfile(path):
+            problems.append((name, path, '파일 없음'))
+        elif not (is_pdf_attachment(path) or path.lower().endswith(ALLOWED_IMAGE_EXTS)):
+            problems.append((name, path, '사진·PDF가 아님'))
+    return target_df.assign(_attachment=paths), problems
+
+
+def apply_friend_directory(target_df):
+    """친구 목록 색인으로 대상자를 분류해 건너뛸 대상에 _directory_skip(사유) 열을 단다.
+    색인을 못 만들면 명단을 그대로 돌려준다(대상자마다 검색·검증)."""
+    directory = refresh_friend_directory()
+    if directory is None:
+        return target_df
+    groups = directory.classify_roster(target_df)
+    log(f"📒 친구 목록 확인 — 있음 {len(groups['unique'])}명 · 후보 여러 명 {len(groups['ambiguous'])}명 · "
+        f"없음 {len(groups['missing'])}명")
+    skip = [None] * len(target_df)
+    for n, (pos, name, result) in enumerate(groups['ambiguous']):
+        skip[pos] = 'ambiguous'
+        if n < PREFLIGHT_REPORT_LIMIT:
+            log(f"   • {name}: 후보 여러 명 → {', '.join(result.candidates)}")
+    for pos, name, result in groups['missing']:
+        skip[pos] = result.reason
+    if groups['missing']:
+        missing = [str(name) for _pos, name, _result in groups['missing']]
+        log(f"   • 친구 목록에 없음: {', '.join(missing[:PREFLIGHT_REPORT_LIMIT])}"
+            + (f" 외 {len(missing) - PREFLIGHT_REPORT_LIMIT}명" if len(missing) > PREFLIGHT_REPORT_LIMIT else ""))
+    return target_df.assign(_directory_skip=skip)
+
+
+def _drive_send_pipeline(pipeline: SendPipeline, count: int) -> bool:
+    """파이프라인의 UI 구동 단계: 준비된 대상자를 차례로 카카오톡에 전송한다. 중단되면 True."""
+    for job in pipeline:
+        i, name = job.index - 1, job.name
+        # 일시정지 체크 (현재 대상자 시작 전에 확인)
+        if pause_requested:
+            log(f"⏸ 일시정지됨 — 재개 버튼을 누르면 [{i + 1}/{count}]번째부터 이어서 전송합니다.")
+            log_queue.put(json.dumps({'type': 'paused'}))
+            pause_event.clear()
+            pause_event.wait()
+            if stop_requested:
+                log(f"\n⚠️ 사용자에 의해 전송이 중단되었습니다. ({i}/{count} 처리됨)")
+                return True
+            log("▶️ 전송 재개!")
+            run_metrics.resumed()
+
+        # 중단 요청 확인
+        check_stop_requested()
+
+        if job.skip is not None:
+            # 친구 목록에 없거나 후보가 여러 명 — 카카오톡을 건드리지 않고 실패로 기록
+            log(f"[{i + 1}/{count}] {name}님 ⏭ 건너뜀 — {SEND_REASON_LABELS.get(job.skip, job.skip)} (친구 목록 확인)")
+            pipeline.done(job, SendOutcome(False, job.skip, 'friend_directory'))
+            continue
+
+        log(f"[{i + 1}/{count}] {name}님 처리 중...")
+        set_timing_context(i + 1, name)  # B(계측): 이번 대상자 컨텍스트
+
+        if current_journal is not None:
+            # 전송 시작 전에 '시도' 기록을 디스크에 반영 (person_total 계측 밖)
+            current_journal.record('attempt', key=job.key, name=str(name))
+            if not current_journal.sync():
+                log(f"❌ 전송 기록(저널)을 디스크에 쓰지 못해 전송을 멈춥니다 (디스크 공간 확인): "
+                    f"{current_journal.error} ({i}/{count} 처리됨)")
+                return True
+
+        try:
+            if current_audit is not None:
+                # 검증만 모드: 채팅방을 열지 않으니 보낼 것도, 대상 간 대기도 없다
+                with time_stage('person_total'):
+                    outcome, verified = audit_recipient(name, job.forms)
+                current_audit.add(job.index, name, verified, outcome.elapsed)
+                pipeline.done(job, outcome)
+                continue
+            with time_stage('person_total'):
+                outcome = send_message(name, job.message, dry_run=current_dry_run, forms=job.forms,
+                                       attachment=job.attachment)
+            pipeline.done(job, outcome)
+        except StopRequestedException:
+            log(f"\n⚠️ 사용자에 의해 전송이 중단되었습니다. ({i}/{count} 처리됨)")
+            return True
+
+        # 매크로 탐지 방지를 위한 랜덤 대기 (1~3초, 중단 체크 포함)
+        # 패스트 모드는 이 대기를 제거한다(⚠️스팸/매크로 탐지로 계정 제한 위험).
+        check_stop_requested()
+        try:
+            if not current_fast_mode:
+                safe_sleep((1.0, 3.0), show_log=True)
+        except StopRequestedException:
+            log(f"\n⚠️ 사용자에 의해 전송이 중단되었습니다. ({i + 1}/{count} 처리됨)")
+            return True
+    return False
+
+
+# ============================================================
+# 분산 전송 (여러 맥) — 코디네이터 / 워커
+# ============================================================
+# 코디네이터(python3 kakao_web.py --coordinator)는 명단을 읽고 걸러 대상자 목록을 갖고, 워커
+# (python3 kakao_web.py --worker http://<코디네이터>:5050)는 대상자를 하나씩 임대받아 자기 맥의
+# 카카오톡으로 send_message를 실행한 뒤 결과를 보고한다. 대상자 상태:
+#   pending → leased(임대) → sending(워커가 전송 시작을 알림) → done(결과 수신)
+# 임대가 만료되면 leased는 pending으로 돌아가 다른 워커에게 다시 배정되지만, sending은 이미
+# 보냈을 수 있으므로 uncertain(전송 여부 불확실)으로 두고 재배정하지 않는다. 결과는 임대 ID로
+# 한 번만 받는다(같은 결과의 재전송은 중복으로 응답만 한다).
+
+class WorkCoordinator:
+    """분산 전송 코디네이터: 한 실행의 대상자를 임대로 나눠 주고 결과를 정확히 한 번씩 모은다."""
+
+    def __init__(self, lease_seconds: Optional[float] = None):
+        self.lease_seconds = lease_seconds or WORK_LEASE_SECONDS
+        self._cond = threading.Condition()
+        self.run_id = None
+        self.settings = {}
+        self.image_path = None
+        self.journal = None
+        self.paused = False
+        self.stopped = False
+        self._items = {}     # key → {'job', 'state', 'lease_id', 'worker', 'deadline', 'leases', 'sent_ok'}
+        self._pending = deque()
+        self._leases = {}    # lease_id → key
+        self._workers = {}   # worker_id → 마지막 연락 시각
+        self._events = []    # (kind, job, worker_id, outcome) — 코디네이터 로그용
+
+    def open_run(self, jobs, settings: dict, image_path=None, journal=None) -> str:
+        with self._cond:
+            self.run_id = uuid.uuid4().hex
+            self.settings = dict(settings)
+            self.image_path = image_path
+            self.journal = journal
+            self.paused = self.stopped = False
+            self._items = {job.key: {'job': job, 'state': 'pending', 'lease_id': None, 'worker': None,
+                                     'deadline': 0.0, 'leases': 0, 'sent_ok': None} for job in jobs}
+            self._pending = deque(job.key for job in jobs)
+            self._leases = {}
+            self._events = []
+            self._cond.notify_all()
+            return self.run_id
+
+    def stop(self):
+        """새 배정을 멈춘다. 이미 전송을 시작한 대상자의 결과는 계속 받는다."""
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
+
+    def _valid_item(self, lease_id):
+        key = self._leases.get(lease_id)
+        item = self._items.get(key) if key is not None else None
+        return item if item is not None and item['lease_id'] == lease_id else None
+
+    def _reap(self, now):
+        """만료된 임대 정리: leased → pending(재배정), sending → uncertain."""
+        for lease_id, key in list(self._leases.items()):
+            item = self._items.get(key)
+            if item is None or item['lease_id'] != lease_id:
+                del self._leases[lease_id]
+            elif item['deadline'] < now and item['state'] == 'leased':
+                item.update(state='pending', lease_id=None)
+                del self._leases[lease_id]
+                self._pending.appendleft(key)
+                self._events.append(('expired', item['job'], item['worker'], None))
+            elif item['deadline'] < now and item['state'] == 'sending':
+                item['state'] = 'uncertain'  # 늦게 온 결과는 이 임대 ID로 여전히 받는다
+                self._events.append(('uncertain', item['job'], item['worker'], None))
+
+    def _counts(self):
+        counts = {'pending': 0, 'leased': 0, 'sending': 0, 'done': 0, 'uncertain': 0, 'success': 0}
+        for item in self._items.values():
+            counts[item['state']] += 1
+            counts['success'] += item['sent_ok'] is True
+        return counts
+
+    def _finished(self, counts) -> bool:
+        if self.stopped:
+            return counts['sending'] == 0
+        return counts['pending'] + counts['leased'] + counts['sending'] == 0
+
+    def lease(self, worker_id: str, max_jobs: int = 1) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            self._workers[worker_id] = now
+            self._reap(now)
+            jobs = []
+            if self.run_id and not (self.paused or self.stopped):
+                while self._pending and len(jobs) < max_jobs:
+                    key = self._pending.popleft()
+                    item = self._items[key]
+                    lease_id = uuid.uuid4().hex
+                    item.update(state='leased', lease_id=lease_id, worker=worker_id,
+                                deadline=now + self.lease_seconds, leases=item['leases'] + 1)
+                    self._leases[lease_id] = key
+                    jobs.append(dict(item['job']._asdict(), lease_id=lease_id))
+            return {'run_id': self.run_id, 'settings': self.settings, 'jobs': jobs,
+                    'finished': self.run_id is None or self._finished(self._counts())}
+
+    def heartbeat(self, worker_id: str, lease_ids) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            self._workers[worker_id] = now
+            valid = []
+            for lease_id in lease_ids:
+                item = self._valid_item(lease_id)
+                if item is not None and item['state'] in ('leased', 'sending'):
+                    item['deadline'] = now + self.lease_seconds
+                    valid.append(lease_id)
+            return {'valid': valid}
+
+    def release(self, worker_id: str, lease_ids) -> dict:
+        """워커가 보내지 않기로 한(전송 시작 전) 임대를 돌려받아 바로 다른 워커에게 배정한다."""
+        with self._cond:
+            self._workers[worker_id] = time.monotonic()
+            released = []
+            for lease_id in lease_ids:
+                item = self._valid_item(lease_id)
+                if item is None or item['state'] != 'leased':
+                    continue  # 이미 전송을 시작했거나 만료된 임대는 그대로 둔다
+                item.update(state='pending', lease_id=None, leases=item['leases'] - 1)
+                del self._leases[lease_id]
+                self._pending.appendleft(item['job'].key)
+                released.append(lease_id)
+            self._cond.notify_all()
+            return {'released': released}
+
+    def begin(self, worker_id: str, lease_id: str) -> dict:
+        """워커가 전송 직전에 호출. 임대가 아직 유효할 때만 ok → 이후 이 대상자는 재배정되지 않는다."""
+        with self._cond:
+            now = time.monotonic()
+            self._workers[worker_id] = now
+            self._reap(now)
+            item = self._valid_item(lease_id)
+            if item is None or item['state'] != 'leased' or self.stopped:
+                return {'ok': False}
+            item.update(state='sending', deadline=now + self.lease_seconds)
+            journal = self.journal
+            if journal is not None:
+                job = item['job']
+                journal.record('attempt', key=job.key, name=str(job.name), worker=worker_id)
+        if journal is not None and not journal.sync():  # '시도' 기록이 디스크에 반영된 뒤에 전송을 허락한다
+            with self._cond:
+                # 기록이 없으니 보내지 않게 하고(sending → leased), 새 배정도 멈춘다
+                if item['lease_id'] == lease_id and item['state'] == 'sending':
+                    item['state'] = 'leased'
+                self.stopped = True
+                self._events.append(('journal_error', item['job'], worker_id, None))
+                self._cond.notify_all()
+            return {'ok': False}
+        return {'ok': True}
+
+    def result(self, worker_id: str, lease_id: str, sent_ok: bool, outcome=None) -> dict:
+        """outcome: 워커의 SendOutcome(또는 그 dict). 없으면 성공 여부만으로 만든다."""
+        if isinstance(outcome, dict):
+            outcome = SendOutcome(**{f: outcome[f] for f in SendOutcome._fields if f in outcome})
+        outcome = as_send_outcome(outcome if outcome is not None else sent_ok)._replace(ok=bool(sent_ok))
+        with self._cond:
+            self._workers[worker_id] = time.monotonic()
+            item = self._valid_item(lease_id)
+            if item is None:
+                return {'accepted': False, 'duplicate': False}
+            if item['state'] == 'done':
+                return {'accepted': False, 'duplicate': True}
+            if item['state'] not in ('sending', 'uncertain'):
+                return {'accepted': False, 'duplicate': False}  # 전송 시작을 알리지 않은 임대
+            item.update(state='done', sent_ok=outcome.ok)
+            job = item['job']
+            if self.journal is not None:
+                self.journal.record_outcome(job.key, outcome, worker=worker_id)
+            self._events.append(('sent' if outcome.ok else 'failed', job, worker_id, outcome))
+            self._cond.notify_all()
+            return {'accepted': True, 'duplicate': False}
+
+    def fetch_image(self, run_id: str, ext: str = '') -> Optional[str]:
+        """(같은 프로세스 워커용) 실행의 첨부 이미지 경로."""
+        return self.image_path if run_id == self.run_id else None
+
+    def wait_progress(self, timeout: float = 1.0) -> dict:
+        """결과가 오거나 timeout이 지날 때까지 기다린 뒤 진행 상황과 새 이벤트를 돌려준다."""
+        with self._cond:
+            self._cond.wait(timeout)
+            now = time.monotonic()
+            self._reap(now)
+            counts = self._counts()
+            events, self._events = self._events, []
+            counts.update(
+                finished=self._finished(counts), events=events,
+                workers=sum(1 for t in self._workers.values() if now - t <= self.lease_seconds),
+            )
+            return counts
+
+    def summary(self) -> dict:
+        with self._cond:
+            items = list(self._items.values())
+        return {
+            'success': sum(1 for it in items if it['sent_ok'] is True),
+            'failed_names': [it['job'].name for it in items if it['sent_ok'] is False],
+            'uncertain_names': [it['job'].name for it in items if it['state'] == 'uncertain'],
+            'reissued': sum(max(it['leases'] - 1, 0) for it in items),
+        }
+
+
+def _coordinate_send(coordinator: WorkCoordinator, target_df, message_template: str, count: int) -> bool:
+    """코디네이터 모드의 전송: 대상자를 워커에게 나눠 주고 끝날 때까지 결과를 로그로 알린다. 중단되면 True."""
+    jobs = [_prepare_send_job(i, row, message_template) for i, row in enumerate(target_df.to_dict('records'), 1)]
+    coordinator.open_run(jobs, {
+        'fast_mode': current_fast_mode,
+        'dry_run': current_dry_run,
+        'image_order': current_image_order,
+        'image_ext': os.path.splitext(current_image_path)[1] if current_image_path else None,
+    }, image_path=current_image_path, journal=current_journal)
+    log(f"🛰 분산 전송 — 대상자 {count}명을 워커에게 나눠 줍니다. 워커 맥에서: python3 kakao_web.py --worker http://<이 맥 주소>:<포트>")
+
+    stopped = False
+    workers = None
+    while True:
+        if stop_requested and not stopped:
+            coordinator.stop()
+            stopped = True
+            log("⚠️ 중단 요청 — 새 배정을 멈추고 전송 중인 대상자의 결과만 기다립니다.")
+        if pause_requested != coordinator.paused:
+            coordinator.paused = pause_requested
+            if pause_requested:
+                log("⏸ 일시정지됨 — 새 배정을 멈췄습니다. 재개 버튼을 누르면 이어서 나눠 줍니다.")
+                log_queue.put(json.dumps({'type': 'paused'}))
+            else:
+                log("▶️ 전송 재개!")
+                run_metrics.resumed()
+        progress = coordinator.wait_progress(1.0)
+        for kind, job, worker_id, outcome in progress['events']:
+            if kind == 'sent':
+                log(f"[{job.index}/{count}] {job.name} ✅ 전송 완료 ({worker_id})")
+                run_metrics.result(outcome, job.index, job.name)
+            elif kind == 'failed':
+                log(f"[{job.index}/{count}] {job.name} ❌ 실패 — "
+                    f"{SEND_REASON_LABELS.get(outcome.reason, outcome.reason)} ({worker_id})")
+                run_metrics.result(outcome, job.index, job.name)
+            elif kind == 'expired':
+                log(f"   ↻ {job.name}: {worker_id} 응답 없음 — 다른 워커에게 다시 배정합니다.")
+            elif kind == 'uncertain':
+                log(f"   ⚠️ {job.name}: {worker_id}가 전송 중 응답이 끊겨 전송 여부를 알 수 없습니다(재배정 안 함).")
+            elif kind == 'journal_error' and not stopped:
+                stopped = True
+                log(f"❌ 전송 기록(저널)을 디스크에 쓰지 못해 새 배정을 멈춥니다 (디스크 공간 확인): "
+                    f"{coordinator.journal.error}")
+        if progress['workers'] != workers:
+            workers = progress['workers']
+            log(f"   📡 연결된 워커 {workers}대 · 완료 {progress['done']}/{count}")
+        if progress['finished']:
+            return stopped
+
+
+class _HTTPWorkClient:
+    """워커 → 코디네이터 HTTP 호출 (표준 라이브러리 urllib, JSON). 메서드는 WorkCoordinator와 같다."""
+
+    def __init__(self, base_url: str, token: Optional[str] = None, timeout: float = 10.0):
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+
+    def _request(self, path: str, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data)
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+        if self.token:
+            req.add_header(WORK_TOKEN_HEADER, self.token)
+        return urllib.request.urlopen(req, timeout=self.timeout)
+
+    def _post(self, path: str, payload: dict) -> dict:
+        with self._request(path, payload) as resp:
+            return json.loads(resp.read().decode('utf-8'))
+
+    def lease(self, worker_id, max_jobs=1):
+        return self._post('/work/lease', {'worker_id': worker_id, 'max_jobs': max_jobs})
+
+    def heartbeat(self, worker_id, lease_ids):
+        return self._post('/work/heartbeat', {'worker_id': worker_id, 'lease_ids': list(lease_ids)})
+
+    def release(self, worker_id, lease_ids):
+        return self._post('/work/release', {'worker_id': worker_id, 'lease_ids': list(lease_ids)})
+
+    def begin(self, worker_id, lease_id):
+        return self._post('/work/begin', {'worker_id': worker_id, 'lease_id': lease_id})
+
+    def result(self, worker_id, lease_id, sent_ok, outcome=None):
+        payload = {'worker_id': worker_id, 'lease_id': lease_id, 'sent_ok': bool(sent_ok)}
+        if outcome is not None:
+            payload['outcome'] = outcome._asdict()
+        return self._post('/work/result', payload)
+
+    def fetch_image(self, run_id, ext=''):
+        """실행의 첨부 이미지를 받아 임시 파일로 저장하고 경로를 돌려준다."""
+        query = urllib.parse.urlencode({'run_id': run_id})
+        with self._request(f'/work/image?{query}') as resp:
+            fd, path = tempfile.mkstemp(prefix='kakao_sender_worker_', suffix=ext or '')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(resp.read())
+        return path
+
+
+class _LeaseHeartbeat:
+    """워커가 쥔 임대들의 하트비트를 백그라운드에서 주기적으로 보낸다(전송 중에도 임대 유지)."""
+
+    def __init__(self, client, worker_id: str, interval: Optional[float] = None):
+        self.client = client
+        self.worker_id = worker_id
+        self.interval = interval or WORK_HEARTBEAT_SECONDS
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def hold(self, lease_id):
+        with self._lock:
+            self._held.add(lease_id)
+
+    def release(self, lease_id):
+        with self._lock:
+            self._held.discard(lease_id)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                held = list(self._held)
+            if held:
+                try:
+                    self.client.heartbeat(self.worker_id, held)
+                except (OSError, ValueError):
+                    pass  # 다음 주기에 다시 보낸다(임대 만료 전까지 여유가 있다)
+
+    def stop(self):
+        self._stop.set()
+
+
+def _report_work_result(client, worker_id, lease_id, outcome: SendOutcome, stop_event) -> bool:
+    """결과 보고: 코디네이터가 받을 때까지 재시도한다(같은 임대 ID라 중복 반영되지 않음)."""
+    delay = 0.5
+    while True:
+        try:
+            client.result(worker_id, lease_id, outcome.ok, outcome)
+            return True
+        except (OSError, ValueError) as exc:
+            log(f"   -> ⚠️ 결과 보고 실패, 다시 시도합니다: {exc}")
+        if stop_event.wait(delay):
+            return False
+        delay = min(delay * 2, WORK_HEARTBEAT_SECONDS)
+
+
+def run_worker(client, worker_id: str, send_fn=None, prepare=None, stop_event=None, exit_when_finished=False):
+    """워커 루프: 코디네이터에서 대상자를 하나씩 임대받아 보내고 결과를 보고한다.
+
+    send_fn(name, message, dry_run=, forms=) → bool (기본 send_message).
+    prepare(): 새 실행을 받을 때마다 이 맥의 카카오톡을 준비. 실패하면 False → 받은 임대를 바로 돌려주고
+    (다른 워커가 이어받음) 대기를 두 배씩 늘려 WORK_PREPARE_BACKOFF_MAX까지 기다렸다가 다시 시도한다.
+    exit_when_finished: 일감이 없고 실행이 끝났으면 종료(시뮬레이션용). 기본은 다음 실행을 기다린다.
+    """
+    global current_fast_mode, current_dry_run, current_image_path, current_image_order
+    send_fn = send_fn or send_message
+    stop_event = stop_event or threading.Event()
+    heartbeat = _LeaseHeartbeat(client, worker_id)
+    heartbeat.start()
+    run_id = None
+    backoff = WORK_POLL_SECONDS
+    try:
+        while not stop_event.is_set():
+            try:
+                resp = client.lease(worker_id, 1)
+            except (OSError, ValueError) as exc:
+                log(f"⚠️ 코디네이터에 연결할 수 없습니다: {exc}")
+                stop_event.wait(WORK_POLL_SECONDS)
+                continue
+            jobs = resp.get('jobs') or []
+            if not jobs:
+                if exit_when_finished and resp.get('finished'):
+                    return
+                stop_event.wait(WORK_POLL_SECONDS)
+                continue
+
+            if resp['run_id'] != run_id:
+                settings = resp.get('settings') or {}
+                current_fast_mode = bool(settings.get('fast_mode'))
+                current_dry_run = bool(settings.get('dry_run'))
+                current_image_order = settings.get('image_order') or 'image_first'
+                current_image_path = (client.fetch_image(resp['run_id'], settings['image_ext'])
+                                      if settings.get('image_ext') else None)
+                if prepare is not None and not prepare():
+                    try:
+                        client.release(worker_id, [data['lease_id'] for data in jobs])
+                    except (OSError, ValueError):
+                        pass  # 못 돌려주면 임대가 만료된 뒤 다른 워커에게 간다
+                    log(f"⚠️ 카카오톡 준비 실패 — 받은 대상자를 돌려주고 {backoff:.0f}초 뒤 다시 시도합니다.")
+                    stop_event.wait(backoff)
+                    backoff = min(backoff * 2, WORK_PREPARE_BACKOFF_MAX)
+                    continue
+                run_id = resp['run_id']
+                backoff = WORK_POLL_SECONDS
+
+            for data in jobs:
+                lease_id = data['lease_id']
+                job = SendJob(**{f: data[f] for f in SendJob._fields})
+                job = job._replace(forms=NameForms(*job.forms))
+                heartbeat.hold(lease_id)
+                try:
+                    try:
+                        began = client.begin(worker_id, lease_id).get('ok')
+                    except (OSError, ValueError):
+                        began = False  # 허락을 못 받았으면 보내지 않는다
+                    if not began:
+                        continue
+                    log(f"[{job.index}] {job.name}님 처리 중...")
+                    try:
+                        outcome = as_send_outcome(send_fn(job.name, job.message, dry_run=current_dry_run,
+                                                          forms=job.forms))
+                    except Exception as exc:
+                        log(f"   -> ❌ 오류 발생: {exc}")
+                        outcome = SendOutcome(False, 'send_uncertain', 'person_total')  # 보냈을 수 있다
+                    _report_work_result(client, worker_id, lease_id, outcome, stop_event)
+                finally:
+                    heartbeat.release(lease_id)
+    finally:
+        heartbeat.stop()
+
+
+def init_local_sending():
+    """이 맥의 카카오톡을 조작하는 실행마다 한 번: 핸들러 라이브러리·AX 캐시 준비."""
+    load_applescript_library()  # 핸들러 라이브러리 1회 컴파일 (as_compile)
+    if AX_AVAILABLE:
+        invalidate_ax_app_cache()  # 실행마다 카카오톡 앱 핸들을 새로 찾는다
+    _ax_locator.reset()
+
+
+def prepare_kakaotalk() -> bool:
+    """전송 시작 전 카카오톡 사전 준비: 실행·로그인을 확인하고 친구 목록으로 복귀."""
+    log("💬 카카오톡 준비 중...")
+
+    kakao_ready = False
+    max_prepare_retries = 5  # 최대 5회 시도 (카카오톡이 꺼져있을 경우 시작까지 시간 필요)
+
+    for attempt in range(max_prepare_retries):
+        call_applescript_handler('ensureReady', 2.0, 1.0)
+        time.sleep(2)
+
+        # 창 ID(Quartz) 대신 AX로 앱 실행 여부 확인 (검증·전송은 AX 기반)
+        if is_kakaotalk_running():
+            kakao_ready = True
+            break
+
+        log(f"   -> 카카오톡 대기 중... ({attempt + 1}/{max_prepare_retries})")
+        time.sleep(2)
+
+    if not kakao_ready:
+        log("❌ 카카오톡을 찾을 수 없습니다. 카카오톡이 설치되어 있고 로그인되어 있는지 확인해주세요.")
+        return False
+
+    # 친구 목록으로 복귀 (다음 검색 준비)
+    reset_search()
+    time.sleep(1)
+    log("✅ 카카오톡 준비 완료!")
+    return True
+
+
+def _prepare_worker_run() -> bool:
+    """워커: 코디네이터에서 새 실행을 받을 때마다 이 맥의 카카오톡을 준비한다."""
+    reset_timing()
+    init_local_sending()
+    return prepare_kakaotalk()
+
+
 def run_sending_logic():
     """메인 전송 로직"""
-    global is_running, stop_requested, pause_requested
+    global is_running, stop_requested, pause_requested, current_journal, current_resume
+    global current_audit, last_audit_report
     import json
     
     try:
         reset_timing()  # B(계측): 이전 실행 기록 초기화
-        if current_dry_run:
+        if current_coordinator is None:
+            init_local_sending()
+        if current_audit_mode:
+            log("🔍 검증만 모드 — 채팅방을 열지 않고 친구 검색·검증만 최고 속도로 수행합니다. 메시지는 전송되지 않습니다.")
+        elif current_dry_run:
             log("🧪 모의 전송(테스트) 모드 — 친구 검증까지만 수행하며 실제 메시지는 전송되지 않습니다.")
-        if current_fast_mode:
+        if current_fast_mode and not current_audit_mode:
             log("⚡ 패스트 모드 ON — 대기 최소화로 빠르게 보냅니다. ⚠️ 빠른 연속 발송은 카카오톡 스팸/매크로 탐지로 계정이 제한될 수 있습니다.")
-        if current_image_path:
+        if current_image_path and not current_audit_mode:
             order_label = '텍스트 → 사진' if current_image_order == 'text_first' else '사진 → 텍스트'
             log(f"📷 이미지 첨부 ON — 전송 순서: {order_label} (사진 1장)")
-        df = pd.read_excel(current_file_path)
-        log(f"📊 전체 {len(df)}명 로드됨")
-        
-        # 선택된 필터로 타겟 멤버 필터링
+        # 선택된 필터로 타겟 멤버 필터링 (엑셀을 스트리밍으로 읽으며 바로 거른다)
         register_types = current_register_types or DEFAULT_REGISTER_TYPES
         age_groups = current_age_groups or DEFAULT_AGE_GROUPS
         message_template = current_message_template or DEFAULT_MESSAGE_TEMPLATE
-        
+
+        target_df, total_rows = load_target_roster(current_file_path, register_types, age_groups)
+        log(f"📊 전체 {total_rows}명 로드됨")
         log(f"📌 필터 - 등록형태: {', '.join(register_types)} / 연령대: {', '.join(age_groups)}")
-        
-        target_df = df[
-            (df['등록형태'].isin(register_types)) &
-            (df['연령'].isin(age_groups))
-        ]
-        
+
         count = len(target_df)
         log(f"✅ 타겟 멤버 {count}명 필터링됨")
         if count > 0:
@@ -2701,75 +6309,80 @@ def run_sending_logic():
             }))
             return
 
-        # 동명이인 체크 (공백 정규화 후 비교)
-        normalized_names = target_df['이름'].apply(normalize_name)
-        duplicated_names = normalized_names[normalized_names.duplicated(keep=False)].unique().tolist()
-        if duplicated_names:
-            names_str = ', '.join(duplicated_names)
-            log(f"❌ 동명이인 오류: 전송 대상에 같은 이름이 존재합니다 → {names_str}")
-            log("🚫 동명이인이 있을 경우 카카오톡 검색 오류가 발생할 수 있어 전송을 중단합니다.")
-            log("📋 엑셀 파일에서 해당 이름의 중복 여부를 확인한 후 다시 시도해주세요.")
+        # 사전 점검: 동명이인·이모티콘만 이름·표기만 다른 같은 이름(오류) +
+        # 부분 일치 혼동 위험·너무 짧은 이름(경고)을 한 번에 계산해 모두 보고한다.
+        preflight = validate_roster(target_df)
+        log_preflight_report(preflight)
+        if not preflight['ok']:
             log_queue.put(json.dumps({
                 'type': 'complete',
                 'success': 0,
                 'total': count,
                 'failed_names': [],
-                'stopped': True
+                'stopped': True,
+                'preflight': preflight
             }))
             return
 
-        # 텍스트 없이 이모티콘/기호만으로 된 이름만 차단 (AX로도 안전한 정확 검증이 불가).
-        # 텍스트가 있는 이모티콘 이름(예: '홍길동🍪')은 AX 정확 일치로 안전하게 지원한다.
-        emoji_only_rows = target_df['이름'].apply(lambda x: not normalize_name_for_match(x))
-        if emoji_only_rows.any():
-            bad_names = target_df.loc[emoji_only_rows, '이름'].unique().tolist()
-            names_str = ', '.join(str(x) for x in bad_names)
-            log(f"❌ 이름 오류: 텍스트 없이 이모티콘/기호만으로 된 이름이 있습니다 → {names_str}")
-            log("🚫 이런 이름은 안전한 검증이 어려워 실행을 중단합니다.")
-            log("📋 엑셀에서 해당 이름에 카카오톡 표시 이름의 텍스트를 추가한 뒤 다시 시도해주세요.")
-            log_queue.put(json.dumps({
-                'type': 'complete',
-                'success': 0,
-                'total': count,
-                'failed_names': [],
-                'stopped': True
-            }))
-            return
-
-        # 전송 시작 전 카카오톡 사전 준비
-        log("💬 카카오톡 준비 중...")
-        
-        kakao_ready = False
-        max_prepare_retries = 5  # 최대 5회 시도 (카카오톡이 꺼져있을 경우 시작까지 시간 필요)
-
-        for attempt in range(max_prepare_retries):
-            run_applescript('''
-            tell application "KakaoTalk"
-                activate
-                delay 2.0
-            end tell
-            tell application "System Events"
-                tell process "KakaoTalk"
-                    set frontmost to true
-                    if (count of windows) is 0 then
-                        keystroke "n" using command down
-                        delay 1.0
-                    end if
-                end tell
-            end tell
-            ''')
-            time.sleep(2)
-
-            # 창 ID(Quartz) 대신 AX로 앱 실행 여부 확인 (검증·전송은 AX 기반)
-            if is_kakaotalk_running():
-                kakao_ready = True
-                break
-
-            log(f"   -> 카카오톡 대기 중... ({attempt + 1}/{max_prepare_retries})")
-            time.sleep(2)
+        # 대상자별 첨부(명단 첨부파일 열): 보낼 수 없는 첨부가 하나라도 있으면 시작하지 않는다
+        # (보고서 없이 텍스트만 가는 것을 막는다). 검증만 모드는 보내지 않으므로 보지 않는다.
+        if not current_audit_mode:
+            target_df, attachment_problems = apply_roster_attachments(
+                target_df, current_attachment_dir or ATTACHMENT_DIR)
+            attached = int(target_df['_attachment'].notna().sum())
+            if attachment_problems:
+                log(f"❌ 보낼 수 없는 첨부파일 {len(attachment_problems)}건 — 명단의 '{ROSTER_ATTACHMENT_COLUMN}' 열이나 "
+                    f"첨부 폴더를 확인하세요. 전송을 시작하지 않습니다.")
+                for name, path, problem in attachment_problems[:PREFLIGHT_REPORT_LIMIT]:
+                    log(f"   • {name}: {path} ({problem})")
+                log_queue.put(json.dumps({
+                    'type': 'complete',
+                    'success': 0,
+                    'total': count,
+                    'failed_names': [],
+                    'stopped': True
+                }))
+                return
+            if attached and current_coordinator is not None:
+                log("❌ 분산 전송은 대상자별 첨부를 보낼 수 없습니다 — 이 맥에서 직접 보내거나 첨부파일 열을 비우세요.")
+                log_queue.put(json.dumps({
+                    'type': 'complete',
+                    'success': 0,
+                    'total': count,
+                    'failed_names': [],
+                    'stopped': True
+                }))
+                return
+            if attached:
+                rest = '공용 이미지' if current_image_path else '텍스트만'
+                log(f"📎 대상자별 첨부 {attached}명 — 보내는 동안 다음 {ATTACHMENT_PREFETCH}명의 첨부를 미리 준비합니다 "
+                    f"(첨부가 없는 {count - attached}명은 {rest})")
+
+        # 이어보내기(/resume_run): 이전 실행 계열에서 이미 보낸 대상자는 건너뛴다. 전송 여부가
+        # 불확실한(시도 기록만 남았거나 전송 도중 오류가 난) 대상자도 중복 발송을 막기 위해 건너뛰고 목록으로 알린다.
+        if current_resume is not None:
+            row_states = target_df['_normalized'].map(current_resume['states'])
+            done = row_states == 'sent'
+            uncertain = row_states.isin(['attempt', 'verified', 'uncertain'])
+            if uncertain.any():
+                unsure_names = ', '.join(target_df.loc[uncertain, '이름'].astype(str).tolist())
+                log(f"⚠️ 이전 실행에서 전송 여부를 확인하지 못한 {int(uncertain.sum())}명은 중복 발송 방지를 위해 "
+                    f"건너뜁니다 → {unsure_names} (카카오톡에서 직접 확인하세요)")
+            target_df = target_df[~(done | uncertain)]
+            count = len(target_df)
+            log(f"↩ 이어보내기 — 이미 전송된 {int(done.sum())}명을 건너뛰고 남은 {count}명에게 보냅니다.")
+            if count == 0:
+                log_queue.put(json.dumps({
+                    'type': 'complete',
+                    'success': 0,
+                    'total': 0,
+                    'failed_names': [],
+                    'stopped': False
+                }))
+                return
 
-        if not kakao_ready:
-            log("❌ 카카오톡을 찾을 수 없습니다. 카카오톡이 설치되어 있고 로그인되어 있는지 확인해주세요.")
+        # 전송 시작 전 카카오톡 사전 준비 (코디네이터는 직접 보내지 않으므로 생략)
+        if current_coordinator is None and not prepare_kakaotalk():
             log_queue.put(json.dumps({
                 'type': 'complete',
                 'success': 0,
@@ -2779,83 +6392,119 @@ def run_sending_logic():
             }))
             return
 
-        # 친구 목록으로 복귀 (다음 검색 준비)
-        reset_search()
-        time.sleep(1)
-        log("✅ 카카오톡 준비 완료!")
-        
-        success_count = 0
-        failed_names = []
-        stopped = False
-        
-        for i, (_, row) in enumerate(target_df.iterrows()):
-            # 일시정지 체크 (현재 대상자 시작 전에 확인)
-            if pause_requested:
-                log(f"⏸ 일시정지됨 — 재개 버튼을 누르면 [{i + 1}/{count}]번째부터 이어서 전송합니다.")
-                log_queue.put(json.dumps({'type': 'paused'}))
-                pause_event.clear()
-                pause_event.wait()
-                if stop_requested:
-                    log(f"\n⚠️ 사용자에 의해 전송이 중단되었습니다. ({i}/{count} 처리됨)")
-                    stopped = True
-                    break
-                log(f"▶️ 전송 재개!")
-
-            # 중단 요청 확인
-            check_stop_requested()
-            
-            name = row['이름']
-            message = message_template.format(name=name)
-            
-            log(f"[{i + 1}/{count}] {name}님 처리 중...")
-            set_timing_context(i + 1, name)  # B(계측): 이번 대상자 컨텍스트
+        # 친구 목록 색인으로 대상자를 미리 분류: 없음·후보 여러 명은 검색 없이 건너뛴다.
+        # (검증만 모드는 대상자마다 실제 검색으로 확인하는 것이 목적이라 쓰지 않는다)
+        if current_coordinator is None and USE_FRIEND_DIRECTORY and not current_audit_mode:
+            target_df = apply_friend_directory(target_df)
 
+        # 검증만 모드: 결과 CSV를 못 열면 시작하지 않는다(결과를 남기지 못하는 감사는 의미가 없다).
+        if current_audit_mode:
             try:
-                with time_stage('person_total'):
-                    sent_ok = send_message(name, message, dry_run=current_dry_run)
-                if sent_ok:
-                    success_count += 1
-                else:
-                    failed_names.append(name)
-            except StopRequestedException:
-                log(f"\n⚠️ 사용자에 의해 전송이 중단되었습니다. ({i}/{count} 처리됨)")
-                stopped = True
-                break
-            
-            # 매크로 탐지 방지를 위한 랜덤 대기 (1~3초, 중단 체크 포함)
-            # 패스트 모드는 이 대기를 제거한다(⚠️스팸/매크로 탐지로 계정 제한 위험).
-            check_stop_requested()
+                current_audit = AuditReport()
+            except OSError as exc:
+                log(f"❌ 검증 결과 파일을 만들 수 없습니다: {exc}")
+                log_queue.put(json.dumps({
+                    'type': 'complete',
+                    'success': 0,
+                    'total': count,
+                    'failed_names': [],
+                    'stopped': False
+                }))
+                return
+
+        # 실제 전송은 대상자별 기록(저널)을 남긴다. 기록을 못 열어도 전송은 진행한다.
+        if not (current_dry_run or current_audit_mode):
             try:
-                if not current_fast_mode:
-                    safe_sleep((1.0, 3.0), show_log=True)
-            except StopRequestedException:
-                log(f"\n⚠️ 사용자에 의해 전송이 중단되었습니다. ({i + 1}/{count} 처리됨)")
-                stopped = True
-                break
+                current_journal = start_send_journal({
+                    'chain': current_resume['chain'] if current_resume else None,
+                    'roster_sha256': _file_sha256(current_file_path),
+                    'register_types': list(register_types),
+                    'age_groups': list(age_groups),
+                    'message_template': message_template,
+                    'fast_mode': current_fast_mode,
+                    'image_path': current_image_path,
+                    'image_order': current_image_order,
+                    'attachment_dir': current_attachment_dir,
+                    'count': count,
+                })
+            except Exception as exc:
+                current_journal = None
+                log(f"⚠️ 전송 기록(저널)을 열지 못해 기록 없이 진행합니다: {exc}")
         
+        run_metrics.start(count)
+        with _metrics_lock:
+            sender_stats.runs += 1
+        if current_coordinator is not None:
+            stopped = _coordinate_send(current_coordinator, target_df, message_template, count)
+            outcome = current_coordinator.summary()
+            success_count = outcome['success']
+            failed_names = outcome['failed_names']
+            if outcome['uncertain_names']:
+                log(f"⚠️ 워커 응답이 끊겨 전송 여부를 알 수 없는 {len(outcome['uncertain_names'])}명 "
+                    f"(카카오톡에서 직접 확인하세요): {', '.join(map(str, outcome['uncertain_names']))}")
+        else:
+            attachment_cache.reset_stats()
+            pipeline = SendPipeline(target_df, message_template, journal=current_journal)
+            try:
+                stopped = _drive_send_pipeline(pipeline, count)
+            finally:
+                pipeline.close()
+            success_count = pipeline.success_count
+            failed_names = pipeline.failed_names
+            if pipeline.has_attachments:
+                prefetch = attachment_cache.stats
+                log(f"📎 첨부 선읽기 — 미리 준비됨 {prefetch['ready']}건 · 준비 중 대기 {prefetch['waited']}건 · "
+                    f"전송 중 준비 {prefetch['cold']}건")
+
         log(f"\n{'='*40}")
+        done_label = '확인' if current_audit is not None else '성공'
         if stopped:
-            log(f"⚠️ 중단됨! (성공: {success_count}/{count})")
+            log(f"⚠️ 중단됨! ({done_label}: {success_count}/{count})")
         else:
-            log(f"🎉 완료! (성공: {success_count}/{count})")
+            log(f"🎉 완료! ({done_label}: {success_count}/{count})")
         
-        if failed_names:
-            log(f"\n❌ 실패한 타겟 멤버 ({len(failed_names)}명):")
-            for name in failed_names:
-                log(f"   • {name}")
+        failed_details = [{'name': str(name), 'reason': reason, 'label': SEND_REASON_LABELS.get(reason, reason)}
+                          for name, reason in run_metrics.failures]
+        if failed_details:
+            failed_title = '확인되지 않은 대상자' if current_audit is not None else '실패한 타겟 멤버'
+            log(f"\n❌ {failed_title} ({len(failed_details)}명):")
+            for item in failed_details:
+                log(f"   • {item['name']} — {item['label']}")
+        reasons = run_metrics.reason_summary()
+        if reasons:
+            log("📊 결과 사유별: " + " · ".join(
+                f"{r['label']} {r['count']}명(평균 {r['avg_seconds']:.1f}초, 시도 {r['avg_attempts']:.1f}회)"
+                for r in reasons.values()))
         
+        audit = None
+        if current_audit is not None:
+            current_audit.close()
+            last_audit_report = current_audit.path
+            audit = {AUDIT_STATUS_LABELS[k]: v for k, v in current_audit.counts.items()}
+            log("📄 검증 결과: " + " · ".join(f"{label} {n}명" for label, n in audit.items())
+                + f" → {current_audit.path}")
         log(f"{'='*40}")
 
         try:
             dump_timing_summary()  # B(계측): 단계별 소요시간 요약 + CSV 덤프
+            log_ax_locator_summary()
+            if USE_ADAPTIVE_DELAYS:
+                adaptive_delays.save()
+                log(f"🎚 학습된 대기: {adaptive_delays.summary()}")
         except Exception:
             pass
 
+        if current_journal is not None:
+            current_journal.record('end', success=success_count, total=count, stopped=stopped)
+
         log_queue.put(json.dumps({
             'type': 'complete',
             'success': success_count,
             'total': count,
             'failed_names': failed_names,
+            'failed_details': failed_details,
+            'reasons': reasons,
+            'audit': audit,
             'stopped': stopped
         }))
         
@@ -2869,6 +6518,13 @@ def run_sending_logic():
             'stopped': False
         }))
     finally:
+        if current_journal is not None:
+            current_journal.close()
+            current_journal = None
+        if current_audit is not None:
+            current_audit.close()
+            current_audit = None
+        current_resume = None
         is_running = False
         stop_requested = False
         pause_requested = False
@@ -2878,16 +6534,73 @@ def run_sending_logic():
 # ============================================================
 # 메인 실행
 # ============================================================
+def _print_logs_to_console():
+    """워커 모드: 웹 화면 대신 로그를 터미널에 출력한다."""
+    q = Queue()
+    with log_subscribers_lock:
+        log_subscribers.append(q)
+
+    def pump():
+        while True:
+            event = json.loads(q.get())
+            if event.get('type') == 'log':
+                print(event['message'], flush=True)
+
+    threading.Thread(target=pump, daemon=True).start()
+
+
 if __name__ == "__main__":
-    port = 5050
+    parser = argparse.ArgumentParser(description='카카오톡 자동 전송기 (웹 버전)')
+    parser.add_argument('--port', type=int, default=5050)
+    parser.add_argument('--coordinator', action='store_true',
+                        help='분산 전송 코디네이터: 대상자를 워커(다른 맥)들에게 나눠 준다')
+    parser.add_argument('--host', default=None,
+                        help='코디네이터가 들을 주소 (기본: --coordinator면 0.0.0.0, 아니면 127.0.0.1)')
+    parser.add_argument('--worker', metavar='URL', help='워커로 실행: 코디네이터 주소 (예: http://192.168.0.10:5050)')
+    parser.add_argument('--worker-id', default=socket.gethostname())
+    parser.add_argument('--token', default=os.environ.get('KAKAO_SENDER_TOKEN'),
+                        help='코디네이터·워커 공유 토큰 (기본: 환경변수 KAKAO_SENDER_TOKEN)')
+    args = parser.parse_args()
+    port = args.port
+    work_token = args.token
+
+    if args.worker:
+        print(f"\n{'='*50}")
+        print(f"  카카오톡 자동 전송기 — 워커 ({args.worker_id})")
+        print(f"{'='*50}")
+        print(f"\n  코디네이터: {args.worker}")
+        print("  종료: Ctrl+C\n")
+        perm = get_ax_permission_state()
+        if perm['state'] != 'ok':
+            sys.exit(f"❌ {perm['message']}")
+        _print_logs_to_console()
+        try:
+            run_worker(_HTTPWorkClient(args.worker, work_token), args.worker_id, prepare=_prepare_worker_run)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    host = args.host or ('0.0.0.0' if args.coordinator else '127.0.0.1')
+    if args.coordinator:
+        current_coordinator = WorkCoordinator()
+    if host not in ('127.0.0.1', 'localhost', '::1'):
+        # 외부에 열 때는 업로드·시작·로그까지 모든 경로에 토큰 필수
+        require_token_everywhere = True
+        if not work_token:
+            work_token = uuid.uuid4().hex[:16]
+    open_url = f'http://localhost:{port}' + (f'/?token={work_token}' if require_token_everywhere else '')
+    
     print(f"\n{'='*50}")
     print(f"  카카오톡 자동 전송기 (웹 버전)")
     print(f"{'='*50}")
-    print(f"\n  브라우저에서 열림: http://localhost:{port}")
+    print(f"\n  브라우저에서 열림: {open_url}")
+    if args.coordinator:
+        print(f"  🛰 코디네이터 모드 — 워커: python3 kakao_web.py --worker http://<이 맥 주소>:{port}"
+              + (f" --token {work_token}" if work_token else ""))
     print(f"  종료: Ctrl+C\n")
     
     # 브라우저 자동 열기
-    webbrowser.open(f'http://localhost:{port}')
+    webbrowser.open(open_url)
     
-    # Flask 서버 시작
-    app.run(host='127.0.0.1', port=port, debug=True, threaded=True, use_reloader=False)
+    # Flask 서버 시작 (외부에 열 때는 디버거를 끈다)
+    app.run(host=host, port=port, debug=host == '127.0.0.1', threaded=True, use_reloader=False)
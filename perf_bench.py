@@ -0,0 +1,992 @@
+"""
+카카오톡 자동 전송기 성능 계측 스크립트 — 카카오톡을 조작하지 않는다
+
+목적:
+  - kakao_web.py 의 성능 관련 경로(AppleScript 실행기 등)를 macOS/리눅스 어디서든
+    같은 방식으로 재어 보고, 변경 전/후를 숫자로 비교한다.
+
+안전성:
+  - 기본값은 대역(stand-in) 실행기만 쓰므로 카카오톡·키보드에 아무 영향이 없다.
+  - --real 옵션은 macOS에서 실제 osascript를 쓰지만, 빈 스크립트만 실행한다.
+
+사용법:
+  python3 perf_bench.py applescript                 # 1회용 vs 상주 실행기 호출당 지연 비교
+  python3 perf_bench.py applescript --calls 200 --compile-ms 40 --exec-ms 5
+  python3 perf_bench.py applescript --real          # (macOS) 실제 osascript로 비교
+  python3 perf_bench.py handlers                    # f-string 스크립트 vs 컴파일된 핸들러 호출
+  python3 perf_bench.py timing-compare before.csv after.csv
+                                                    # 계측 CSV 두 개의 단계별/1인당 시간 비교
+  python3 perf_bench.py ax-scan                     # 가짜 AX 트리로 스캔당 AX 호출(IPC) 수 비교
+  python3 perf_bench.py delays --median-ms 300      # 고정 대기 vs 적응형 대기(모의 준비시간 분포)
+  python3 perf_bench.py names --count 50000         # 이름 정규화: 이름별 함수 vs 벡터 일괄 계산 vs 후보 메모이즈
+  python3 perf_bench.py preflight --rows 100000     # 명단 사전 점검(중복·식별 불가·혼동 위험) 소요시간
+  python3 perf_bench.py roster --rows 30000         # 명단 읽기: pandas 전체 vs 스트리밍 vs 캐시 (메모리·시간)
+  python3 perf_bench.py telemetry --people 100000   # 계측: 단계별 히스토그램 메모리·기록 비용·백분위 오차
+  python3 perf_bench.py cluster --workers 4         # 분산 전송: 코디네이터 + 가상 워커(일부는 도중에 죽음)
+  python3 perf_bench.py cluster --http              # 같은 시뮬레이션을 실제 HTTP(/work/*)로
+  python3 perf_bench.py directory --friends 3000    # 친구 목록 훑기(가짜 스크롤 목록) + 명단 사전 분류
+  python3 perf_bench.py clipboard                   # 클립보드 복사+확인: pyperclip(프로세스) vs NSPasteboard
+  python3 perf_bench.py clipboard --real            # (macOS) 실제 pbcopy/pbpaste와 NSPasteboard로 비교
+  python3 perf_bench.py attachment --file 사진.heic  # (macOS) 첨부 준비: 원본 vs 준비본 크기·복사 시간·붙여넣기 대기
+  python3 perf_bench.py prefetch --people 40        # 대상자별 첨부: 전송 중 준비 vs 선읽기(다음 N명) 대기 시간
+"""
+
+import os
+import sys
+import csv
+import math
+import time
+import random
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import unicodedata
+
+import kakao_web as kw
+
+
+# 상주 호스트 대역: kakao_web 의 JSON 줄 프로토콜을 그대로 말하고, 처음 보는 소스만
+# '컴파일 비용'을 한 번 치른 뒤 매 호출 '실행 비용'만큼 잠든다.
+_STANDIN_HOST = r'''
+import sys, json, time
+compile_s, exec_s = float(sys.argv[1]), float(sys.argv[2])
+compiled = set()
+while True:
+    line = sys.stdin.readline()
+    if not line:
+        break
+    req = json.loads(line)
+    resp = {'id': req['id'], 'rc': 0, 'out': '', 'err': '', 'compiled': False, 'compile_ms': 0}
+    key = req.get('lib') or req.get('source') or ''
+    if key not in compiled and req.get('op') in ('load', 'call') and not req.get('library'):
+        resp.update(rc=1, err='library not loaded')
+    else:
+        if key not in compiled:
+            compiled.add(key)
+            time.sleep(compile_s)
+            resp.update(compiled=True, compile_ms=compile_s * 1000)
+        if req.get('op') != 'load':
+            time.sleep(exec_s)
+    sys.stdout.write(json.dumps(resp) + '\n')
+    sys.stdout.flush()
+'''
+
+# 1회용 대역: 매 호출 프로세스를 띄우고 stdin을 다 읽은 뒤 컴파일+실행 비용만큼 잠든다.
+_STANDIN_ONESHOT = 'import sys, time; sys.stdin.read(); time.sleep({cost})'
+
+
+def standin_runners(compile_ms: float, exec_ms: float):
+    """(1회용, 상주) 대역 실행기 쌍을 만든다."""
+    c, e = compile_ms / 1000.0, exec_ms / 1000.0
+    oneshot = kw._OneShotAppleScriptRunner(
+        command=[sys.executable, '-c', _STANDIN_ONESHOT.format(cost=c + e)])
+    persistent = kw._PersistentAppleScriptRunner(
+        command=[sys.executable, '-u', '-c', _STANDIN_HOST, str(c), str(e)])
+    return oneshot, persistent
+
+
+def _summary(label: str, samples):
+    s = sorted(samples)
+    n = len(s)
+    avg = sum(s) / n
+    p50 = s[n // 2]
+    p90 = s[min(n - 1, int(n * 0.9))]
+    print(f"  {label:<12} avg {avg * 1000:7.2f}ms | p50 {p50 * 1000:7.2f}ms | "
+          f"p90 {p90 * 1000:7.2f}ms | 합계 {sum(s):6.2f}s (n={n})")
+
+
+def _time_calls(runner, scripts, calls: int):
+    samples = []
+    for i in range(calls):
+        script = scripts[i % len(scripts)]
+        t0 = time.perf_counter()
+        rc, _out, err = runner.run(script)
+        samples.append(time.perf_counter() - t0)
+        if rc != 0:
+            print(f"  ⚠️ {runner.name} 실행 실패: {err.strip()[:80]}")
+            break
+    return samples
+
+
+def bench_applescript(args):
+    if args.real:
+        oneshot = kw._OneShotAppleScriptRunner()
+        persistent = kw._PersistentAppleScriptRunner()
+        # 실제 카카오톡을 건드리지 않도록 부수효과 없는 스크립트만 쓴다.
+        scripts = ['return 1', 'return "x"', 'set a to 1\nreturn a']
+    else:
+        oneshot, persistent = standin_runners(args.compile_ms, args.exec_ms)
+        # 전송 1인분에 쓰이는 실제 스크립트 종류 수만큼 서로 다른 소스를 돌린다.
+        scripts = [kw.SCRIPT_ACTIVATE, 'key code 36', 'key code 53', 'key code 125']
+    print(f"AppleScript 실행기 호출당 지연 ({'osascript' if args.real else '대역'}, {args.calls}회)")
+    try:
+        _summary('1회용', _time_calls(oneshot, scripts, args.calls))
+        _summary('상주', _time_calls(persistent, scripts, args.calls))
+    finally:
+        oneshot.close()
+        persistent.close()
+
+
+def _time_handler_calls(runner, calls: int):
+    """전송 1인분에 쓰이는 핸들러 호출 묶음을 calls회 돌려 호출당 지연을 잰다."""
+    plan = [
+        ('resetSearch', (0.0, 0.0, 0.0, 0.0)),
+        ('primeSearch', (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)),
+        ('openChat', (0.0, 0.0)),
+        ('pressEnter', (0.0,)),
+    ]
+    samples = []
+    for i in range(calls):
+        handler, args = plan[i % len(plan)]
+        t0 = time.perf_counter()
+        rc, _out, err, _compile_s = runner.call(kw.APPLESCRIPT_LIBRARY, handler, args)
+        samples.append(time.perf_counter() - t0)
+        if rc != 0:
+            print(f"  ⚠️ {runner.name} 핸들러 실행 실패: {err.strip()[:80]}")
+            break
+    return samples
+
+
+def bench_handlers(args):
+    # 핸들러는 실제 키 입력을 보내므로 대역 실행기로만 잰다.
+    oneshot, persistent = standin_runners(args.compile_ms, args.exec_ms)
+    print(f"핸들러 라이브러리 호출당 지연 (대역, {args.calls}회)")
+    try:
+        t0 = time.perf_counter()
+        persistent.load(kw.APPLESCRIPT_LIBRARY)
+        print(f"  라이브러리 로드(컴파일 1회) {(time.perf_counter() - t0) * 1000:7.2f}ms")
+        _summary('1회용+소스', _time_handler_calls(oneshot, args.calls))
+        _summary('상주+핸들러', _time_handler_calls(persistent, args.calls))
+    finally:
+        oneshot.close()
+        persistent.close()
+
+
+def _load_timing_csv(path: str) -> tuple:
+    """dump_timing_summary 가 남긴 CSV → ({stage: [seconds, ...]}, {reason: 건수})"""
+    by_stage, reasons = {}, {}
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            if row['stage'] == 'outcome':
+                reason = row.get('reason') or 'unknown'
+                reasons[reason] = reasons.get(reason, 0) + 1
+                continue
+            by_stage.setdefault(row['stage'], []).append(float(row['seconds']))
+    return by_stage, reasons
+
+
+def bench_timing_compare(args):
+    (before, before_reasons), (after, after_reasons) = _load_timing_csv(args.before), _load_timing_csv(args.after)
+    ordered = [s for s in kw.TIMING_STAGE_ORDER if s in before or s in after]
+    ordered += sorted((set(before) | set(after)) - set(ordered))
+    print(f"단계별 평균 (초)  before={args.before}  after={args.after}")
+    for stage in ordered:
+        b, a = before.get(stage, []), after.get(stage, [])
+        b_avg = sum(b) / len(b) if b else 0.0
+        a_avg = sum(a) / len(a) if a else 0.0
+        print(f"  {stage:<18} {b_avg:6.3f} → {a_avg:6.3f}  ({a_avg - b_avg:+.3f}, n={len(b)}/{len(a)})")
+    b_people, a_people = len(before.get('person_total', [])), len(after.get('person_total', []))
+    if b_people and a_people:
+        print(f"  AppleScript 호출/인  {len(before.get('as_invoke', [])) / b_people:5.1f} → "
+              f"{len(after.get('as_invoke', [])) / a_people:5.1f}")
+        _summary('before 1인', before['person_total'])
+        _summary('after 1인', after['person_total'])
+    if before_reasons or after_reasons:
+        print("결과 사유별 (명)")
+        for reason in sorted(set(before_reasons) | set(after_reasons)):
+            label = kw.SEND_REASON_LABELS.get(reason, reason)
+            print(f"  {label:<18} {before_reasons.get(reason, 0):5d} → {after_reasons.get(reason, 0):5d}")
+
+
+# ------------------------------------------------------------
+# 가짜 AX 백엔드 — 리눅스에서도 AX 순회 코드의 호출 수를 잴 수 있게, kakao_web 의 AX 함수
+# 심볼을 메모리 트리를 읽는 함수로 바꿔 끼운다. (AXUIElement 대신 FakeAXElement)
+# ------------------------------------------------------------
+class FakeAXElement:
+    def __init__(self, role, children=(), **attrs):
+        self.attrs = dict(attrs, AXRole=role)
+        self.children = list(children)
+
+
+class _FakeAXValueRef:
+    """일괄 읽기에서 '없는 속성' 자리에 들어가는 오류형 AXValue 흉내."""
+
+
+_FAKE_ATTR_MISSING = -25205  # kAXErrorAttributeUnsupported
+
+
+def _fake_copy(element, attr, _out):
+    if attr == 'AXChildren':
+        return 0, list(element.children)
+    if attr in element.attrs:
+        return 0, element.attrs[attr]
+    return _FAKE_ATTR_MISSING, None
+
+
+def _fake_copy_many(element, attrs, _options, _out):
+    values = []
+    for attr in attrs:
+        err, value = _fake_copy(element, attr, None)
+        values.append(_FakeAXValueRef() if err else value)
+    return 0, values
+
+
+def install_fake_ax():
+    """kakao_web 의 AX 읽기 함수를 가짜 백엔드로 교체한다."""
+    kw.AXUIElementCopyAttributeValue = _fake_copy
+    kw.AXUIElementCopyMultipleAttributeValues = _fake_copy_many
+    kw.AXValueGetType = lambda value: 5
+    kw.kAXValueAXErrorType = 5
+    kw.AX_MULTI_AVAILABLE = True
+
+
+def fake_kakao_window(result_names, filler_groups: int = 10, filler_width: int = 20):
+    """카카오톡 검색 화면 비슷한 트리: 잡다한 버튼 그룹 + 검색창 + 결과 테이블."""
+    rows = [
+        FakeAXElement('AXRow', [FakeAXElement('AXCell', [
+            FakeAXElement('AXImage'),
+            FakeAXElement('AXStaticText', AXIdentifier=kw.AX_DISPLAY_NAME_ID, AXValue=name),
+        ])])
+        for name in result_names
+    ]
+    filler = [
+        FakeAXElement('AXGroup', [FakeAXElement('AXButton', AXDescription=f'btn{i}') for i in range(filler_width)])
+        for _ in range(filler_groups)
+    ]
+    search = FakeAXElement('AXGroup', [FakeAXElement('AXTextField', AXSubrole='AXSearchField',
+                                                     AXValue=result_names[0] if result_names else '')])
+    results = FakeAXElement('AXScrollArea', [FakeAXElement('AXTable', rows)])
+    return FakeAXElement('AXWindow', filler + [search, results])
+
+
+def _ax_scan_ipc(window, scans: int):
+    """검색창 값 + 결과 이름(결과 대기 확인 1회분, 스냅숏 1개)을 scans번 → (첫 스캔 IPC, 이후 평균 IPC).
+    친구 검증은 늘 창 전체를 순회하므로 그 비용은 첫 스캔 값과 같다."""
+    kw._ax_locator.reset()
+    counts = []
+    for _ in range(scans):
+        ipc0 = kw._ax_stats['ipc']
+        snapshot = kw.take_ax_snapshot('search_results', window)
+        snapshot.search_value()
+        snapshot.result_names()
+        counts.append(kw._ax_stats['ipc'] - ipc0)
+    rest = counts[1:] or counts
+    return counts[0], sum(rest) / len(rest)
+
+
+def bench_ax_scan(args):
+    install_fake_ax()
+    window = fake_kakao_window([f'홍길동{i}' for i in range(args.results)], args.filler, args.width)
+    print(f"AX 스캔당 호출(IPC) 수 — 가짜 트리 (결과 {args.results}명, 잡다 노드 {args.filler * args.width}개)")
+    for batch in (False, True):
+        kw.USE_AX_BATCH_READS = batch
+        first, cached = _ax_scan_ipc(window, args.scans)
+        label = '일괄 읽기' if batch else '개별 읽기'
+        print(f"  {label:<8} 전체 순회 {first:5d}회 | 위치 캐시 적중 {cached:6.1f}회")
+
+
+def bench_delays(args):
+    """준비 소요시간을 로그정규 분포로 뽑아, 고정 대기와 적응형 대기의 평균 대기·부족률 비교.
+    (부족 = 대기가 실제 준비시간보다 짧아 재확인/재시도가 필요한 경우)"""
+    rng = random.Random(args.seed)
+    median = args.median_ms / 1000.0
+    stage = 'chat_input'
+    default = kw.ADAPTIVE_DELAY_SPECS[stage][0]
+    controller = kw.AdaptiveDelays(kw.ADAPTIVE_DELAY_SPECS, path=None)
+    fixed_wait = adaptive_wait = 0.0
+    fixed_short = adaptive_short = 0
+    for _ in range(args.people):
+        ready = median * rng.lognormvariate(0, args.sigma)
+        fixed_wait += default
+        fixed_short += ready > default
+        delay = controller.delay(stage)
+        adaptive_wait += delay
+        if ready > delay:
+            adaptive_short += 1
+            controller.failed(stage)
+        controller.observe(stage, ready)
+    n = args.people
+    print(f"준비시간 중앙값 {args.median_ms:.0f}ms, sigma {args.sigma} — {n}명 ({stage})")
+    print(f"  고정 {default:.2f}초   평균 대기 {fixed_wait / n:5.3f}초 | 부족 {fixed_short / n:6.1%}")
+    print(f"  적응형        평균 대기 {adaptive_wait / n:5.3f}초 | 부족 {adaptive_short / n:6.1%}"
+          f" | 최종 {controller.delay(stage):.2f}초")
+
+
+_NAME_SYLLABLES = '김이박최정강조윤장임한오서신권황안송류홍민수영지현준서하은도윤'
+_NAME_DECOR = ['', '', '', '🍪', '❤️', '❤', ' 🌸', '✨', '⭐️']
+
+
+def make_names(count: int, seed: int = 1) -> list:
+    """벤치용 이름: 공백 변형·이모티콘 장식·한글 분해형(NFD)·꼬리표가 섞인 이름 count개."""
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        base = ''.join(rng.choice(_NAME_SYLLABLES) for _ in range(rng.choice((2, 3, 3, 4))))
+        if rng.random() < 0.2:
+            base = unicodedata.normalize('NFD', base)
+        if rng.random() < 0.1:
+            base = base[:1] + '  ' + base[1:]
+        if rng.random() < 0.1:
+            base += f' {rng.choice(("20", "30", "40"))}대 {rng.choice("남여")}'
+        names.append(base + rng.choice(_NAME_DECOR))
+    return names
+
+
+def _scalar_forms(name):
+    """기존 방식: 대상자마다 이름별 함수를 각각 호출."""
+    return (kw.normalize_name(name), kw.canonicalize_name(name), kw.normalize_name_for_match(name),
+            kw.name_for_search(name), kw.name_contains_emoji_or_symbol(name))
+
+
+def bench_names(args):
+    names = make_names(args.count, args.seed)
+    print(f"이름 정규화 — {len(names)}개 (NFD 분해형·이모티콘·공백 변형 포함)")
+
+    t0 = time.perf_counter()
+    scalar = [_scalar_forms(n) for n in names]
+    t_scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    columns = kw.compute_name_forms(names)
+    t_vector = time.perf_counter() - t0
+    vector = list(zip(*(columns[c] for c in kw.ROSTER_NAME_FORM_COLUMNS)))
+    mismatches = sum(1 for a, b in zip(scalar, vector) if tuple(a) != tuple(b))
+    print(f"  명단 파생형  이름별 함수 {t_scalar:6.3f}초 | 벡터 일괄 {t_vector:6.3f}초 | 불일치 {mismatches}건")
+
+    # verify_friend_by_ax: 시도마다 화면 후보(한 검색당 3명 남짓)를 canonical/match로 다시 정규화한다.
+    rng = random.Random(args.seed)
+    pool = names[:max(1, args.count // 10)]  # 화면에 반복해서 뜨는 후보 이름
+    lookups = [rng.choice(pool) for _ in range(args.count * 3)]
+    t0 = time.perf_counter()
+    for n in lookups:
+        kw.canonicalize_name(n)
+        kw.normalize_name_for_match(n)
+    t_plain = time.perf_counter() - t0
+    kw.name_forms.cache_clear()
+    t0 = time.perf_counter()
+    for n in lookups:
+        forms = kw.name_forms(n)
+        forms.canonical, forms.match
+    t_memo = time.perf_counter() - t0
+    info = kw.name_forms.cache_info()
+    print(f"  화면 후보    매번 정규화 {t_plain:6.3f}초 | 메모이즈 {t_memo:6.3f}초 "
+          f"({len(lookups)}회, 적중 {info.hits / max(1, info.hits + info.misses):.0%})")
+
+
+def bench_preflight(args):
+    import pandas as pd
+    # 정답이 정해진 작은 명단으로 먼저 확인: 앞·중간에 포함되는 이름, 정렬상 이웃하지 않는 포함 쌍,
+    # 짧은 이름 1건, 동명이인 없음
+    sample = ['김민', '김민수', '이영희', '박철수', '홍길동주', '홍길동주니어', '길동주니',
+              '최수정민', '최수정민아', '최수정민우', '진']
+    report = kw.validate_roster(pd.DataFrame({'이름': sample, **kw.compute_name_forms(sample)}))
+    expected = {'ok': True,
+                'substring_risk': [['길동주니', '홍길동주니어'], ['최수정민', '최수정민아'],
+                                   ['최수정민', '최수정민우'], ['홍길동주', '홍길동주니어']],
+                'short_names': ['진']}
+    got = {'ok': report['ok'], 'substring_risk': report['warnings']['substring_risk'],
+           'short_names': report['warnings']['short_names']}
+    print(f"사전 점검 확인 ({len(sample)}명): {'OK' if got == expected else f'실패 — {got}'}")
+    names = make_names(args.rows, args.seed)
+    df = pd.DataFrame({'이름': names, **kw.compute_name_forms(names)})
+    kw.validate_roster(df.head(100))  # 첫 호출 준비(정규식 컴파일 등) 제외
+    t0 = time.perf_counter()
+    report = kw.validate_roster(df)
+    elapsed = time.perf_counter() - t0
+    print(f"사전 점검 — {len(df)}명: {elapsed:.3f}초 (ok={report['ok']})")
+    for key, n in report['counts'].items():
+        print(f"  {key:<22} {n}건")
+
+
+class _FakeScrollBar(FakeAXElement):
+    def __init__(self):
+        super().__init__('AXScrollBar', AXValue=0.0)
+
+
+class _FakeFriendTable(FakeAXElement):
+    """스크롤바 위치에 해당하는 visible개 행만 자식으로 보이는 친구 목록(지연 생성 행 흉내)."""
+
+    def __init__(self, names, visible, bar):
+        super().__init__('AXTable')
+        self.names, self.visible, self.bar = names, visible, bar
+
+    @property
+    def children(self):
+        top = round(self.bar.attrs['AXValue'] * max(0, len(self.names) - self.visible))
+        return [FakeAXElement('AXRow', [FakeAXElement('AXCell', [
+            FakeAXElement('AXStaticText', AXIdentifier=kw.AX_DISPLAY_NAME_ID, AXValue=name)])])
+            for name in self.names[top:top + self.visible]]
+
+    @children.setter
+    def children(self, _value):
+        pass
+
+
+def _fake_set(element, attr, value):
+    element.attrs[attr] = max(0.0, min(1.0, float(value)))
+    return 0
+
+
+def bench_directory(args):
+    rng = random.Random(args.seed)
+    friends = list(dict.fromkeys(kw.normalize_name(n) for n in make_names(args.friends, args.seed)))
+    known = set(friends)
+    outsiders = [n for n in make_names(args.roster, args.seed + 1) if kw.normalize_name(n) not in known]
+    roster = []
+    for _ in range(args.roster):
+        if rng.random() < args.missing:
+            roster.append(rng.choice(outsiders))
+        else:
+            # 명단 쪽엔 이모티콘 없이 적힌 이름도 섞는다(장식기호 제거·부분 일치 규칙)
+            name = rng.choice(friends)
+            roster.append(kw.normalize_name_for_match(name) if rng.random() < 0.3 else name)
+
+    # 1) 친구 목록 훑기: 가짜 스크롤 목록(화면에 visible명만 보임)
+    install_fake_ax()
+    bar = _FakeScrollBar()
+    area = FakeAXElement('AXScrollArea', [_FakeFriendTable(friends, args.visible, bar)], AXVerticalScrollBar=bar)
+    window = FakeAXElement('AXWindow', [FakeAXElement('AXGroup', [FakeAXElement('AXButton')]), area])
+    kw.AX_AVAILABLE = kw.AX_WRITE_AVAILABLE = True
+    kw.AXIsProcessTrusted = lambda: True
+    scrolls = []
+    kw.AXUIElementSetAttributeValue = lambda el, attr, value: scrolls.append(value) or _fake_set(el, attr, value)
+    kw._ax_get_kakao_app_element = lambda: window
+    kw._ax_get_main_window = lambda app: app
+    settle, kw.FRIEND_DIRECTORY_SETTLE = kw.FRIEND_DIRECTORY_SETTLE, 0.0
+    ipc0, t0 = kw._ax_stats['ipc'], time.perf_counter()
+    scanned = kw._ax_scan_friend_list()
+    elapsed = time.perf_counter() - t0
+    print(f"친구 목록 훑기 — 친구 {len(friends)}명, 화면당 {args.visible}명")
+    if scanned is None:
+        print("  끝까지 훑지 못함")
+        return
+    print(f"  수집 {len(scanned)}명 (누락 {len(known - set(scanned))}명) · 스크롤 {len(scrolls)}회 · "
+          f"AX 호출 {kw._ax_stats['ipc'] - ipc0}회 · {elapsed:.3f}초 "
+          f"(+ 실제 화면 갱신 대기 {len(scrolls) * settle:.0f}초)")
+    # 스크롤바를 못 읽으면 첫 화면만 훑은 목록이 아니라 None이어야 한다(대상자를 '없음'으로 건너뛰지 않게)
+    window.children[1] = FakeAXElement('AXScrollArea', [_FakeFriendTable(friends, args.visible, _FakeScrollBar())])
+    print(f"  스크롤바 없음 → {'None (OK)' if kw._ax_scan_friend_list() is None else '일부 목록 반환 (실패)'}")
+    window.children[1] = area
+
+    # 2) 명단 사전 분류: 색인 vs 전체 목록 선형 비교 (결과가 같아야 한다)
+    directory = kw.FriendDirectory()
+    t0 = time.perf_counter()
+    directory.update(scanned)
+    t_build = time.perf_counter() - t0
+    forms = [kw.name_forms(n) for n in roster]
+    t0 = time.perf_counter()
+    indexed = [directory.classify(f) for f in forms]
+    t_index = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    linear = [kw.classify_friend_match(f.raw, scanned, f) for f in forms]
+    t_linear = time.perf_counter() - t0
+    mismatches = sum(a[:2] != b[:2] for a, b in zip(indexed, linear))
+    counts = {}
+    for result in indexed:
+        status = kw.FRIEND_DIRECTORY_STATUS.get(result.reason, 'missing')
+        counts[status] = counts.get(status, 0) + 1
+    print(f"명단 {len(roster)}명 분류 — 색인 만들기 {t_build:.3f}초 | 색인 {t_index:.3f}초 vs 선형 {t_linear:.3f}초 "
+          f"(결과 불일치 {mismatches}건)")
+    print("  " + " · ".join(f"{k} {counts.get(k, 0)}명" for k in ('unique', 'ambiguous', 'missing')))
+    skipped = counts.get('ambiguous', 0) + counts.get('missing', 0)
+    print(f"  건너뛰는 {skipped}명 × 검색 {kw.MAX_SEARCH_ATTEMPTS}회 × {args.search_ms / 1000:.1f}초 ≈ "
+          f"{skipped * kw.MAX_SEARCH_ATTEMPTS * args.search_ms / 1000:.0f}초 절약")
+
+    # 3) 다시 훑기: 바뀐 이름만 색인에 반영
+    changed = friends[args.friends // 10:] + make_names(args.friends // 20, args.seed + 2)
+    t0 = time.perf_counter()
+    added, removed = directory.update(changed)
+    print(f"  다시 훑은 목록 반영: 추가 {added} · 삭제 {removed} — {time.perf_counter() - t0:.4f}초")
+
+
+class _StandinPbClipboard:
+    """pyperclip 의 macOS 경로 대역: 복사·읽기마다 프로세스를 하나씩 띄운다(pbcopy/pbpaste 처럼)."""
+
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(prefix='kakao_bench_clip_')
+        os.close(fd)
+
+    def copy(self, text):
+        import subprocess
+        subprocess.run(['cp', '/dev/stdin', self.path], input=text.encode('utf-8'), check=True)
+
+    def paste(self):
+        import subprocess
+        return subprocess.run(['cat', self.path], capture_output=True, check=True).stdout.decode('utf-8')
+
+    def close(self):
+        os.remove(self.path)
+
+
+class _StandinPasteboard:
+    """NSPasteboard 대역: 메모리 문자열 + changeCount."""
+
+    def __init__(self):
+        self.count, self.value = 0, None
+
+    def clearContents(self):
+        self.count += 1
+        self.value = None
+        return self.count
+
+    def setString_forType_(self, text, _type):
+        self.value = text
+        return True
+
+    def changeCount(self):
+        return self.count
+
+
+def _time_copies(clipboard, texts, verify_delay):
+    kw.set_clipboard(clipboard)
+    samples = []
+    for text in texts:
+        t0 = time.perf_counter()
+        if not kw._reliable_copy(text, verify_delay=verify_delay):
+            print(f"  ⚠️ {clipboard.name} 복사 확인 실패")
+            break
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def bench_clipboard(args):
+    kw.log = lambda msg: None
+    texts = [f"{name}님!\n요청하신 리포트입니다.\n감사합니다." for name in make_names(args.calls, args.seed)]
+    standin = None
+    if args.real:
+        native = kw._NativeClipboard()
+    else:
+        standin = _StandinPbClipboard()
+        kw.pyperclip = standin
+        native = kw._NativeClipboard(_StandinPasteboard())
+    delay = args.verify_ms / 1000 if args.verify_ms is not None else None
+    wait = (f"{args.verify_ms:.0f}ms" if delay is not None else
+            f"pyperclip {kw.CLIPBOARD_VERIFY_DELAY * 1000:.0f}ms / NSPasteboard {kw.NATIVE_CLIPBOARD_VERIFY_DELAY * 1000:.0f}ms")
+    print(f"클립보드 복사+확인 ({'실제' if args.real else '대역'}, {args.calls}회, 확인 전 대기 {wait} 포함)")
+    try:
+        _summary('pyperclip', _time_copies(kw._pyperclip_clipboard, texts, delay))
+        _summary('NSPasteboard', _time_copies(native, texts, delay))
+    finally:
+        kw.set_clipboard(None)
+        if standin is not None:
+            standin.close()
+    # 다른 기기(Handoff)가 덮어쓰면 changeCount가 바뀌어 확인에 실패해야 한다
+    if not args.real:
+        pb = _StandinPasteboard()
+        clip = kw._NativeClipboard(pb)
+        token = clip.copy_text('홍길동')
+        pb.clearContents()
+        pb.setString_forType_('다른 기기', None)
+        print(f"  덮어쓰기 감지: {'OK' if not clip.verify(token, '홍길동') else '실패'}")
+
+
+def bench_attachment(args):
+    people = args.people
+    print(f"붙여넣기 대기 (대상자 {people}명 기준)")
+    for mb in (0.2, 0.5, 1.0, 2.0, 5.0, 20.0):
+        wait = kw.attachment_ingest_delay(int(mb * 1024 * 1024))
+        print(f"  {mb:5.1f}MB  {wait:4.2f}초 (원본 경로 {kw.ATTACHMENT_INGEST_DELAY:.2f}초) → "
+              f"{(kw.ATTACHMENT_INGEST_DELAY - wait) * people:6.0f}초 절약")
+    if not args.file:
+        return
+    if not kw.ATTACHMENT_PREP_AVAILABLE:
+        print("첨부 준비는 macOS(pyobjc Quartz/AppKit)에서만 계측할 수 있습니다.")
+        return
+    prepared = kw.prepare_attachment(args.file)
+    if prepared is None:
+        print(f"준비 실패: {args.file}")
+        return
+    print(f"첨부 준비 — {args.file}")
+    print(f"  원본 {prepared.source_size / 1024:8.0f}KB → 준비본 {prepared.size / 1024:6.0f}KB "
+          f"({prepared.width}×{prepared.height}, {prepared.uti}) · 준비 {prepared.seconds * 1000:.0f}ms (1회)")
+    clipboard = kw._NativeClipboard()
+    samples = []
+    for _ in range(args.calls):
+        t0 = time.perf_counter()
+        kw._copy_image_to_clipboard(args.file)
+        samples.append(time.perf_counter() - t0)
+    _summary('원본 복사', samples)
+    samples = []
+    for _ in range(args.calls):
+        t0 = time.perf_counter()
+        clipboard.copy_data(prepared.data, prepared.uti)
+        samples.append(time.perf_counter() - t0)
+    _summary('준비본 복사', samples)
+    print(f"  붙여넣기 대기 {kw.ATTACHMENT_INGEST_DELAY:.2f}초 → {kw.attachment_ingest_delay(prepared.size):.2f}초")
+
+
+def _run_attachment_sends(paths, prefetch: int, send_s: float, prepare):
+    """가상 전송 루프: 대상자마다 선읽기를 맡기고(prefetch>0) 첨부를 받아 send_s만큼 보낸다.
+    → 첨부를 받을 때까지 기다린 시간 목록(전송 경로에 더해진 지연)."""
+    cache = kw.AttachmentCache(prepare=prepare)
+    waits = []
+    for i, path in enumerate(paths):
+        if prefetch:
+            cache.prefetch(paths[i:i + 1 + prefetch])
+        t0 = time.perf_counter()
+        cache.get(path)
+        waits.append(time.perf_counter() - t0)
+        time.sleep(send_s)
+    return waits, cache.stats
+
+
+def bench_prefetch(args):
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.people):
+            path = os.path.join(tmp, f'리포트{i:04d}.pdf')
+            with open(path, 'wb') as f:
+                f.write(b'%PDF-1.4\n')
+            paths.append(path)
+        costs = {path: max(0.0, rng.gauss(args.prepare_ms, args.prepare_ms / 3)) / 1000 for path in paths}
+
+        def prepare(path):
+            # 디스크 읽기 + 디코드·인코딩 대역
+            time.sleep(costs[path])
+            return kw.PreparedAttachment(kw._attachment_key(path), b'x', 'public.jpeg', 1, 1, 1, 1, costs[path])
+
+        send_s = args.send_ms / 1000
+        print(f"대상자별 첨부 {args.people}명 (준비 평균 {args.prepare_ms:.0f}ms, 1인 전송 {args.send_ms:.0f}ms)")
+        for label, prefetch in (('전송 중 준비', 0), (f'선읽기 {args.prefetch}명', args.prefetch)):
+            waits, stats = _run_attachment_sends(paths, prefetch, send_s, prepare)
+            _summary(label, waits)
+            print(f"    미리 준비됨 {stats['ready']} · 준비 중 대기 {stats['waited']} · 전송 중 준비 {stats['cold']}")
+
+
+def make_roster_xlsx(path, rows: int, extra_cols: int, seed: int = 1):
+    """벤치용 명단 엑셀: 이름·등록형태·연령 + 안 쓰는 열 extra_cols개."""
+    import openpyxl
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(['번호', '이름', '등록형태', '연령'] + [f'메모{i}' for i in range(extra_cols)])
+    for i in range(rows):
+        ws.append([i + 1, f'회원{i:06d}', rng.choice(kw.AVAILABLE_REGISTER_TYPES),
+                   rng.choice(kw.AVAILABLE_AGE_GROUPS)] + [f'값{rng.random():.6f}' for _ in range(extra_cols)])
+    wb.save(path)
+
+
+def _measure(fn):
+    """fn() 실행 → (결과, 걸린 초, 파이썬 힙 최대 사용량 MB)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        _cur, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def bench_roster(args):
+    import pandas as pd
+    path = args.file
+    if not path:
+        path = os.path.join(tempfile.gettempdir(), f'perf_roster_{args.rows}x{args.extra_cols}.xlsx')
+        if not os.path.exists(path):
+            print(f"벤치용 명단 생성 중: {path}")
+            make_roster_xlsx(path, args.rows, args.extra_cols)
+    register_types, age_groups = kw.DEFAULT_REGISTER_TYPES, kw.DEFAULT_AGE_GROUPS
+
+    def pandas_first():
+        df = pd.read_excel(path)
+        target = df[(df['등록형태'].isin(register_types)) & (df['연령'].isin(age_groups))]
+        return next(target.iterrows())[1]['이름']
+
+    def pandas_all():
+        df = pd.read_excel(path)
+        return len(df[(df['등록형태'].isin(register_types)) & (df['연령'].isin(age_groups))])
+
+    def stream_first():
+        return next(row for row in kw.iter_roster_rows(path)
+                    if row[1] in register_types and row[2] in age_groups)[0]
+
+    def stream_all():
+        kw.USE_ROSTER_CACHE = False
+        try:
+            return len(kw.load_target_roster(path, register_types, age_groups)[0])
+        finally:
+            kw.USE_ROSTER_CACHE = True
+
+    def cached_all():
+        return len(kw.load_target_roster(path, register_types, age_groups)[0])
+
+    kw.log = lambda msg: None
+    kw.load_roster(path)  # 캐시 채우기
+    print(f"명단 읽기 — {os.path.basename(path)} (필터: 기본값)")
+    for label, first, full in (('pandas 전체', pandas_first, pandas_all), ('스트리밍', stream_first, stream_all),
+                               ('캐시 적중', cached_all, cached_all)):
+        _name, t_first, _m = _measure(first)
+        n, t_all, peak = _measure(full)
+        print(f"  {label:<10} 첫 대상자 {t_first:6.2f}초 | 전체 {t_all:6.2f}초 ({n}명) | 최대 힙 {peak:7.1f}MB")
+
+
+def bench_telemetry(args):
+    """가상 실행(대상자 N명 × 단계들)을 계측 계층에 흘려 메모리·기록 비용과 백분위 정확도를 본다."""
+    rng = random.Random(args.seed)
+    stages = [s for s in kw.TIMING_STAGE_ORDER if s not in ('as_compile', 'image_send', 'layout_wait')]
+    kw.TIMING_DIR = tempfile.mkdtemp(prefix='perf_timing_')
+    kw.log = lambda msg: None
+    kw.TIMING_LIVE_INTERVAL = 0.5
+    exact = {stage: [] for stage in stages} if args.check else None
+
+    def run():
+        kw.reset_timing()
+        for idx in range(1, args.people + 1):
+            kw.set_timing_context(idx, f'회원{idx:06d}')
+            for stage in stages:
+                sec = rng.lognormvariate(-1.0, 0.6)
+                kw.record_timing(stage, sec)
+                if exact is not None:
+                    exact[stage].append(sec)
+        return kw.dump_timing_summary()
+
+    calls = args.people * len(stages)
+    csv_path, elapsed, peak = _measure(run)
+    print(f"계측 — {args.people}명 × {len(stages)}단계 = {calls}건")
+    print(f"  기록 1건당 {elapsed / calls * 1e6:.1f}µs | 최대 힙 {peak:.2f}MB"
+          + (" (정확도 확인용 원자료 보관 포함)" if exact is not None else ""))
+    print(f"  히스토그램: 단계당 구간 {kw.StageHistogram.BUCKETS}개 · CSV {os.path.getsize(csv_path) / 1e6:.1f}MB")
+    if exact is not None:
+        hist = kw._timing.stages[stages[0]]
+        vals = sorted(exact[stages[0]])
+        for q, got in zip((0.5, 0.9, 0.99), hist.percentiles()):
+            want = vals[max(0, math.ceil(q * len(vals)) - 1)]
+            print(f"  p{int(q * 100):<3} 정확 {want:.4f} | 히스토그램 {got:.4f} | 오차 {abs(got - want) / want * 100:.2f}%")
+
+
+class _SimWorkerClient:
+    """가상 워커의 코디네이터 연결. crash='lease'면 임대받은 뒤, 'send'면 전송 시작을 알린 뒤
+    그 워커가 죽은 것처럼 이후 모든 호출이 실패한다. duplicate=True면 결과를 두 번씩 보고한다."""
+
+    def __init__(self, client, stop_event, crash=None, crash_after=3, duplicate=False):
+        self.client = client
+        self.stop_event = stop_event
+        self.crash = crash
+        self.crash_after = crash_after
+        self.duplicate = duplicate
+        self.dead = False
+        self.leases = 0
+        self.duplicates_ignored = 0
+
+    def _die(self):
+        self.dead = True
+        self.stop_event.set()
+        raise OSError('워커 종료(시뮬레이션)')
+
+    def lease(self, worker_id, max_jobs=1):
+        if self.dead:
+            self._die()
+        resp = self.client.lease(worker_id, max_jobs)
+        self.leases += len(resp.get('jobs') or [])
+        return resp
+
+    def heartbeat(self, worker_id, lease_ids):
+        if self.dead:
+            self._die()
+        return self.client.heartbeat(worker_id, lease_ids)
+
+    def release(self, worker_id, lease_ids):
+        if self.dead:
+            self._die()
+        return self.client.release(worker_id, lease_ids)
+
+    def begin(self, worker_id, lease_id):
+        if self.dead or (self.crash == 'lease' and self.leases >= self.crash_after):
+            self._die()
+        resp = self.client.begin(worker_id, lease_id)
+        if self.crash == 'send' and self.leases >= self.crash_after:
+            self.dead = True  # 전송은 하지만 결과 보고 전에 죽는다
+        return resp
+
+    def result(self, worker_id, lease_id, sent_ok, outcome=None):
+        if self.dead:
+            self._die()
+        resp = self.client.result(worker_id, lease_id, sent_ok, outcome)
+        if self.duplicate:
+            self.duplicates_ignored += bool(self.client.result(worker_id, lease_id, sent_ok, outcome).get('duplicate'))
+        return resp
+
+    def fetch_image(self, run_id, ext=''):
+        return None
+
+
+def bench_cluster(args):
+    kw.log = lambda msg: None
+    kw.WORK_HEARTBEAT_SECONDS = args.lease_ms / 4000
+    kw.WORK_POLL_SECONDS = 0.05
+    kw.WORK_PREPARE_BACKOFF_MAX = 0.4
+    rng = random.Random(args.seed)
+    jobs, seen = [], set()
+    for name in make_names(args.count, args.seed):
+        forms = kw.name_forms(name)
+        if forms.normalized not in seen:
+            seen.add(forms.normalized)
+            jobs.append(kw.SendJob(len(jobs) + 1, name, f'{name}님 안녕하세요', forms, forms.normalized))
+
+    coordinator = kw.WorkCoordinator(lease_seconds=args.lease_ms / 1000)
+    server = None
+    if args.http:
+        from werkzeug.serving import make_server
+        kw.current_coordinator = coordinator
+        server = make_server('127.0.0.1', 0, kw.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_port}'
+        connect = lambda: kw._HTTPWorkClient(url)
+    else:
+        connect = lambda: coordinator
+
+    sends = {}  # key → 실제 전송 횟수 (정확히 한 번 확인용)
+    sends_lock = threading.Lock()
+
+    def fake_send(name, message, dry_run=False, forms=None):
+        with sends_lock:
+            sends[forms.normalized] = sends.get(forms.normalized, 0) + 1
+        time.sleep(max(0.0, rng.gauss(args.send_ms, args.send_ms / 4)) / 1000)
+        return rng.random() >= args.fail_rate
+
+    coordinator.open_run(jobs, {'fast_mode': True, 'dry_run': False, 'image_order': 'image_first', 'image_ext': None})
+    workers = []
+    for w in range(args.workers):
+        stop_event = threading.Event()
+        crash = ('lease', 'send')[w % 2] if w < args.crashes else None
+        client = _SimWorkerClient(connect(), stop_event, crash=crash, duplicate=(w == args.workers - 1))
+        # 마지막 --unprepared대는 카카오톡 준비에 계속 실패하는 워커(받은 대상자를 돌려줘야 한다)
+        prepare = (lambda: False) if w >= args.workers - args.unprepared else None
+        thread = threading.Thread(target=kw.run_worker, args=(client, f'sim-{w + 1}', fake_send),
+                                  kwargs={'prepare': prepare, 'stop_event': stop_event, 'exit_when_finished': True},
+                                  daemon=True)
+        workers.append((thread, client))
+
+    t0 = time.perf_counter()
+    for thread, _client in workers:
+        thread.start()
+    while not coordinator.wait_progress(0.2)['finished']:
+        pass
+    elapsed = time.perf_counter() - t0
+    for thread, _client in workers:
+        thread.join(timeout=5)
+    if server is not None:
+        server.shutdown()
+
+    outcome = coordinator.summary()
+    done = outcome['success'] + len(outcome['failed_names'])
+    twice = sum(1 for n in sends.values() if n > 1)
+    print(f"분산 전송 시뮬레이션 — 대상자 {len(jobs)}명, 워커 {args.workers}대(준비 실패 {args.unprepared}대) "
+          f"({'HTTP' if args.http else '같은 프로세스'}, 임대 {args.lease_ms:.0f}ms, 전송 {args.send_ms:.0f}ms)")
+    print(f"  소요 {elapsed:.2f}초 (혼자 보낼 때 약 {len(jobs) * args.send_ms / 1000:.2f}초)")
+    print(f"  결과 수신 {done}명 (성공 {outcome['success']}, 실패 {len(outcome['failed_names'])}) · "
+          f"전송 여부 불확실 {len(outcome['uncertain_names'])}명 · 재배정 {outcome['reissued']}회")
+    print(f"  중복 보고 무시 {sum(c.duplicates_ignored for _t, c in workers)}건 · 두 번 보낸 대상자 {twice}명 "
+          f"· 결과 누락 {len(jobs) - done - len(outcome['uncertain_names'])}명")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='카카오톡 자동 전송기 성능 계측')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('applescript', help='1회용 vs 상주 AppleScript 실행기 지연 비교')
+    p.add_argument('--calls', type=int, default=100, help='실행기당 호출 수 (기본 100)')
+    p.add_argument('--compile-ms', type=float, default=30.0, help='대역: 스크립트 컴파일 비용(ms)')
+    p.add_argument('--exec-ms', type=float, default=2.0, help='대역: 스크립트 실행 비용(ms)')
+    p.add_argument('--real', action='store_true', help='(macOS) 실제 osascript로 계측')
+    p.set_defaults(func=bench_applescript)
+
+    p = sub.add_parser('handlers', help='1회용(라이브러리+호출 매번 컴파일) vs 상주 핸들러 호출 비교')
+    p.add_argument('--calls', type=int, default=100, help='실행기당 호출 수 (기본 100)')
+    p.add_argument('--compile-ms', type=float, default=60.0, help='대역: 라이브러리 컴파일 비용(ms)')
+    p.add_argument('--exec-ms', type=float, default=2.0, help='대역: 핸들러 실행 비용(ms)')
+    p.set_defaults(func=bench_handlers)
+
+    p = sub.add_parser('timing-compare', help='계측 CSV 두 개(변경 전/후)의 단계별·1인당 시간 비교')
+    p.add_argument('before', help='변경 전 timing_*.csv')
+    p.add_argument('after', help='변경 후 timing_*.csv')
+    p.set_defaults(func=bench_timing_compare)
+
+    p = sub.add_parser('ax-scan', help='가짜 AX 백엔드로 스캔당 AX 호출 수(개별 vs 일괄 읽기) 비교')
+    p.add_argument('--results', type=int, default=3, help='검색 결과 행 수')
+    p.add_argument('--filler', type=int, default=10, help='잡다 그룹 수')
+    p.add_argument('--width', type=int, default=20, help='그룹당 잡다 노드 수')
+    p.add_argument('--scans', type=int, default=5, help='반복 스캔 수')
+    p.set_defaults(func=bench_ax_scan)
+
+    p = sub.add_parser('delays', help='고정 대기 vs 적응형 대기 (모의 준비시간 분포)')
+    p.add_argument('--people', type=int, default=300, help='모의 대상자 수')
+    p.add_argument('--median-ms', type=float, default=300.0, help='준비시간 중앙값(ms)')
+    p.add_argument('--sigma', type=float, default=0.4, help='로그정규 분산 정도')
+    p.add_argument('--seed', type=int, default=1)
+    p.set_defaults(func=bench_delays)
+
+    p = sub.add_parser('names', help='이름 정규화: 이름별 함수 vs 벡터 일괄 계산 vs 후보 메모이즈')
+    p.add_argument('--count', type=int, default=50000, help='이름 수')
+    p.add_argument('--seed', type=int, default=1)
+    p.set_defaults(func=bench_names)
+
+    p = sub.add_parser('preflight', help='명단 사전 점검(validate_roster) 소요시간')
+    p.add_argument('--rows', type=int, default=100000, help='이름 수')
+    p.add_argument('--seed', type=int, default=1)
+    p.set_defaults(func=bench_preflight)
+
+    p = sub.add_parser('roster', help='명단 읽기: pandas 전체 읽기 vs openpyxl 스트리밍 (메모리·첫 대상자 시간)')
+    p.add_argument('--file', help='계측할 명단 xlsx (없으면 --rows/--extra-cols로 생성)')
+    p.add_argument('--rows', type=int, default=30000, help='생성할 행 수')
+    p.add_argument('--extra-cols', type=int, default=20, help='생성할 안 쓰는 열 수')
+    p.set_defaults(func=bench_roster)
+
+    p = sub.add_parser('telemetry', help='계측 계층: 히스토그램 메모리·기록 1건 비용·백분위 오차')
+    p.add_argument('--people', type=int, default=100000)
+    p.add_argument('--check', action='store_true', help='원자료도 보관해 백분위 오차 확인(메모리 측정엔 포함됨)')
+    p.add_argument('--seed', type=int, default=1)
+    p.set_defaults(func=bench_telemetry)
+
+    p = sub.add_parser('cluster', help='분산 전송: 코디네이터 + 가상 워커 (임대 만료·재배정·중복 보고 확인)')
+    p.add_argument('--count', type=int, default=200, help='대상자 수')
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--crashes', type=int, default=2, help='도중에 죽는 워커 수 (임대 중 / 전송 중 번갈아)')
+    p.add_argument('--send-ms', type=float, default=30.0, help='가상 전송 1건 평균 시간(ms)')
+    p.add_argument('--lease-ms', type=float, default=400.0, help='임대 시간(ms)')
+    p.add_argument('--fail-rate', type=float, default=0.05)
+    p.add_argument('--unprepared', type=int, default=0, help='카카오톡 준비에 계속 실패하는 워커 수')
+    p.add_argument('--seed', type=int, default=1)
+    p.add_argument('--http', action='store_true', help='실제 HTTP(/work/*)로 (flask 필요)')
+    p.set_defaults(func=bench_cluster)
+
+    p = sub.add_parser('directory', help='친구 목록 훑기(가짜 스크롤 목록) + 명단 사전 분류(색인 vs 선형)')
+    p.add_argument('--friends', type=int, default=3000, help='친구 수')
+    p.add_argument('--roster', type=int, default=500, help='명단 인원')
+    p.add_argument('--missing', type=float, default=0.1, help='친구 목록에 없는 대상자 비율')
+    p.add_argument('--visible', type=int, default=15, help='한 화면에 보이는 친구 수')
+    p.add_argument('--search-ms', type=float, default=2500.0, help='대상자 1회 검색·검증 비용(ms), 절약 추정용')
+    p.add_argument('--seed', type=int, default=1)
+    p.set_defaults(func=bench_directory)
+
+    p = sub.add_parser('clipboard', help='클립보드 복사+확인: pyperclip(pbcopy/pbpaste 프로세스) vs NSPasteboard(changeCount)')
+    p.add_argument('--calls', type=int, default=100)
+    p.add_argument('--verify-ms', type=float, default=None, help='복사 후 확인 전 대기(ms, 기본: 백엔드별 기본값)')
+    p.add_argument('--real', action='store_true', help='(macOS) 실제 pbcopy/pbpaste와 NSPasteboard로 계측')
+    p.add_argument('--seed', type=int, default=1)
+    p.set_defaults(func=bench_clipboard)
+
+    p = sub.add_parser('attachment', help='첨부 준비: 원본 vs 준비본 크기·클립보드 복사 시간·붙여넣기 대기')
+    p.add_argument('--file', help='(macOS) 계측할 이미지 파일 — 없으면 크기별 붙여넣기 대기만')
+    p.add_argument('--calls', type=int, default=20, help='클립보드 복사 반복 수')
+    p.add_argument('--people', type=int, default=300, help='절약 시간 계산용 대상자 수')
+    p.set_defaults(func=bench_attachment)
+
+    p = sub.add_parser('prefetch', help='대상자별 첨부: 전송 중 준비 vs 선읽기(다음 N명) — 전송 경로의 첨부 대기')
+    p.add_argument('--people', type=int, default=40)
+    p.add_argument('--prepare-ms', type=float, default=120.0, help='첨부 1개 준비(읽기·디코드) 평균(ms)')
+    p.add_argument('--send-ms', type=float, default=300.0, help='1인 전송 시간(ms, 실제는 수 초)')
+    p.add_argument('--prefetch', type=int, default=kw.ATTACHMENT_PREFETCH, help='미리 준비할 다음 대상자 수')
+    p.add_argument('--seed', type=int, default=1)
+    p.set_defaults(func=bench_prefetch)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()